@@ -51,8 +51,6 @@ class RandomBehavior(Behavior):
             change_heading=not self._owner.headingless,
             turn_speed=self._owner.turn_speed,
         )
-        if self._owner.intersects(self._target):
-            self._owner.game.gameover()
 
 
 class AbilityBehavior(Behavior):
@@ -99,7 +97,7 @@ class AbilityBehavior(Behavior):
             raise ValueError("Cannot charge ability before owner is registered!")
 
         self._charge_state = AbilityState.CHARGING
-        self._owner.game.screen.ontimer(self.ready_ability, self.charge_time)
+        self._owner.game.call_later(self.charge_time, self.ready_ability)
 
     def ready_ability(self):
         self._charge_state = AbilityState.READY
@@ -165,31 +163,40 @@ class ColoredAbilityBehavior(AbilityBehavior):
 
 class ChaseBehavior(Behavior):
     """Behavior that makes the owner chase its provided target, taking the
-    shortest route possible.
+    shortest route possible. Without a target, the owner chases whichever player
+    is nearest.
     """
 
     def __init__(self, target: Pawn | None = None):
         self._target: Pawn | None = target
-        # TODO: when adding logging, perhaps have a warning if target is None?
+
+    def _best_move(self) -> Direction | None:
+        """Gets the best move toward the target (or the nearest player, without a
+        target), or None if it's somewhere unreachable.
+        """
+        game = self._owner.game
+        if self._target is not None:
+            return game.arena.get_best_direction(self._owner.pos, self._target.pos)
+
+        # every chaser shares one field, charted once per player move
+        return game.player_field.best_direction(self._owner.pos)
 
     def enact(self):
-        if not self._owner.game.is_evade_mode or self._target is None:
+        if not self._owner.game.is_evade_mode:
             return
 
-        best_dir: Direction = self._owner.game.arena.get_movement_options(
-            self._owner.pos, self._target.pos
-        )[0][0]
+        best_dir = self._best_move()
+        if best_dir is None:  # the target is somewhere unreachable
+            return
 
         self._owner.threaded_move(
             best_dir,
             change_heading=not self._owner.headingless,
             turn_speed=self._owner.turn_speed,
         )
-        if self._owner.intersects(self._target):
-            self._owner.game.gameover()
 
     @property
-    def target(self) -> Pawn:
+    def target(self) -> Pawn | None:
         return self._target
 
     @target.setter
@@ -203,12 +210,12 @@ class ChargeBehavior(ChaseBehavior):
     """
 
     def enact(self):
-        if not self._owner.game.is_evade_mode or self._target is None:
+        if not self._owner.game.is_evade_mode:
             return
 
-        best_dir: Direction = self._owner.game.arena.get_movement_options(
-            self._owner.pos, self._target.pos
-        )[0][0]
+        best_dir = self._best_move()
+        if best_dir is None:  # the target is somewhere unreachable
+            return
 
         self._owner.threaded_move(
             best_dir,
@@ -216,8 +223,6 @@ class ChargeBehavior(ChaseBehavior):
             turn_speed=self._owner.turn_speed,
             greedy=True,
         )
-        if self._owner.intersects(self._target):
-            self._owner.game.gameover()
 
 
 class JumperBehavior(ChaseBehavior, ColoredAbilityBehavior):
@@ -238,19 +243,36 @@ class JumperBehavior(ChaseBehavior, ColoredAbilityBehavior):
         )
 
     def enact(self):
-        if not self._owner.game.is_evade_mode or self._target is None:
+        if not self._owner.game.is_evade_mode:
             return
 
         # ability on cooldown
         if not self.ability_is_ready:
             return super().enact()
 
-        best_dir: Direction = self._owner.game.arena.get_movement_options(
-            self._owner.pos, self._target.pos, ignore_paths=True
-        )[0][0]
+        # a player cut off from every path can still be nearest by jumping
+        target = self._target or self._owner.game.nearest_player(
+            self._owner.pos, ignore_paths=True
+        )
+        if target is None:  # no player can be reached, even ignoring paths
+            return
 
-        if self._owner.game.arena.path_exists(self._owner.pos, best_dir):
-            return super().enact()
+        move: tuple[Direction, bool] | None = self._owner.game.arena.get_jump_move(
+            self._owner.pos, target.pos, max_jumps=1
+        )
+        if move is None:  # the target is somewhere unreachable, even by jumping
+            return
+
+        best_dir, jump = move
+        if not jump:
+            # the best route still starts along a path, maybe toward a gap worth
+            # jumping later
+            self._owner.threaded_move(
+                best_dir,
+                change_heading=not self._owner.headingless,
+                turn_speed=self._owner.turn_speed,
+            )
+            return
 
         # okay, now we jump, since that's the best move
 
@@ -261,7 +283,5 @@ class JumperBehavior(ChaseBehavior, ColoredAbilityBehavior):
             turn_speed=self._owner.turn_speed,
             validate_path=False,
         )
-        if self._owner.intersects(self._target):
-            self._owner.game.gameover()
 
         self.charge_ability()
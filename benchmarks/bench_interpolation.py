@@ -0,0 +1,100 @@
+"""Counts the Vec2s made and times the steps of a move and a turn.
+
+The interpolation from before the steps were worked out up front is kept here
+as a reference, to compare against the current one. Neither sleeps between
+steps, so only the interpolation is timed.
+
+Usage: python benchmarks/bench_interpolation.py
+"""
+
+from __future__ import annotations
+
+from contextlib import contextmanager
+from functools import partial
+from typing import Iterator
+
+from common import Vec2, best_of
+from utils import interpolate_deg, interpolate_vec2
+
+
+def old_interpolate_vec2(pos: Vec2, dest: Vec2, speed: int | float):
+    """`utils.interpolate_vec2` from before, without the sleep between steps."""
+    if speed <= 0:
+        yield dest
+        return
+
+    diff = dest - pos
+    speed_vec = diff.unit().scale(speed)
+    offset = speed_vec
+    distance = diff.magnitude()
+    while offset.magnitude() < distance:
+        yield pos + offset
+        offset += speed_vec
+
+    yield dest
+
+
+def old_interpolate_deg(start: int | float, end: int | float, speed: int | float):
+    """`utils.interpolate_deg` from before, without the sleep between steps."""
+    if start == end or speed <= 0:
+        yield end
+        return
+
+    start = start % 360
+    end = end % 360
+
+    ccw_dist = (end - start) % 360
+    cw_dist = 360 - ccw_dist
+
+    sign = 1 if (ccw_dist < cw_dist) else -1
+    dist = min(ccw_dist, cw_dist)
+
+    distance_traveled = speed
+    while distance_traveled < dist:
+        distance_traveled += speed
+        yield start + (sign * distance_traveled)
+
+    yield end
+
+
+@contextmanager
+def counting_vec2s() -> Iterator[list[int]]:
+    """Counts the Vec2s made inside the block, into the yielded list's only item."""
+    count = [0]
+    new = Vec2.__new__
+
+    def counted(cls, x, y):
+        count[0] += 1
+        return new(cls, x, y)
+
+    Vec2.__new__ = counted
+    try:
+        yield count
+    finally:
+        Vec2.__new__ = new
+
+
+def main():
+    pos, dest = Vec2(0, 0), Vec2(25, 0)
+    print(f"{'version':>7} {'Vec2s/step':>10} {'move':>8} {'turn':>8}")
+    for name, move_steps, turn_steps in (
+        (
+            "current",
+            partial(interpolate_vec2, sleep=False),
+            partial(interpolate_deg, sleep=False),
+        ),
+        ("old", old_interpolate_vec2, old_interpolate_deg),
+    ):
+        with counting_vec2s() as count:
+            steps = sum(1 for _ in move_steps(pos, dest, 1))
+
+        move = best_of(lambda: list(move_steps(pos, dest, 1)), number=2000)
+        turn = best_of(lambda: list(turn_steps(0, 90, 3)), number=2000)
+        print(
+            f"{name:>7} {count[0] / steps:>10.2f} "
+            f"{move * 1e6:>6.1f}us {turn * 1e6:>6.1f}us"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""Times charting the distances to one target, on fully connected arenas.
+
+The recursive search `Arena._pathfind` used to be is kept here as a reference,
+run with a raised recursion limit, to compare against the current charting.
+
+Usage: python benchmarks/bench_pathfind.py
+"""
+
+from __future__ import annotations
+
+from common import Arena, Vec2, best_of, full_arena
+from enums import Direction
+
+
+def recursive_pathfind(
+    arena: Arena,
+    pos: Vec2,
+    queue: list[Vec2],
+    distances: dict[Vec2, int],
+    ignore_paths: bool = False,
+):
+    """The recursive breadth-first search from before it became a loop."""
+    for direction in Direction:
+        dest = arena.get_destination(pos, direction)
+        if dest not in distances and (
+            (ignore_paths and arena.coord_exists_d(dest))
+            or arena.path_exists_d(pos, dest)
+        ):
+            queue.append(dest)
+            distances[dest] = distances[pos] + 1
+
+    if len(queue) != 0:
+        recursive_pathfind(arena, queue.pop(0), queue, distances, ignore_paths)
+
+
+def chart_recursive(arena: Arena, target: Vec2, ignore_paths: bool) -> dict[Vec2, int]:
+    distances = {target: 0}
+    recursive_pathfind(arena, target, [], distances, ignore_paths)
+    return distances
+
+
+def main():
+    target = Vec2(0, 0)
+    print(
+        f"{'size':>4} {'coords':>6} {'ignore_paths':>12} {'current':>9} {'recursive':>9}"
+    )
+    for arena_size in (20, 40, 60):
+        arena = full_arena(arena_size, contract_corridors=False)
+        for ignore_paths in (False, True):
+            current = best_of(
+                lambda: arena.chart_distances(target, ignore_paths=ignore_paths)
+            )
+            recursive = best_of(lambda: chart_recursive(arena, target, ignore_paths))
+            print(
+                f"{arena_size:>4} {len(arena.coords):>6} {str(ignore_paths):>12} "
+                f"{current * 1000:>7.1f}ms {recursive * 1000:>7.1f}ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
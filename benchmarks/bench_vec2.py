@@ -0,0 +1,68 @@
+"""Times and measures snapping positions to grid points, and looking the points up
+in a distance map.
+
+The Vec2 from before it had slots and interned grid points is kept here as a
+reference, to compare against the current one.
+
+Usage: python benchmarks/bench_vec2.py
+"""
+
+from __future__ import annotations
+
+import random
+import sys
+import tracemalloc
+
+from common import Vec2, best_of
+
+
+class OldVec2(tuple):
+    """Vec2 as it was, with a __dict__ and a new object for every grid point."""
+
+    def __new__(cls, x: int | float, y: int | float):
+        return tuple.__new__(cls, (x, y))
+
+    def grid(self, x_size: int, y_size: int | None = None) -> OldVec2:
+        if y_size is None:
+            y_size = x_size
+
+        return OldVec2(
+            round(self[0] / x_size) * x_size, round(self[1] / y_size) * y_size
+        )
+
+
+def main():
+    path_len = 25
+    num_points = 200_000
+    print(
+        f"{'class':>7} {'size':>5} {'retained':>9} {'objects':>8} "
+        f"{'grid()':>8} {'lookup':>8}"
+    )
+    for name, cls in (("current", Vec2), ("old", OldVec2)):
+        rng = random.Random(0)
+        points = [
+            cls(
+                rng.randint(-20, 20) * path_len + rng.random() * 10,
+                rng.randint(-20, 20) * path_len,
+            )
+            for _ in range(num_points)
+        ]
+
+        tracemalloc.start()
+        snapped = [point.grid(path_len) for point in points]
+        retained = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+
+        distances = {point: 1 for point in snapped}
+        snap = best_of(lambda: [point.grid(path_len) for point in points])
+        lookup = best_of(lambda: [distances[point] for point in snapped])
+        print(
+            f"{name:>7} {sys.getsizeof(cls(1, 2)):>4}B "
+            f"{retained / num_points:>7.0f}B/pt "
+            f"{len(set(map(id, snapped))):>8} "
+            f"{snap * 1e9 / num_points:>6.0f}ns {lookup * 1e9 / num_points:>6.0f}ns"
+        )
+
+
+if __name__ == "__main__":
+    main()
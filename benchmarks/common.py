@@ -0,0 +1,71 @@
+"""Shared setup for the benchmark scripts.
+
+Benchmarks only measure computation, so turtle graphics are replaced with a
+stand-in that draws nothing, letting them run without a display. Import this
+module before anything from the game.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import time
+import turtle
+from typing import Callable
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.setrecursionlimit(100_000)
+
+
+class _Headless:
+    """Accepts every turtle call and does nothing."""
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def __getattr__(self, name: str) -> Callable[..., None]:
+        return lambda *args, **kwargs: None
+
+
+turtle.Turtle = _Headless
+turtle.Screen = _Headless
+
+from game_objects.arena import Arena  # noqa: E402
+from vec2 import Vec2  # noqa: E402
+
+
+def full_arena(arena_size: int, path_len: int = 25, **kwargs) -> Arena:
+    """Creates an arena with a path between every pair of adjacent coordinates.
+
+    Args:
+        arena_size: The number of paths along each side of the arena.
+        path_len: The length of a single path. Defaults to 25.
+        **kwargs: Passed on to `Arena`.
+    """
+    arena = Arena(arena_size, path_len, **kwargs)
+    half = arena_size // 2
+    for x in range(-half, half + 1):
+        for y in range(-half, half + 1):
+            pos = Vec2(x * path_len, y * path_len)
+            if x < half:
+                arena.add_path(pos, Vec2((x + 1) * path_len, y * path_len))
+            if y < half:
+                arena.add_path(pos, Vec2(x * path_len, (y + 1) * path_len))
+    return arena
+
+
+def best_of(func: Callable[[], object], repeat: int = 5, number: int = 1) -> float:
+    """Times a function, in seconds per call.
+
+    Args:
+        func: The function to time.
+        repeat: How many times to time it; the fastest is kept. Defaults to 5.
+        number: How many calls to make per timing. Defaults to 1.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        best = min(best, time.perf_counter() - start)
+    return best / number
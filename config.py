@@ -69,6 +69,10 @@ class Config:
 
     levels: level_actions.LevelActionManager = _default_action_manager
 
+    # number of processes used to chart enemy pathfinding distances when a level
+    # begins; 1 charts them on the game thread
+    chart_workers: int = 1
+
     @property
     def tick_interval_ms(self) -> int:
         return 1000 // self.tps
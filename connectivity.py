@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+from array import array
+
+
+class UnionFind:
+    """Disjoint sets of the integers 0 to size - 1 (union by size, with path
+    halving), for tracking which grid cells are connected.
+
+    Sets can only be merged, never split, so after a connection is removed the
+    sets have to be rebuilt.
+    """
+
+    def __init__(self, size: int):
+        """Creates a `UnionFind` where every element is in a set of its own."""
+        self._parents: array[int] = array("i", range(size))
+        self._sizes: array[int] = array("i", (1,)) * size
+
+    def find(self, element: int) -> int:
+        """Gets the representative of the set containing `element`; two elements
+        are in the same set exactly when they have the same representative.
+        """
+        parents = self._parents
+        while parents[element] != element:
+            parents[element] = parents[parents[element]]
+            element = parents[element]
+
+        return element
+
+    def union(self, element: int, other: int) -> bool:
+        """Merges the sets containing the two elements.
+
+        Returns:
+            True if the sets were merged, False if they were already the same set.
+        """
+        root, other_root = self.find(element), self.find(other)
+        if root == other_root:
+            return False
+
+        if self._sizes[root] < self._sizes[other_root]:
+            root, other_root = other_root, root
+
+        self._parents[other_root] = root
+        self._sizes[root] += self._sizes[other_root]
+        return True
+
+    def size_of(self, element: int) -> int:
+        """Gets the number of elements in the set containing `element`."""
+        return self._sizes[self.find(element)]
@@ -0,0 +1,196 @@
+from __future__ import annotations
+
+import heapq
+from array import array
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from grid import Grid
+
+# number of directions in each 4-bit mask
+_DEGREES: bytes = bytes(bin(mask).count("1") for mask in range(16))
+
+# larger than any distance on a grid, but small enough to stay a fast int
+_FAR: int = 1 << 30
+
+
+class CorridorGraph:
+    """Contracted view of a grid where corridors are collapsed into single edges.
+
+    Cells with exactly two connections are corridor cells; every other connected
+    cell (junctions and dead ends) is a node. Each run of corridor cells between
+    two nodes becomes one weighted edge, so searches only visit the nodes and
+    the corridors in between are filled in afterwards, a whole corridor at a
+    time. A closed loop with no junctions gets one of its cells made into a node.
+
+    The graph is a snapshot of the grid when it was built; build a new one after
+    the grid's paths or coordinates change.
+    """
+
+    def __init__(self, grid: Grid, ignore_paths: bool = False):
+        """Builds a `CorridorGraph` of a grid.
+
+        Args:
+            grid: The grid to contract.
+            ignore_paths: Whether neighboring coordinates count as connected even
+                without a path. Defaults to False.
+        """
+        self.grid: Grid = grid
+        self.ignore_paths: bool = ignore_paths
+        masks = grid.coord_masks if ignore_paths else grid.path_masks
+        self._masks: bytes = bytes(masks)
+        # number of cells with at least one connection
+        self.cells: int = len(self._masks) - self._masks.count(0)
+
+        # cells of each node, and the node of each cell (or -1)
+        self.nodes: list[int] = []
+        self.node_of: array[int] = array("i", (-1,)) * grid.size
+        # each corridor's end nodes, and the cells between them in order
+        self.corridors: list[tuple[int, int, array[int]]] = []
+        # the corridor each corridor cell is in (or -1), and its place along it
+        self.corridor_of: array[int] = array("i", (-1,)) * grid.size
+        self.offset_of: array[int] = array("i", bytes(4 * grid.size))
+        # (neighbor node, edge length) for each node
+        self.edges: list[list[tuple[int, int]]] = []
+
+        for cell, mask in enumerate(self._masks):
+            if mask and _DEGREES[mask] != 2:
+                self._add_node(cell)
+
+        for node in range(len(self.nodes)):
+            self._trace_corridors(node)
+
+        # whatever is left is a closed loop of corridor cells
+        for cell, mask in enumerate(self._masks):
+            if mask and self.node_of[cell] < 0 and self.corridor_of[cell] < 0:
+                self._trace_corridors(self._add_node(cell))
+
+    def _add_node(self, cell: int) -> int:
+        node = len(self.nodes)
+        self.nodes.append(cell)
+        self.node_of[cell] = node
+        self.edges.append([])
+        return node
+
+    def _trace_corridors(self, node: int):
+        """Follows every connection out of a node to the node at its other end."""
+        start = self.nodes[node]
+        masks = self._masks
+        steps = self.grid.steps
+
+        for bit, delta in steps:
+            if not masks[start] & bit:
+                continue
+
+            previous, current = start, start + delta
+            cells: array[int] = array("i")
+            while self.node_of[current] < 0:
+                cells.append(current)
+                mask = masks[current]
+                previous, current = current, next(
+                    current + step
+                    for step_bit, step in steps
+                    if mask & step_bit and current + step != previous
+                )
+
+            end = self.node_of[current]
+            if cells:
+                # already traced from the other end
+                if self.corridor_of[cells[0]] >= 0:
+                    continue
+
+                corridor = len(self.corridors)
+                for offset, cell in enumerate(cells, 1):
+                    self.corridor_of[cell] = corridor
+                    self.offset_of[cell] = offset
+            elif current < start:
+                # two neighboring nodes; only add the edge from one side
+                continue
+
+            self.corridors.append((node, end, cells))
+            self.edges[node].append((end, len(cells) + 1))
+            if end != node:
+                self.edges[end].append((node, len(cells) + 1))
+
+    def chart(self, index: int) -> tuple[array[int], array[int]]:
+        """Charts the distance from every reachable cell to `index`, like
+        `Grid.chart`, but searching the contracted graph.
+
+        Returns:
+            The indexes of every reachable cell (starting with `index` itself)
+                and their distances, respectively. Other than the first, cells
+                aren't in order of distance.
+        """
+        if not self._masks[index]:
+            # a cell with no connections can only reach itself, except for
+            # non-coordinates when ignoring paths, which the grid handles
+            if self.ignore_paths and not self.grid.coords[index]:
+                return self.grid.chart(index, True)
+            return array("i", (index,)), array("i", (0,))
+
+        node_distances = [_FAR] * len(self.nodes)
+        heap: list[tuple[int, int]] = []
+        corridor = self.corridor_of[index]
+        if corridor < 0:
+            heap.append((0, self.node_of[index]))
+        else:
+            start_node, end_node, cells = self.corridors[corridor]
+            offset = self.offset_of[index]
+            heap.append((offset, start_node))
+            heap.append((len(cells) + 1 - offset, end_node))
+
+        # Dijkstra's algorithm on the nodes
+        edges = self.edges
+        while heap:
+            distance, node = heapq.heappop(heap)
+            if distance >= node_distances[node]:
+                continue
+
+            node_distances[node] = distance
+            for neighbor, length in edges[node]:
+                if distance + length < node_distances[neighbor]:
+                    heapq.heappush(heap, (distance + length, neighbor))
+
+        order: array[int] = array("i", (index,))
+        distances: array[int] = array("i", (0,))
+        for node, distance in enumerate(node_distances):
+            if distance < _FAR and self.nodes[node] != index:
+                order.append(self.nodes[node])
+                distances.append(distance)
+
+        for current, (start_node, end_node, cells) in enumerate(self.corridors):
+            if not cells:
+                continue
+
+            start_distance = node_distances[start_node]
+            end_distance = node_distances[end_node]
+            if start_distance >= _FAR and end_distance >= _FAR:
+                continue
+
+            length = len(cells) + 1
+            if current == corridor:
+                # the target is inside this corridor, so there's also the direct
+                # route along it
+                offset = self.offset_of[index]
+                for place, cell in enumerate(cells, 1):
+                    if cell != index:
+                        order.append(cell)
+                        distances.append(
+                            min(
+                                abs(place - offset),
+                                start_distance + place,
+                                end_distance + length - place,
+                            )
+                        )
+                continue
+
+            # cells up to `split` are closer through the start node, and the rest
+            # through the end node
+            split = min(
+                max((end_distance - start_distance + length) // 2, 0), length - 1
+            )
+            order.extend(cells)
+            distances.extend(range(start_distance + 1, start_distance + split + 1))
+            distances.extend(range(end_distance + length - split - 1, end_distance, -1))
+
+        return order, distances
@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import sys
+import threading
+from collections import OrderedDict
+from typing import Callable, Iterator, MutableMapping, NamedTuple
+
+from vec2 import Vec2
+
+# rough size of one entry on top of the dict itself; keys are the arena grid's
+# shared Vec2s, so only the distance is counted
+_ENTRY_BYTES: int = sys.getsizeof(1000)
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    evictions: int
+    maps: int
+    nbytes: int
+
+
+class DistanceCache(MutableMapping[Vec2, dict[Vec2, int]]):
+    """Least-recently-used store of charted distance maps (target: {pos: distance}).
+
+    Works like a regular dictionary, but when it holds more than `max_maps` maps
+    or (approximately) more than `max_bytes` bytes, the least recently used maps
+    are evicted. Only item lookups (`cache[target]` and `get`) count as uses;
+    membership tests and iteration don't, so repairing every map leaves the
+    order untouched.
+
+    Every operation holds the cache's lock, so a cache can be read from one
+    thread while another adds to it or copies it.
+    """
+
+    def __init__(
+        self,
+        max_maps: int | None = None,
+        max_bytes: int | None = None,
+        on_evict: Callable[[Vec2], None] | None = None,
+    ):
+        """Creates a `DistanceCache`.
+
+        Args:
+            max_maps: The maximum number of distance maps to keep. If `None`, the
+                number of maps is unlimited. Defaults to None.
+            max_bytes: The approximate maximum memory the maps may use. If `None`,
+                memory is unlimited. Defaults to None.
+            on_evict: Called with the target of each evicted map, e.g. to drop
+                anything else worked out from it. Defaults to None.
+        """
+        if max_maps is not None and max_maps <= 0:
+            raise ValueError("max_maps must be positive")
+        if max_bytes is not None and max_bytes <= 0:
+            raise ValueError("max_bytes must be positive")
+
+        self.max_maps: int | None = max_maps
+        self.max_bytes: int | None = max_bytes
+        self.on_evict: Callable[[Vec2], None] | None = on_evict
+
+        self._lock: threading.RLock = threading.RLock()
+        self._maps: OrderedDict[Vec2, dict[Vec2, int]] = OrderedDict()
+        self._sizes: dict[Vec2, int] = {}
+        self._nbytes: int = 0
+
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+
+    def __getitem__(self, target: Vec2) -> dict[Vec2, int]:
+        with self._lock:
+            try:
+                distances = self._maps[target]
+            except KeyError:
+                self.misses += 1
+                raise
+
+            self.hits += 1
+            self._maps.move_to_end(target)
+            return distances
+
+    def __setitem__(self, target: Vec2, distances: dict[Vec2, int]):
+        size = _measure(distances)
+        with self._lock:
+            if target in self._maps:
+                del self[target]
+
+            self._maps[target] = distances
+            self._sizes[target] = size
+            self._nbytes += size
+            self._evict(target)
+
+    def resized(self, target: Vec2):
+        """Measures a map again after it was changed in place (e.g. repaired),
+        evicting other maps if it no longer fits.
+
+        Does nothing if the map isn't cached (e.g. it was already evicted).
+        """
+        with self._lock:
+            if target not in self._maps:
+                return
+
+            size = _measure(self._maps[target])
+            self._nbytes += size - self._sizes[target]
+            self._sizes[target] = size
+            self._evict(target)
+
+    def _evict(self, keep: Vec2):
+        """Evicts the least recently used maps other than keep until the cache
+        is within its limits.
+        """
+        while len(self._maps) > 1 and (
+            (self.max_maps is not None and len(self._maps) > self.max_maps)
+            or (self.max_bytes is not None and self._nbytes > self.max_bytes)
+        ):
+            # never evict the map that was just stored or resized
+            oldest = next(target for target in self._maps if target != keep)
+            del self[oldest]
+            self.evictions += 1
+            if self.on_evict is not None:
+                self.on_evict(oldest)
+
+    def __delitem__(self, target: Vec2):
+        with self._lock:
+            del self._maps[target]
+            self._nbytes -= self._sizes.pop(target)
+
+    def __contains__(self, target: object) -> bool:
+        return target in self._maps
+
+    def __iter__(self) -> Iterator[Vec2]:
+        # iterate over a copy so other threads can keep using the cache
+        with self._lock:
+            return iter(list(self._maps))
+
+    def __len__(self) -> int:
+        return len(self._maps)
+
+    def values(self) -> list[dict[Vec2, int]]:
+        # skip __getitem__ so that iterating doesn't count as using every map
+        with self._lock:
+            return list(self._maps.values())
+
+    def items(self) -> list[tuple[Vec2, dict[Vec2, int]]]:
+        with self._lock:
+            return list(self._maps.items())
+
+    def clear(self):
+        with self._lock:
+            self._maps.clear()
+            self._sizes.clear()
+            self._nbytes = 0
+
+    def copy(self) -> DistanceCache:
+        """Makes a shallow copy of the cache: the copy has the same limits and
+        statistics, and holds the same distance maps, in the same order.
+
+        The copy has no eviction callback, since maps it evicts may still be held
+        by this cache; set `on_evict` on the copy if it replaces this cache.
+        """
+        with self._lock:
+            new = DistanceCache(self.max_maps, self.max_bytes)
+            new._maps = self._maps.copy()
+            new._sizes = self._sizes.copy()
+            new._nbytes = self._nbytes
+            new.hits, new.misses, new.evictions = (
+                self.hits,
+                self.misses,
+                self.evictions,
+            )
+            return new
+
+    def info(self) -> CacheInfo:
+        """Gets the cache's hit, miss and eviction counts as well as its current size.
+
+        Returns:
+            The cache statistics, like `functools.lru_cache`'s `cache_info`.
+        """
+        return CacheInfo(
+            self.hits, self.misses, self.evictions, len(self._maps), self._nbytes
+        )
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory used by the cached maps, measured when each was
+        stored or resized.
+        """
+        return self._nbytes
+
+
+def _measure(distances: dict[Vec2, int]) -> int:
+    """Approximates the memory used by a distance map."""
+    return sys.getsizeof(distances) + len(distances) * _ENTRY_BYTES
@@ -0,0 +1,339 @@
+from __future__ import annotations
+
+import mmap
+import os
+import tempfile
+import weakref
+from array import array
+from typing import TYPE_CHECKING, Iterator, Mapping, MutableMapping, Sequence
+
+from distance_cache import CacheInfo
+from vec2 import Vec2
+
+if TYPE_CHECKING:
+    from grid import Grid
+
+UNREACHABLE: int = 0xFFFF
+"""Stored in place of a distance for cells that can't reach the target."""
+
+
+def dense_row(grid: Grid, distances: Mapping[Vec2, int]) -> array[int]:
+    """Converts a distance map to an array with every cell's distance, using
+    `UNREACHABLE` for cells that aren't in the map.
+    """
+    if isinstance(distances, DistanceRow):
+        return array("H", distances.tobytes())
+
+    row = array("H", (UNREACHABLE,)) * grid.size
+    for pos, distance in distances.items():
+        if (index := grid.index(pos)) >= 0:
+            row[index] = distance
+
+    return row
+
+
+class DistanceMatrix(MutableMapping[Vec2, "DistanceRow"]):
+    """Dense storage of charted distances as a (cells x cells) uint16 matrix.
+
+    Row `t` holds the distance from every grid cell to cell `t`, so a charted
+    target costs 2 bytes per grid cell no matter how many cells can reach it,
+    and no dictionaries or `Vec2`s are made per target. Rows are looked up with
+    a target position, like a `DistanceCache`, and each row works like a
+    `dict[Vec2, int]` of distances.
+
+    Rows are only allocated once they're charted. The matrix can instead be
+    backed by a sparse file of its own, in which case it's memory-mapped and the
+    operating system only pages in (and only stores) the rows that are
+    actually used.
+    """
+
+    def __init__(
+        self,
+        grid: Grid,
+        directory: str | os.PathLike | None = None,
+        *,
+        name: str = "distances",
+    ):
+        """Creates an empty `DistanceMatrix`.
+
+        Args:
+            grid: The grid whose cells index the matrix. Its dimensions shouldn't
+                change while the matrix is in use.
+            directory: A directory to create the file backing the matrix in. The
+                file gets a unique name, so matrices never share one, and it's
+                deleted when the matrix is closed or garbage collected. If `None`,
+                the matrix is kept in memory. Defaults to None.
+            name: The start of the backing file's name. Defaults to "distances".
+        """
+        if grid.size > UNREACHABLE:
+            raise ValueError("The grid is too big to store its distances as uint16")
+
+        self._grid: Grid = grid
+        self._size: int = grid.size
+        self._directory: str | os.PathLike | None = directory
+        self._name: str = name
+
+        # each charted row, or None; rows of a file-backed matrix are views of it
+        self._rows: list[array[int] | memoryview | None] = [None] * self._size
+        self._mmap: mmap.mmap | None = None
+        self._distances: memoryview | None = None
+        self._finalizer: weakref.finalize | None = None
+        if directory is not None:
+            nbytes = self._size * self._size * 2
+            # mkstemp creates the file exclusively, so no other matrix has it open
+            fd, path = tempfile.mkstemp(prefix=f"{name}-", suffix=".bin", dir=directory)
+            try:
+                # extending the file leaves a hole, so disk space is only used by
+                # the rows that are written to
+                os.ftruncate(fd, nbytes)
+                self._mmap = mmap.mmap(fd, nbytes)
+            except BaseException:
+                os.close(fd)
+                os.remove(path)
+                raise
+
+            os.close(fd)
+            self._distances = memoryview(self._mmap).cast("H")
+            self._finalizer = weakref.finalize(
+                self, _close_file, self._mmap, self._distances, path
+            )
+
+        self._unreachable_row: array[int] = array("H", (UNREACHABLE,)) * self._size
+        self._charted: bytearray = bytearray(self._size)
+        self._count: int = 0
+
+        self.hits: int = 0
+        self.misses: int = 0
+
+    def __getitem__(self, target: Vec2) -> DistanceRow:
+        index = self._grid.index(target)
+        if index < 0 or not self._charted[index]:
+            self.misses += 1
+            raise KeyError(target)
+
+        self.hits += 1
+        return DistanceRow(self, index)
+
+    def row(self, target: int) -> DistanceRow:
+        """Gets the row for a charted target by index, without counting it as a hit."""
+        return DistanceRow(self, target)
+
+    def __setitem__(self, target: Vec2, distances: Mapping[Vec2, int]):
+        index = self._grid.index(target)
+        if index < 0:
+            raise KeyError(f"{target} isn't a point on the grid")
+
+        indexes = self._grid.indexes
+        reached = [
+            (indexes[pos], distance)
+            for pos, distance in distances.items()
+            if pos in indexes
+        ]
+        self.store_reached(
+            index, [cell for cell, _ in reached], [distance for _, distance in reached]
+        )
+
+    def __delitem__(self, target: Vec2):
+        index = self._grid.index(target)
+        if index < 0 or not self._charted[index]:
+            raise KeyError(target)
+
+        self._charted[index] = 0
+        self._count -= 1
+        if self._mmap is None:
+            self._rows[index] = None
+
+    def __contains__(self, target: object) -> bool:
+        index = self._grid.index(target)
+        return index >= 0 and bool(self._charted[index])
+
+    def __iter__(self) -> Iterator[Vec2]:
+        positions = self._grid.positions
+        return iter(
+            [positions[index] for index in range(self._size) if self._charted[index]]
+        )
+
+    def __len__(self) -> int:
+        return self._count
+
+    def values(self) -> list[DistanceRow]:
+        # skip __getitem__ so that iterating doesn't count as hits
+        return [self.row(index) for index in range(self._size) if self._charted[index]]
+
+    def items(self) -> list[tuple[Vec2, DistanceRow]]:
+        positions = self._grid.positions
+        return [(positions[row.target], row) for row in self.values()]
+
+    def clear(self):
+        self._charted[:] = bytes(self._size)
+        self._count = 0
+        if self._mmap is None:
+            self._rows = [None] * self._size
+
+    def resized(self, target: Vec2):
+        """Like `DistanceCache.resized`, but rows always take the same space, so
+        there's nothing to do.
+        """
+
+    def _row_buffer(self, target: int) -> array[int] | memoryview:
+        """Gets the storage for a target's row, allocating it if needed."""
+        row = self._rows[target]
+        if row is None:
+            if self._distances is None:
+                row = array("H", self._unreachable_row)
+            else:
+                start = target * self._size
+                row = self._distances[start : start + self._size]
+            self._rows[target] = row
+
+        return row
+
+    def store_reached(
+        self, target: int, cells: Sequence[int], distances: Sequence[int]
+    ):
+        """Stores a charted row from the cells that reached the target.
+
+        Args:
+            target: The index of the target cell.
+            cells: The indexes of every cell that can reach the target.
+            distances: The distance of each cell in `cells`.
+        """
+        # rows are filled in place, so existing DistanceRows see the new distances
+        row = self._row_buffer(target)
+        row[:] = self._unreachable_row
+        for cell, distance in zip(cells, distances):
+            row[cell] = distance
+
+        self._mark_charted(target)
+
+    def store_dense(self, target: int, distances: bytes):
+        """Stores a charted row that has already been converted to the matrix's
+        format, such as with `numpy.ndarray.astype("<u2").tobytes()`.
+
+        Args:
+            target: The index of the target cell.
+            distances: `size` native-endian uint16 distances, one for each cell,
+                with `UNREACHABLE` for cells that can't reach the target.
+        """
+        memoryview(self._row_buffer(target)).cast("B")[:] = distances
+        self._mark_charted(target)
+
+    def _mark_charted(self, target: int):
+        if not self._charted[target]:
+            self._charted[target] = 1
+            self._count += 1
+
+    def copy(self) -> DistanceMatrix:
+        """Makes a copy of the matrix. File-backed matrices are copied into a new
+        file in the same directory, so they can still be paged out.
+        """
+        new = DistanceMatrix(self._grid, self._directory, name=self._name)
+        for target in range(self._size):
+            if self._charted[target]:
+                new.store_dense(target, self._rows[target].tobytes())
+
+        new.hits, new.misses = self.hits, self.misses
+        return new
+
+    def close(self):
+        """Deletes the file backing the matrix, if it has one. The matrix can't be
+        used afterwards.
+        """
+        if self._finalizer is not None:
+            self._rows = [None] * self._size
+            self._distances = None
+            self._finalizer()
+
+    def info(self) -> CacheInfo:
+        """Gets the matrix's hit and miss counts and size, like `DistanceCache.info`.
+        Rows are never evicted.
+        """
+        return CacheInfo(self.hits, self.misses, 0, self._count, self.nbytes)
+
+    @property
+    def nbytes(self) -> int:
+        """Memory used by the matrix's charted rows."""
+        return self._count * self._size * 2 + len(self._charted)
+
+
+def _close_file(buffer: mmap.mmap, distances: memoryview, path: str):
+    """Unmaps and deletes the file backing a `DistanceMatrix`."""
+    try:
+        distances.release()
+        buffer.close()
+    except BufferError:
+        pass  # rows are still in use somewhere; the map goes when they do
+
+    try:
+        os.remove(path)
+    except OSError:
+        pass  # e.g. still mapped on Windows, or already gone
+
+
+class DistanceRow(MutableMapping[Vec2, int]):
+    """View of one row of a `DistanceMatrix` that works like a `dict[Vec2, int]`
+    relating positions to their distance to the row's target.
+    """
+
+    __slots__ = ("_grid", "_row", "target")
+
+    def __init__(self, matrix: DistanceMatrix, target: int):
+        self._grid: Grid = matrix._grid
+        self._row: array[int] | memoryview = matrix._rows[target]
+        self.target: int = target
+
+    def at(self, index: int) -> int:
+        """Gets the distance from a cell by index, or `UNREACHABLE`."""
+        return self._row[index]
+
+    def tobytes(self) -> bytes:
+        """Gets the whole row in the format taken by `DistanceMatrix.store_dense`."""
+        return self._row.tobytes()
+
+    def __getitem__(self, pos: Vec2) -> int:
+        index = self._grid.indexes.get(pos, -1)
+        if index >= 0:
+            distance = self._row[index]
+            if distance != UNREACHABLE:
+                return distance
+
+        raise KeyError(pos)
+
+    def get(self, pos: Vec2, default: int | None = None) -> int | None:
+        index = self._grid.indexes.get(pos, -1)
+        if index >= 0:
+            distance = self._row[index]
+            if distance != UNREACHABLE:
+                return distance
+
+        return default
+
+    def __contains__(self, pos: object) -> bool:
+        return self.get(pos) is not None
+
+    def __setitem__(self, pos: Vec2, distance: int):
+        index = self._grid.index(pos)
+        if index < 0:
+            raise KeyError(f"{pos} isn't a point on the grid")
+
+        self._row[index] = distance
+
+    def __delitem__(self, pos: Vec2):
+        index = self._grid.index(pos)
+        if index < 0 or self._row[index] == UNREACHABLE:
+            raise KeyError(pos)
+
+        self._row[index] = UNREACHABLE
+
+    def __iter__(self) -> Iterator[Vec2]:
+        positions = self._grid.positions
+        return iter(
+            [
+                positions[index]
+                for index, distance in enumerate(self._row)
+                if distance != UNREACHABLE
+            ]
+        )
+
+    def __len__(self) -> int:
+        return len(self._row) - self._row.tolist().count(UNREACHABLE)
@@ -0,0 +1,303 @@
+"""Charted distances saved to disk, so arenas that have been seen before don't
+need to be charted again.
+
+Each arena layout gets one file, named after its `Grid.fingerprint`. A file
+holds the path and ignore-paths distances of every target that was charted, as
+rows of little-endian uint16 distances (one per grid cell, `UNREACHABLE` for
+cells that can't reach the target).
+"""
+
+from __future__ import annotations
+
+import os
+import struct
+import sys
+import tempfile
+from array import array
+from typing import TYPE_CHECKING, BinaryIO, MutableMapping, NamedTuple
+
+from distance_matrix import UNREACHABLE, DistanceMatrix, dense_row
+from vec2 import Vec2
+
+if TYPE_CHECKING:
+    from grid import Grid
+
+_MAGIC: bytes = b"PMDIST1\0"
+# magic, grid size, number of path targets, number of ignore-paths targets
+_HEADER: struct.Struct = struct.Struct("<8sIII")
+_SUFFIX: str = ".dist"
+
+DistanceMap = MutableMapping[Vec2, MutableMapping[Vec2, int]]
+
+
+class Snapshot(NamedTuple):
+    """An arena's distances as (target, row) pairs, ready to be written."""
+
+    size: int
+    path_rows: list[tuple[int, bytes]]
+    coord_rows: list[tuple[int, bytes]]
+
+
+class DistanceStore:
+    """A directory of saved distances with a limit on its total size.
+
+    When saving pushes the directory over `max_bytes`, the least recently used
+    files (by modification time, which loading refreshes) are deleted first.
+    Files are written to a temporary file and then renamed into place, so a
+    crash or another process reading at the same time never sees half a file.
+    """
+
+    def __init__(
+        self, directory: str | os.PathLike, max_bytes: int | None = 256 * 1024**2
+    ):
+        """Creates a `DistanceStore`, creating its directory if needed.
+
+        Args:
+            directory: The directory to keep saved distances in.
+            max_bytes: The maximum total size of the saved files. If `None`, the
+                size is unlimited. Defaults to 256 MiB.
+        """
+        if max_bytes is not None and max_bytes <= 0:
+            raise ValueError("max_bytes must be positive")
+
+        self.directory: str | os.PathLike = directory
+        self.max_bytes: int | None = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, fingerprint: str) -> str:
+        return os.path.join(self.directory, fingerprint + _SUFFIX)
+
+    def __contains__(self, fingerprint: object) -> bool:
+        return isinstance(fingerprint, str) and os.path.exists(self._path(fingerprint))
+
+    def load(
+        self,
+        fingerprint: str,
+        grid: Grid,
+        path_distance_map: DistanceMap,
+        coord_distance_map: DistanceMap,
+    ) -> bool:
+        """Loads saved distances into the provided distance maps.
+
+        Args:
+            fingerprint: The fingerprint of the arena's layout.
+            grid: The arena's grid, which should have the same fingerprint.
+            path_distance_map: Where to put the distances that follow paths.
+            coord_distance_map: Where to put the distances that ignore paths.
+
+        Returns:
+            True if distances were loaded, False if none were saved for the
+                layout or the saved file couldn't be read.
+        """
+        path = self._path(fingerprint)
+        try:
+            with open(path, "rb") as file:
+                magic, size, path_count, coord_count = _HEADER.unpack(
+                    file.read(_HEADER.size)
+                )
+                if magic != _MAGIC or size != grid.size:
+                    raise ValueError("Saved distances don't match the arena")
+
+                path_rows = _read_rows(file, size, path_count)
+                coord_rows = _read_rows(file, size, coord_count)
+
+            os.utime(path)  # mark as recently used
+        except FileNotFoundError:
+            return False
+        except (OSError, ValueError, struct.error, EOFError):
+            # unreadable or from a different version; it'll be saved again
+            self._remove(path)
+            return False
+
+        for rows, distance_map in (
+            (path_rows, path_distance_map),
+            (coord_rows, coord_distance_map),
+        ):
+            for target, row in rows:
+                _store_row(grid, distance_map, target, row)
+
+        return True
+
+    def save(
+        self,
+        fingerprint: str,
+        grid: Grid,
+        path_distance_map: DistanceMap,
+        coord_distance_map: DistanceMap,
+    ):
+        """Saves the charted distances of an arena, replacing any saved before.
+
+        Same as `write` with a `snapshot` of the distances.
+
+        Args:
+            fingerprint: The fingerprint of the arena's layout.
+            grid: The arena's grid.
+            path_distance_map: The distances that follow paths.
+            coord_distance_map: The distances that ignore paths.
+        """
+        self.write(
+            fingerprint, self.snapshot(grid, path_distance_map, coord_distance_map)
+        )
+
+    @staticmethod
+    def snapshot(
+        grid: Grid, path_distance_map: DistanceMap, coord_distance_map: DistanceMap
+    ) -> Snapshot:
+        """Copies the charted distances of an arena in the format they're saved in,
+        so they can be written while the arena keeps changing.
+
+        Args:
+            grid: The arena's grid.
+            path_distance_map: The distances that follow paths.
+            coord_distance_map: The distances that ignore paths.
+        """
+        return Snapshot(
+            grid.size,
+            _dump_rows(grid, path_distance_map),
+            _dump_rows(grid, coord_distance_map),
+        )
+
+    def write(self, fingerprint: str, snapshot: Snapshot):
+        """Saves a snapshot of an arena's distances, replacing any saved before.
+
+        Args:
+            fingerprint: The fingerprint of the arena's layout when the snapshot
+                was taken.
+            snapshot: The distances, from `snapshot`.
+        """
+        with tempfile.NamedTemporaryFile(
+            dir=self.directory, suffix=".tmp", delete=False
+        ) as file:
+            try:
+                file.write(
+                    _HEADER.pack(
+                        _MAGIC,
+                        snapshot.size,
+                        len(snapshot.path_rows),
+                        len(snapshot.coord_rows),
+                    )
+                )
+                _write_rows(file, snapshot.path_rows)
+                _write_rows(file, snapshot.coord_rows)
+            except BaseException:
+                file.close()
+                self._remove(file.name)
+                raise
+
+        os.replace(file.name, self._path(fingerprint))
+        self._evict()
+
+    def clear(self):
+        """Deletes every saved file."""
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(_SUFFIX):
+                self._remove(entry.path)
+
+    @property
+    def nbytes(self) -> int:
+        """The total size of the saved files."""
+        return sum(size for _, size, _ in self._entries())
+
+    def _entries(self) -> list[tuple[float, int, str]]:
+        """Gets the (modification time, size, path) of every saved file."""
+        entries = []
+        for entry in os.scandir(self.directory):
+            if not entry.name.endswith(_SUFFIX):
+                continue
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:  # deleted by another process
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+        return entries
+
+    def _evict(self):
+        if self.max_bytes is None:
+            return
+
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        # never evict the newest file, even if it's too big on its own
+        for _, size, path in entries[:-1]:
+            if total <= self.max_bytes:
+                break
+            self._remove(path)
+            total -= size
+
+    @staticmethod
+    def _remove(path: str):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+def _dump_rows(grid: Grid, distance_map: DistanceMap) -> list[tuple[int, bytes]]:
+    """Converts every on-grid target of a distance map to a (target, row) pair."""
+    rows = []
+    for target, distances in distance_map.items():
+        index = grid.index(target)
+        if index < 0:
+            continue
+
+        rows.append((index, dense_row(grid, distances).tobytes()))
+
+    return rows
+
+
+def _write_rows(file: BinaryIO, rows: list[tuple[int, bytes]]):
+    targets = array("I", (target for target, _ in rows))
+    if sys.byteorder == "big":
+        targets.byteswap()
+    file.write(targets.tobytes())
+
+    for _, row in rows:
+        if sys.byteorder == "big":
+            swapped = array("H", row)
+            swapped.byteswap()
+            row = swapped.tobytes()
+        file.write(row)
+
+
+def _read_rows(file: BinaryIO, size: int, count: int) -> list[tuple[int, bytes]]:
+    targets = array("I")
+    targets.frombytes(_read_exactly(file, count * targets.itemsize))
+    if sys.byteorder == "big":
+        targets.byteswap()
+
+    rows = []
+    for target in targets:
+        if target >= size:
+            raise ValueError("Saved target is off the grid")
+
+        row = _read_exactly(file, size * 2)
+        if sys.byteorder == "big":
+            swapped = array("H", row)
+            swapped.byteswap()
+            row = swapped.tobytes()
+        rows.append((target, row))
+
+    return rows
+
+
+def _read_exactly(file: BinaryIO, nbytes: int) -> bytes:
+    data = file.read(nbytes)
+    if len(data) != nbytes:
+        raise EOFError("Saved distances are truncated")
+
+    return data
+
+
+def _store_row(grid: Grid, distance_map: DistanceMap, target: int, row: bytes):
+    """Stores a native-endian row of distances in either kind of distance map."""
+    if isinstance(distance_map, DistanceMatrix):
+        distance_map.store_dense(target, row)
+        return
+
+    positions = grid.positions
+    distance_map[positions[target]] = {
+        positions[cell]: distance
+        for cell, distance in enumerate(array("H", row))
+        if distance != UNREACHABLE
+    }
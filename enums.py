@@ -16,6 +16,16 @@ class GameState(Enum):
     EVADE = 2
 
 
+class CollisionMode(Enum):
+    """How collisions between pawns are found each update."""
+
+    SAMPLED = 0
+    """Hitboxes overlap at their positions when checked."""
+    SWEPT = 1
+    """Hitboxes overlapped at any point on their way from where they were at the
+    last update, so fast pawns can't pass through each other between updates."""
+
+
 class AbilityState(Enum):
     READY = 0
     CHARGING = 1
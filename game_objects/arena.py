@@ -1,19 +1,134 @@
+import heapq
+import os
+import threading
 import turtle
+import weakref
+from array import array
+from collections import deque
+from functools import partial
+from typing import Iterable, Iterator
 
+import numpy_backend
+import parallel_charting
+from corridor_graph import CorridorGraph
+from distance_cache import CacheInfo, DistanceCache
+from distance_matrix import UNREACHABLE, DistanceMatrix, DistanceRow, dense_row
+from distance_store import DistanceStore
 from enums import Direction
+from grid import DIRECTION_BITS, Grid, PointDistances
+from jump_field import chart_jump_layers
+from next_hop import FIRST_DIRECTION, NextHopTable
+from source_field import SourceField
 from vec2 import Path, Vec2
 
 
 class Arena:
     """Manages everything to do with the arena (paths and coordinates)."""
 
-    def __init__(self, arena_size: int = 20, path_len: int = 25):
+    def __init__(
+        self,
+        arena_size: int = 20,
+        path_len: int = 25,
+        *,
+        lazy: bool = False,
+        max_charted: int | None = None,
+        max_charted_bytes: int | None = None,
+        compact: bool = False,
+        mmap_dir: str | os.PathLike | None = None,
+        distance_store: DistanceStore | None = None,
+        contract_corridors: bool | None = None,
+        next_hops: bool = False,
+        search_before_charting: int = 0,
+    ):
+        """Creates an `Arena`.
+
+        Args:
+            arena_size (int, optional): The number of paths along each side of the arena. \
+                Defaults to 20.
+            path_len (int, optional): The length of a single path. Defaults to 25.
+            lazy (bool, optional): Whether to only chart distances to a target the first \
+                time they're needed rather than charting every target up front. Defaults to False.
+            max_charted (int | None, optional): The maximum number of charted targets to keep \
+                (for each of the path and ignore-paths distances); the least recently used are \
+                discarded first. If None, there is no limit. Defaults to None.
+            max_charted_bytes (int | None, optional): Like max_charted, but limits the \
+                approximate memory used by charted distances. Defaults to None.
+            compact (bool, optional): Whether to store charted distances in a dense uint16 \
+                matrix (2 bytes per pair of grid points) instead of dictionaries. Nothing is \
+                ever discarded from the matrix, so it can't be combined with max_charted or \
+                max_charted_bytes. Defaults to False.
+            mmap_dir (str | os.PathLike | None, optional): A directory to keep memory-mapped \
+                files backing the distance matrices in, so that huge arenas are only paged \
+                in as needed. Each arena creates files with unique names, which are deleted \
+                when the arena is closed. Implies compact. Defaults to None.
+            distance_store (DistanceStore | None, optional): Where to save charted distances \
+                between runs. chart_all_distances loads the distances saved for the arena's \
+                layout instead of charting them, and saves whatever it charts. If None, \
+                nothing is saved. Defaults to None.
+            contract_corridors (bool | None, optional): Whether to chart distances on a \
+                contracted graph of the arena, where each corridor between junctions and \
+                dead ends is a single edge. If None, it's used whenever most connected \
+                coordinates are in corridors. Defaults to None.
+            next_hops (bool, optional): Whether to keep a table of the best move from every \
+                coordinate toward each charted target, so get_best_direction is a single \
+                lookup. Costs 1 byte per pair of grid points. Defaults to False.
+            search_before_charting (int, optional): How many times distances to a target \
+                that hasn't been charted are found with point-to-point A* searches before \
+                the target is charted in full. Targets that are only queried a few times \
+                never need a full chart. Defaults to 0.
+
+        Raises:
+            ValueError: If compact distances are combined with a limit on charted distances.
+        """
+        compact = compact or mmap_dir is not None
+        if compact and (max_charted is not None or max_charted_bytes is not None):
+            raise ValueError(
+                "Compact distances can't be limited with max_charted or max_charted_bytes"
+            )
+
         self._arena_size: int = arena_size
         self._path_len: int = path_len
+        self._lazy: bool = lazy
+        self._compact: bool = compact
+        self._mmap_dir: str | os.PathLike | None = mmap_dir
+        self._max_charted: int | None = max_charted
+        self._max_charted_bytes: int | None = max_charted_bytes
+        self._distance_store: DistanceStore | None = distance_store
+        self._contract_corridors: bool | None = contract_corridors
+        # built when first needed, for each value of ignore_paths
+        self._corridor_graphs: dict[bool, CorridorGraph] = {}
+        self._next_hops: bool = next_hops
+        self._search_before_charting: int = search_before_charting
+        # number of searches made for each uncharted (target, ignore_paths)
+        self._searches: dict[tuple[Vec2, bool], int] = {}
         self._paths: set[Path] = set()
         self._coords: set[Vec2] = set((Vec2(0, 0),))
-        self._path_distance_map: dict[Vec2, dict[Vec2, int]] = dict()
-        self._coord_distance_map: dict[Vec2, dict[Vec2, int]] = dict()
+        self._grid: Grid = Grid.from_arena(
+            arena_size, path_len, self._coords, self._paths
+        )
+
+        # bumped whenever paths change, so background charting can tell if its
+        # results are out of date
+        self._paths_version: int = 0
+        self._lock: threading.RLock = threading.RLock()
+        self._charting_thread: threading.Thread | None = None
+        self._path_distance_map: DistanceCache | DistanceMatrix = (
+            self._new_distance_map("path_distances", False)
+        )
+        self._coord_distance_map: DistanceCache | DistanceMatrix = (
+            self._new_distance_map("coord_distances", True)
+        )
+        self._path_next_hops: NextHopTable = NextHopTable(self._grid)
+        self._coord_next_hops: NextHopTable = NextHopTable(self._grid, True)
+        # distances to each target with 0, 1, 2... jumps allowed
+        self._jump_fields: dict[int, list[array]] = {}
+        # named fields, with the paths version they were charted at
+        self._source_fields: dict[str, tuple[int, SourceField]] = {}
+        # worker processes for charting with workers > 1, started when first needed
+        self._charting_pool: parallel_charting.ChartingPool = (
+            parallel_charting.ChartingPool()
+        )
+        weakref.finalize(self, self._charting_pool.shutdown)
 
         self._turtle: turtle.Turtle = turtle.Turtle(visible=False)
         self._turtle.speed(0)
@@ -41,15 +156,20 @@ class Arena:
         Returns:
             Vec2: The coordinate 1 path_len in the provided direction from pos.
         """
+        # grid points already have a Vec2, so there's no need to make another
+        neighbor = self._grid.neighbor(self._grid.index(pos), direction)
+        if neighbor >= 0:
+            return self._grid.positions[neighbor]
+
         match direction:
             case Direction.NORTH:
-                return Vec2(pos.x, pos.y + self._path_len)
+                return Vec2(pos.x, pos.y + self._path_len).intern()
             case Direction.SOUTH:
-                return Vec2(pos.x, pos.y - self._path_len)
+                return Vec2(pos.x, pos.y - self._path_len).intern()
             case Direction.WEST:
-                return Vec2(pos.x - self._path_len, pos.y)
+                return Vec2(pos.x - self._path_len, pos.y).intern()
             case Direction.EAST:
-                return Vec2(pos.x + self._path_len, pos.y)
+                return Vec2(pos.x + self._path_len, pos.y).intern()
 
     def get_destination_greedy(
         self,
@@ -62,59 +182,55 @@ class Arena:
     ) -> tuple[Vec2, int]:
         """Like get_destination, but gets the final coord in an unobstructed path \
             starting from pos in the provided direction.
+
+        The length of every straight run is kept up to date by the arena's grid as paths \
+            are added and removed, so this is a single lookup no matter how far it goes.
             
         Args:
             pos (Vec2): The position to start from.
             direction (Direction): The direction to move in.
+            max_steps (int, optional): The maximum number of steps to take. If less than \
+                zero, there is no limit. Defaults to -1.
+            path_bound (bool, optional): Whether steps can be taken along paths. Defaults to True.
+            coord_bound (bool, optional): Whether steps can be taken onto any coordinate, \
+                whether or not a path leads there. Defaults to False.
 
         Returns:
             tuple[Vec2, int]: A pair containing the destination position and the \
                 number of path_len-sized steps it took to reach destination, respectively.
         """
-        transform: Vec2
-
-        match direction:
-            case Direction.NORTH:
-                transform = Vec2(0, self._path_len)
-            case Direction.SOUTH:
-                transform = Vec2(0, -self._path_len)
-            case Direction.WEST:
-                transform = Vec2(-self._path_len, 0)
-            case Direction.EAST:
-                transform = Vec2(self._path_len, 0)
-
-        steps: int = 1
-        prev_dest: Vec2 = pos
-        curr_dest: Vec2 = prev_dest + transform
-        while (
-            (path_bound and self.path_exists_d(prev_dest, curr_dest))
-            or (coord_bound and self.coord_exists_d(curr_dest))
-            and self.in_bounds(curr_dest)
-            and (max_steps < 0 or steps < max_steps)
-        ):
-            prev_dest = curr_dest
-            curr_dest = curr_dest + transform
-            steps += 1
+        index = self._grid.index(pos)
+        steps = 0
+        # every path leads to a coordinate, so coordinate runs cover path runs
+        if coord_bound or path_bound:
+            steps = self._grid.run(index, direction, coord_bound)
+        if max_steps >= 0:
+            steps = min(steps, max_steps)
 
-        # trace back one step since it was invalid.
-        steps -= 1
+        if steps == 0:
+            return pos.grid(self._path_len), 0
 
-        return prev_dest.grid(self._path_len), steps
+        return self._grid.positions[index + steps * self._grid.delta(direction)], steps
 
     def path_exists(self, pos: Vec2, direction: Direction) -> bool:
-        return {pos, self.get_destination(pos, direction)} in self._paths
+        index = self._grid.index(pos)
+        return index >= 0 and bool(
+            self._grid.path_masks[index] & DIRECTION_BITS[direction]
+        )
 
     def path_exists_d(self, pos: Vec2, destination: Vec2) -> bool:
         """
         Alternate to path_exists for when destination has already been calculated.
         """
-        return {pos, destination} in self._paths
+        return self._grid.has_path_between(pos, destination)
 
     def coord_exists(self, pos: Vec2, direction: Direction) -> bool:
-        return self.get_destination(pos, direction) in self._coords
+        return self._grid.has_coord(
+            self._grid.neighbor(self._grid.index(pos), direction)
+        )
 
     def coord_exists_d(self, destination: Vec2) -> bool:
-        return destination in self._coords
+        return self._grid.has_coord(self._grid.index(destination))
 
     def in_bounds(self, coord: Vec2) -> bool:
         """Checks if coord is in bounds"""
@@ -123,18 +239,320 @@ class Arena:
         # the ORs would short-circuit faster
         size = self.border_len // 2
         return not (
-            coord.x > size or coord.x < -size or coord.y > size or coord.x < -size
+            coord.x > size or coord.x < -size or coord.y > size or coord.y < -size
         )
 
+    def add_path(self, pos: Vec2, destination: Vec2) -> bool:
+        """Adds a path between two adjacent coordinates, repairing any charted distances.
+
+        Rather than charting everything again, only the distances that shrink because \
+            of the new path (or new coordinate) are updated, starting from the new path \
+            and spreading outwards until distances stop improving.
+
+        Args:
+            pos (Vec2): One end of the path.
+            destination (Vec2): The other end of the path; should be adjacent to pos.
+
+        Returns:
+            bool: True if the path was created, False if it already existed.
+
+        Raises:
+            ValueError: If pos and destination aren't adjacent points in the arena.
+        """
+        index = self._grid.index(pos)
+        dest_index = self._grid.index(destination)
+        if not self._grid.direction_bit(index, dest_index):
+            raise ValueError("Paths must connect two adjacent points in the arena")
+
+        with self._lock:
+            new_coords = [
+                self._grid.positions[i]
+                for i in (index, dest_index)
+                if not self._grid.coords[i]
+            ]
+            if not self._grid.add_path(index, dest_index):
+                return False
+
+            self._paths_version += 1
+            self._corridor_graphs.clear()
+            self._jump_fields.clear()
+            self._paths.add(frozenset((pos, destination)))
+            for coord in new_coords:
+                self._coords.add(coord)
+                self._repair_added_coord(coord)
+
+            for target, distances in self._path_distance_map.items():
+                changed = self._repair_added_path(distances, pos, destination)
+                self._path_distance_map.resized(target)
+                self._path_next_hops.repair(
+                    self._grid.index(target), distances, [index, dest_index, *changed]
+                )
+
+        return True
+
+    def remove_path(self, pos: Vec2, destination: Vec2) -> bool:
+        """Removes the path between two adjacent coordinates, repairing any charted distances.
+
+        Coordinates are left in the arena even if no paths lead to them anymore. Only \
+            the distance maps the path was actually a shortcut for are repaired, and within \
+            them only the coordinates whose shortest route used the path are recomputed.
+
+        Args:
+            pos (Vec2): One end of the path.
+            destination (Vec2): The other end of the path.
+
+        Returns:
+            bool: True if the path was removed, False if it didn't exist.
+        """
+        index = self._grid.index(pos)
+        dest_index = self._grid.index(destination)
+        with self._lock:
+            if not self._grid.remove_path(index, dest_index):
+                return False
+
+            self._paths_version += 1
+            self._corridor_graphs.clear()
+            self._jump_fields.clear()
+            self._paths.remove(frozenset((pos, destination)))
+            for target, distances in self._path_distance_map.items():
+                changed = self._repair_removed_path(distances, pos, destination)
+                self._path_distance_map.resized(target)
+                self._path_next_hops.repair(
+                    self._grid.index(target), distances, [index, dest_index, *changed]
+                )
+
+        return True
+
+    def remove_paths(self, paths: Iterable[Path]) -> int:
+        """Removes every provided path; see remove_path.
+
+        Args:
+            paths (Iterable[Path]): The paths to remove.
+
+        Returns:
+            int: The number of paths that were actually removed.
+        """
+        return sum(self.remove_path(*path) for path in list(paths))
+
+    def draw_path(self, path: Path, color: str = "black"):
+        """Draws a path on the screen, e.g. to erase one by drawing it in the background color.
+
+        Args:
+            path (Path): The path to draw.
+            color (str, optional): The color to draw with. Defaults to "black".
+        """
+        start, end = path
+        self._turtle.pencolor(color)
+        self._turtle.penup()
+        self._turtle.goto(*start)
+        self._turtle.pendown()
+        self._turtle.goto(*end)
+        self._turtle.penup()
+
+    def _new_distance_map(
+        self, name: str, ignore_paths: bool
+    ) -> DistanceCache | DistanceMatrix:
+        """Creates empty storage for charted distances, as set up in __init__.
+
+        Args:
+            name (str): The start of the name of the file backing the storage, if it's \
+                memory-mapped.
+            ignore_paths (bool): Whether the storage is for distances that ignore paths.
+        """
+        if not self._compact:
+            return DistanceCache(
+                self._max_charted,
+                self._max_charted_bytes,
+                partial(self._forget_next_hops, ignore_paths),
+            )
+
+        if self._mmap_dir is None:
+            return DistanceMatrix(self._grid)
+
+        return DistanceMatrix(self._grid, self._mmap_dir, name=name)
+
+    def close(self):
+        """Stops the worker processes used for charting with workers > 1, if any \
+            were started, and deletes the files backing memory-mapped distances. \
+            Worker processes are started again if they're needed later, but \
+            memory-mapped distances can't be used after closing.
+        """
+        self._charting_pool.shutdown()
+        for distance_map in (self._path_distance_map, self._coord_distance_map):
+            if isinstance(distance_map, DistanceMatrix):
+                distance_map.close()
+
     def clear_distances(self):
         self._path_distance_map.clear()
         self._coord_distance_map.clear()
+        self._path_next_hops.clear()
+        self._coord_next_hops.clear()
+        self._jump_fields.clear()
+        self._searches.clear()
+
+    def chart_all_distances(
+        self,
+        *,
+        recompute: bool = True,
+        use_numpy: bool | None = None,
+        workers: int = 1,
+    ):
+        """Charts distances to every valid coordinate.
+
+        Args:
+            recompute (bool, optional): Whether to chart coordinates that already have \
+                distances charted. Distances are kept up to date by add_path, so this only \
+                needs to be True if paths were changed some other way. Defaults to True.
+            use_numpy (bool | None, optional): Whether to chart every target at once with \
+                NumPy. If None, NumPy is used whenever it's installed and workers is 1. \
+                Defaults to None.
+            workers (int, optional): The number of processes to split the targets between. \
+                If 1, everything is charted in this process. Defaults to 1.
+        """
+        self._chart_all_into(
+            list(self._coords),
+            self._path_distance_map,
+            self._coord_distance_map,
+            recompute,
+            use_numpy,
+            workers,
+        )
+        with self._lock:
+            self._sync_next_hops()
+
+    def chart_all_distances_in_background(
+        self,
+        *,
+        recompute: bool = False,
+        use_numpy: bool | None = None,
+        workers: int = 1,
+    ) -> threading.Thread:
+        """Like chart_all_distances, but charts on a separate thread.
+
+        Distances are charted into copies of the current distance maps, which \
+            replace the current ones all at once when charting completes. Until then, \
+            pathfinding keeps using the last complete distances (charting any missing \
+            targets on demand). If paths change while charting, charting starts over.
+
+        Args:
+            recompute (bool, optional): Whether to chart coordinates that already have \
+                distances charted. Defaults to False.
+            use_numpy (bool | None, optional): See chart_all_distances. Defaults to None.
+            workers (int, optional): See chart_all_distances. Defaults to 1.
+
+        Returns:
+            threading.Thread: The charting thread.
+        """
+        self._charting_thread = threading.Thread(
+            name="Arena Distance Charting",
+            target=self._chart_in_background,
+            args=(recompute, use_numpy, workers),
+            daemon=True,
+        )
+        self._charting_thread.start()
+        return self._charting_thread
+
+    def _chart_in_background(
+        self, recompute: bool, use_numpy: bool | None, workers: int
+    ):
+        """Charting thread function; see chart_all_distances_in_background."""
+        while True:
+            with self._lock:
+                version = self._paths_version
+                coords = list(self._coords)
+                path_distance_map = self._path_distance_map.copy()
+                coord_distance_map = self._coord_distance_map.copy()
+
+            self._chart_all_into(
+                coords,
+                path_distance_map,
+                coord_distance_map,
+                recompute,
+                use_numpy,
+                workers,
+            )
+
+            with self._lock:
+                # if paths changed, the new distances are already out of date
+                if version == self._paths_version:
+                    # copies evict without touching the live next hops, which
+                    # are brought in line here instead
+                    for new, old in (
+                        (path_distance_map, self._path_distance_map),
+                        (coord_distance_map, self._coord_distance_map),
+                    ):
+                        if isinstance(new, DistanceCache):
+                            new.on_evict = old.on_evict
+                    self._path_distance_map = path_distance_map
+                    self._coord_distance_map = coord_distance_map
+                    self._sync_next_hops()
+                    return
+
+    def _chart_all_into(
+        self,
+        coords: list[Vec2],
+        path_distance_map: DistanceCache | DistanceMatrix,
+        coord_distance_map: DistanceCache | DistanceMatrix,
+        recompute: bool,
+        use_numpy: bool | None,
+        workers: int,
+    ):
+        """Internal version of chart_all_distances that takes in the coordinates to chart \
+            and the dictionaries to save results to.
+
+        If the arena has a distance store, saved distances for the current layout are \
+            loaded first, and anything charted afterwards is saved.
+        """
+        if use_numpy is None:
+            use_numpy = numpy_backend.HAS_NUMPY and workers == 1
+
+        store = self._distance_store
+        if store is not None:
+            with self._lock:
+                version = self._paths_version
+                fingerprint = self._grid.fingerprint()
+
+            if (
+                recompute
+                or any(coord not in path_distance_map for coord in coords)
+                or any(coord not in coord_distance_map for coord in coords)
+            ) and store.load(
+                fingerprint, self._grid, path_distance_map, coord_distance_map
+            ):
+                # saved distances are as good as freshly charted ones
+                recompute = False
+
+        charted = False
+        for ignore_paths, distance_map in (
+            (False, path_distance_map),
+            (True, coord_distance_map),
+        ):
+            targets = [
+                coord for coord in coords if recompute or coord not in distance_map
+            ]
+            charted = charted or bool(targets)
+            if use_numpy:
+                self._chart_distances_numpy(targets, distance_map, ignore_paths)
+            elif workers > 1:
+                self._chart_distances_parallel(
+                    targets, distance_map, ignore_paths, workers
+                )
+            else:
+                for target in targets:
+                    self._chart_distances(target, distance_map, ignore_paths)
+
+        if store is not None and charted:
+            with self._lock:
+                # don't save distances under a layout they no longer match
+                if version != self._paths_version:
+                    return
 
-    def chart_all_distances(self):
-        """Charts distances to every valid coordinate."""
-        for coord in self._coords:
-            self.chart_distances(coord)
-            self.chart_distances(coord, ignore_paths=True)
+                snapshot = store.snapshot(
+                    self._grid, path_distance_map, coord_distance_map
+                )
+
+            # writing to disk doesn't need to hold up pathfinding
+            store.write(fingerprint, snapshot)
 
     def chart_distances(self, pos: Vec2, *, ignore_paths: bool = False):
         """Charts the distance to the provided position, caching the results for later use.
@@ -156,9 +574,9 @@ class Arena:
     def _chart_distances(
         self,
         to_pos: Vec2,
-        distance_map: dict[Vec2, dict[Vec2, int]],
+        distance_map: DistanceCache | DistanceMatrix,
         ignore_paths: bool,
-    ):
+    ) -> dict[Vec2, int] | DistanceRow:
         """Internal version of chart_distances that takes in the dictionary to save results to.
 
         Args:
@@ -166,59 +584,512 @@ class Arena:
             ignore_paths (bool, optional): Whether to ignore paths when pathfinding. \
                 If True, then all adjacent coordinates are considered connected rather \
                 than only those connected explicitly by paths. Defaults to False.
-            distance_arena (dict[Vec2, dict[Vec2, int]]): The distance arena to use; \
+            distance_arena (DistanceCache): The distance arena to use; \
                 a dictionary arenaping end destination with another dictionary relating \
                 coordinates to their distance away from the end destination.
+
+        Returns:
+            dict[Vec2, int] | DistanceRow: The newly charted distances to to_pos.
         """
-        if to_pos not in distance_map:
-            distance_map[to_pos] = dict()
+        index = self._grid.index(to_pos)
+        distances: dict[Vec2, int] | DistanceRow
+        if isinstance(distance_map, DistanceMatrix):
+            if index < 0:
+                # off the grid, to_pos can only reach itself, and there's no row for it
+                return {to_pos: 0}
+
+            distance_map.store_reached(index, *self._chart_cell(index, ignore_paths))
+            distances = distance_map.row(index)
         else:
-            distance_map[to_pos].clear()
+            # chart first and store after, so the cache knows the map's full size
+            distances = {to_pos: 0}
+            self._pathfind(to_pos, distances, ignore_paths)
+            distance_map[to_pos] = distances
+
+        # maps being charted in the background get their next hops once they're in use
+        if (
+            self._next_hops
+            and index >= 0
+            and distance_map is self._distance_map(ignore_paths)
+        ):
+            with self._lock:
+                self._next_hop_table(ignore_paths).build(index, distances)
+
+        return distances
+
+    def _chart_distances_numpy(
+        self,
+        targets: list[Vec2],
+        distance_map: DistanceCache | DistanceMatrix,
+        ignore_paths: bool,
+    ):
+        """Like _chart_distances, but charts many targets at once using NumPy.
+
+        Args:
+            targets (list[Vec2]): The positions to chart distances to.
+            distance_map (DistanceCache): The distance arena to save results to.
+            ignore_paths (bool): Whether to ignore paths when pathfinding.
+        """
+        positions = numpy_backend.position_array(self._grid)
+        target_indexes = [self._grid.index(target) for target in targets]
+        for target, row in numpy_backend.chart_distance_rows(
+            self._grid, [index for index in target_indexes if index >= 0], ignore_paths
+        ):
+            if isinstance(distance_map, DistanceMatrix):
+                # the row's -1s wrap around to the matrix's UNREACHABLE
+                distance_map.store_dense(
+                    target, row.astype(numpy_backend.np.uint16).tobytes()
+                )
+                continue
+
+            reached = numpy_backend.np.flatnonzero(row != numpy_backend.UNREACHABLE)
+            distance_map[positions[target]] = dict(
+                zip(positions[reached].tolist(), row[reached].tolist())
+            )
+
+        # targets off the grid can only reach themselves; a matrix has no room for
+        # them, so they're charted again whenever they're needed
+        if isinstance(distance_map, DistanceMatrix):
+            return
+
+        for target, index in zip(targets, target_indexes):
+            if index < 0:
+                distance_map[target] = {target: 0}
+
+    def _chart_distances_parallel(
+        self,
+        targets: list[Vec2],
+        distance_map: DistanceCache | DistanceMatrix,
+        ignore_paths: bool,
+        workers: int,
+    ):
+        """Like _chart_distances, but splits the targets between worker processes.
+
+        Args:
+            targets (list[Vec2]): The positions to chart distances to.
+            distance_map (DistanceCache): The distance arena to save results to.
+            ignore_paths (bool): Whether to ignore paths when pathfinding.
+            workers (int): The number of worker processes to use.
+        """
+        positions = self._grid.positions
+        target_indexes = [self._grid.index(target) for target in targets]
+        for target, order, distances in self._charting_pool.chart_distance_rows(
+            self._grid,
+            [index for index in target_indexes if index >= 0],
+            ignore_paths,
+            workers,
+        ):
+            if isinstance(distance_map, DistanceMatrix):
+                distance_map.store_reached(target, order, distances)
+                continue
+
+            distance_map[positions[target]] = dict(
+                zip(map(positions.__getitem__, order), distances)
+            )
+
+        # targets off the grid can only reach themselves; a matrix has no room for
+        # them, so they're charted again whenever they're needed
+        if isinstance(distance_map, DistanceMatrix):
+            return
+
+        for target, index in zip(targets, target_indexes):
+            if index < 0:
+                distance_map[target] = {target: 0}
+
+    def _distance_map(self, ignore_paths: bool) -> DistanceCache | DistanceMatrix:
+        """Gets the distance map currently in use for paths or ignoring paths."""
+        return self._coord_distance_map if ignore_paths else self._path_distance_map
+
+    def _next_hop_table(self, ignore_paths: bool) -> NextHopTable:
+        """Gets the next hop table for paths or ignoring paths."""
+        return self._coord_next_hops if ignore_paths else self._path_next_hops
+
+    def _sync_next_hops(self):
+        """Makes the next hop tables match the distance maps in use: every charted \
+            target gets a row, and rows for targets that are no longer charted are \
+            dropped. Call while holding the lock.
+        """
+        if not self._next_hops:
+            return
+
+        grid = self._grid
+        for ignore_paths in (False, True):
+            distance_map = self._distance_map(ignore_paths)
+            table = self._next_hop_table(ignore_paths)
+            for target in list(table):
+                if grid.positions[target] not in distance_map:
+                    table.discard(target)
+
+            for target, distances in distance_map.items():
+                index = grid.index(target)
+                if index >= 0 and index not in table:
+                    table.build(index, distances)
+
+    def _forget_next_hops(self, ignore_paths: bool, target: Vec2):
+        """Drops the next hops of a target whose distances were evicted."""
+        index = self._grid.index(target)
+        if index >= 0:
+            self._next_hop_table(ignore_paths).discard(index)
+
+    def _get_distances(
+        self, target: Vec2, ignore_paths: bool = False
+    ) -> dict[Vec2, int] | DistanceRow:
+        """Gets the distances to target, charting them first if they aren't cached.
+
+        Args:
+            target (Vec2): The position distances are measured to.
+            ignore_paths (bool, optional): Whether to get the distances that ignore paths. \
+                Defaults to False.
+
+        Returns:
+            dict[Vec2, int] | DistanceRow: The distance map (pos: distance) for target.
+        """
+        distance_map = (
+            self._coord_distance_map if ignore_paths else self._path_distance_map
+        )
+        try:
+            return distance_map[target]
+        except KeyError:
+            return self._chart_distances(target, distance_map, ignore_paths)
+
+    def _lookup_distances(
+        self, target: Vec2, ignore_paths: bool = False
+    ) -> dict[Vec2, int] | DistanceRow | PointDistances:
+        """Like _get_distances, but for a target that hasn't been charted, searches for \
+            each distance instead until the target has been queried \
+            search_before_charting times.
+
+        Args:
+            target (Vec2): The position distances are measured to.
+            ignore_paths (bool, optional): Whether to get the distances that ignore paths. \
+                Defaults to False.
+
+        Returns:
+            dict[Vec2, int] | DistanceRow | PointDistances: The distances (pos: distance) \
+                to target.
+        """
+        target_index = self._grid.index(target)
+        if self._will_search(target_index, ignore_paths):
+            key = (target, ignore_paths)
+            self._searches[key] = self._searches.get(key, 0) + 1
+            return PointDistances(self._grid, target_index, ignore_paths)
+
+        self._searches.pop((target, ignore_paths), None)
+        return self._get_distances(target, ignore_paths)
+
+    def _will_search(self, target_index: int, ignore_paths: bool) -> bool:
+        """Whether _lookup_distances would search rather than chart for a target."""
+        if target_index < 0 or self._search_before_charting <= 0:
+            return False
+
+        target = self._grid.positions[target_index]
+        distance_map = (
+            self._coord_distance_map if ignore_paths else self._path_distance_map
+        )
+        return (
+            target not in distance_map
+            and self._searches.get((target, ignore_paths), 0)
+            < self._search_before_charting
+        )
 
-        distance_map[to_pos][to_pos] = 0
-        queue: list[Vec2] = []
-        self._pathfind(to_pos, queue, distance_map[to_pos], ignore_paths)
+    def distance_cache_info(self, *, ignore_paths: bool = False) -> CacheInfo:
+        """Gets statistics (hits, misses, evictions and size) for the charted distances.
+
+        Args:
+            ignore_paths (bool, optional): Whether to get statistics for the distances that \
+                ignore paths. Defaults to False.
+
+        Returns:
+            CacheInfo: The cache statistics.
+        """
+        return (
+            self._coord_distance_map if ignore_paths else self._path_distance_map
+        ).info()
 
     def _pathfind(
         self,
-        pos: Vec2,
-        queue: list[Vec2],
+        start: Vec2,
         distances: dict[Vec2, int],
         ignore_paths: bool = False,
     ):
-        """Recursive pathfinding algorithm.
+        """Iterative breadth-first pathfinding algorithm.
         
         This algorithm works as follows:
         1. start with the position we want to pathfind to
             the distance to this position should be marked 0 already.
-        2. find every valid move from pos, getting the destination coordinates
-            ignore coordinates we've already visited
-        3. add each destination to queue
-        4. set the distance for each destination to the distance to the current position + 1
-        5. if there are items in the queue, pop it, and run _pathfind again 
+        2. find every valid move from each position in the frontier (the positions \
+            furthest from the start so far), ignoring coordinates we've already visited
+        3. set the distance for each destination to the current distance + 1
+        4. the destinations become the next frontier; repeat from step 2 until it's empty
+
+        The search itself is Grid.chart, which runs on the arena's grid indexes and \
+            adjacency masks, so the only objects it makes are the distances themselves. \
+            Each position is visited once, making it linear in the number of coordinates \
+            and paths, and since it's a loop rather than recursion, there is no limit on \
+            how far it can reach. On arenas made mostly of corridors, CorridorGraph.chart \
+            is used instead; see _chart_cell.
 
         Args:
-            pos (Vec2): The position to pathfind from. If this is the start position, \
-                ensure distances[pos] = 0.
-            queue (list[Vec2]): The pathfinding queue.
+            start (Vec2): The position to pathfind from. Ensure distances[start] = 0.
             distances (dict[Vec2, int]): The distance arena (pos: distance) to modify.
             ignore_paths (bool, optional): Whether to ignore paths when considering if a move \
                 is possible. A move is always invalid if it doesn't go to an existing coordinate. \
                 Defaults to False.
         """
+        start_index = self._grid.index(start)
+        if start_index < 0:
+            return
 
-        for direction in Direction:
+        order, reached_distances = self._chart_cell(start_index, ignore_paths)
+        distances.update(
+            zip(map(self._grid.positions.__getitem__, order), reached_distances)
+        )
+
+    def _chart_cell(
+        self, index: int, ignore_paths: bool = False
+    ) -> tuple[array, array]:
+        """Charts the distances to a grid cell, on the corridor graph if it's in use.
+
+        Returns:
+            tuple[array, array]: See Grid.chart.
+        """
+        graph = self._corridor_graph(ignore_paths)
+        if graph is None:
+            return self._grid.chart(index, ignore_paths)
+
+        return graph.chart(index)
+
+    def _corridor_graph(self, ignore_paths: bool = False) -> CorridorGraph | None:
+        """Gets the corridor graph to chart distances on, building it if paths changed \
+            since it was last built.
+
+        Returns:
+            CorridorGraph | None: The graph, or None if distances should be charted on \
+                the grid itself.
+        """
+        if self._contract_corridors is False:
+            return None
+
+        with self._lock:
+            graph = self._corridor_graphs.get(ignore_paths)
+            if graph is None:
+                graph = CorridorGraph(self._grid, ignore_paths)
+                self._corridor_graphs[ignore_paths] = graph
+
+        # searching the graph only pays off when it's much smaller than the grid
+        if self._contract_corridors is None and len(graph.nodes) * 4 > graph.cells:
+            return None
+
+        return graph
+
+    def _repair_added_path(
+        self, distances: dict[Vec2, int], pos: Vec2, destination: Vec2
+    ) -> list[int]:
+        """Updates a path distance map after a path is added between pos and destination.
+
+        Args:
+            distances (dict[Vec2, int]): The distance map (pos: distance) to repair.
+            pos (Vec2): One end of the new path.
+            destination (Vec2): The other end of the new path.
+
+        Returns:
+            list[int]: The grid indexes of every coordinate whose distance changed.
+        """
+        pos_distance = distances.get(pos)
+        dest_distance = distances.get(destination)
+
+        # the new path can only help the end furthest from the target
+        if pos_distance is not None and (
+            dest_distance is None or pos_distance + 1 < dest_distance
+        ):
+            distances[destination] = pos_distance + 1
+            return self._propagate_decrease(destination, distances, False)
+        if dest_distance is not None and (
+            pos_distance is None or dest_distance + 1 < pos_distance
+        ):
+            distances[pos] = dest_distance + 1
+            return self._propagate_decrease(pos, distances, False)
+
+        return []
+
+    def _repair_added_coord(self, coord: Vec2):
+        """Updates every coord distance map (and its next hops) after coord is added \
+            to the arena.
+
+        Args:
+            coord (Vec2): The new coordinate.
+        """
+        index = self._grid.index(coord)
+        for target, distances in self._coord_distance_map.items():
+            changed = [index]
+            neighbor_distances = [
+                distances[neighbor]
+                for neighbor in self._connected_neighbors(coord, True)
+                if neighbor in distances
+            ]
+            if neighbor_distances:
+                distances[coord] = min(neighbor_distances) + 1
+                changed = self._propagate_decrease(coord, distances, True)
+                self._coord_distance_map.resized(target)
+
+            self._coord_next_hops.repair(self._grid.index(target), distances, changed)
+
+    def _repair_removed_path(
+        self, distances: dict[Vec2, int], pos: Vec2, destination: Vec2
+    ) -> list[int]:
+        """Updates a path distance map after the path between pos and destination is removed.
+
+        This works in two steps:
+        1. find every coordinate that lost all of its shortest routes, starting from the
+            end of the removed path furthest from the target and moving outwards one
+            distance at a time
+        2. recompute the distances of just those coordinates, starting from their
+            unaffected neighbors
+
+        Coordinates that can no longer reach the target are dropped from the map.
 
-            dest: Vec2 = self.get_destination(pos, direction)
-            if dest not in distances and (
-                (ignore_paths and self.coord_exists_d(dest))
-                or self.path_exists_d(pos, dest)
+        Args:
+            distances (dict[Vec2, int]): The distance map (pos: distance) to repair.
+            pos (Vec2): One end of the removed path.
+            destination (Vec2): The other end of the removed path.
+
+        Returns:
+            list[int]: The grid indexes of every coordinate whose distance changed.
+        """
+        pos_distance = distances.get(pos)
+        dest_distance = distances.get(destination)
+
+        # the path wasn't part of any shortest route to this target
+        if (
+            pos_distance is None
+            or dest_distance is None
+            or abs(pos_distance - dest_distance) != 1
+        ):
+            return []
+
+        # step 1: positions are queued in order of distance, so by the time a
+        # position is checked, all of its possible parents have been checked too
+        affected: set[Vec2] = set()
+        checked: set[Vec2] = set()
+        queue: deque[Vec2] = deque(
+            (destination if dest_distance > pos_distance else pos,)
+        )
+        while queue:
+            current = queue.popleft()
+            if current in checked:
+                continue
+            checked.add(current)
+
+            current_distance = distances[current]
+            neighbors = list(self._connected_neighbors(current))
+            if any(
+                neighbor not in affected
+                and distances.get(neighbor) == current_distance - 1
+                for neighbor in neighbors
             ):
-                queue.append(dest)
-                distances[dest] = distances[pos] + 1
+                continue
+
+            affected.add(current)
+            queue.extend(
+                neighbor
+                for neighbor in neighbors
+                if distances.get(neighbor) == current_distance + 1
+            )
+
+        # step 2: seed each affected position from its unaffected neighbors,
+        # then let shorter distances win, like Dijkstra's algorithm
+        for coord in affected:
+            del distances[coord]
+
+        heap: list[tuple[int, Vec2]] = []
+        for coord in affected:
+            neighbor_distances = [
+                distances[neighbor]
+                for neighbor in self._connected_neighbors(coord)
+                if neighbor in distances
+            ]
+            if neighbor_distances:
+                heapq.heappush(heap, (min(neighbor_distances) + 1, coord))
+
+        while heap:
+            current_distance, current = heapq.heappop(heap)
+            if current in distances:
+                continue
+
+            distances[current] = current_distance
+            for neighbor in self._connected_neighbors(current):
+                if neighbor in affected and neighbor not in distances:
+                    heapq.heappush(heap, (current_distance + 1, neighbor))
+
+        indexes = self._grid.indexes
+        return [indexes[coord] for coord in affected]
+
+    def _connected_neighbors(
+        self, pos: Vec2, ignore_paths: bool = False
+    ) -> Iterator[Vec2]:
+        """Yields every coordinate that can be moved to from pos in a single move.
+
+        Args:
+            pos (Vec2): The position to move from.
+            ignore_paths (bool, optional): Whether to ignore paths when considering if a move \
+                is possible. Defaults to False.
+        """
+        index = self._grid.index(pos)
+        if index < 0:
+            return
 
-        if len(queue) != 0:
-            self._pathfind(queue.pop(0), queue, distances, ignore_paths)
+        positions = self._grid.positions
+        for neighbor in self._grid.neighbors(index, ignore_paths):
+            yield positions[neighbor]
+
+    def _propagate_decrease(
+        self,
+        start: Vec2,
+        distances: dict[Vec2, int],
+        ignore_paths: bool = False,
+    ) -> list[int]:
+        """Spreads a shortened distance outwards from start.
+
+        Works just like _pathfind, except coordinates that have already been visited are \
+            revisited whenever start offers them a shorter route. The search stops as soon \
+            as distances stop shrinking, so only the affected part of the arena is touched.
+
+        Args:
+            start (Vec2): The position whose distance just shrank.
+            distances (dict[Vec2, int]): The distance map (pos: distance) to modify.
+            ignore_paths (bool, optional): Whether to ignore paths when considering if a move \
+                is possible. Defaults to False.
+
+        Returns:
+            list[int]: The grid indexes of start and every coordinate whose distance \
+                shrank because of it.
+        """
+        grid = self._grid
+        positions = grid.positions
+        masks = grid.coord_masks if ignore_paths else grid.path_masks
+        steps = grid.steps
+
+        start_index = grid.index(start)
+        if start_index < 0:
+            return []
+
+        changed: list[int] = [start_index]
+        queue: deque[int] = deque((start_index,))
+        while queue:
+            index = queue.popleft()
+            next_distance = distances[positions[index]] + 1
+            mask = masks[index]
+            for bit, delta in steps:
+                if (
+                    mask & bit
+                    and distances.get(positions[index + delta], next_distance + 1)
+                    > next_distance
+                ):
+                    queue.append(index + delta)
+                    changed.append(index + delta)
+                    distances[positions[index + delta]] = next_distance
+
+        return changed
 
     def get_charted_distance(
         self, start: Vec2, goal: Vec2, *, ignore_paths: bool = False
@@ -237,15 +1108,20 @@ class Arena:
 
         Returns:
             int: The number of single moves between start and goal.
+
+        Raises:
+            KeyError: If start can't reach goal.
         """
         goal = goal.grid(self._path_len)
-        distance_arena = (
-            self._coord_distance_map if ignore_paths else self._path_distance_map
-        )
-        if goal not in distance_arena:
-            self.chart_distances(goal, ignore_paths=ignore_paths)
+        # nothing to chart if start isn't on goal's side of the arena
+        if not self._grid.connected(
+            self._grid.index(goal), self._grid.index(start), ignore_paths
+        ):
+            if start == goal:
+                return 0
+            raise KeyError(start)
 
-        return distance_arena[goal][start]
+        return self._lookup_distances(goal, ignore_paths)[start]
 
     def get_movement_options(
         self, start: Vec2, target: Vec2, *, ignore_paths: bool = False
@@ -266,26 +1142,282 @@ class Arena:
         Returns:
             Direction: List of possible moves, formated as (direction, distance_to_target), \
                 ordered from lowest to highest distance_to_target. (i.e., the "best" move \
-                is result[0].)
+                is result[0].) Moves that can't lead to target are left out, so the list \
+                is empty if target can't be reached from start.
         """
         start = start.grid(self._path_len)
         target = target.grid(self._path_len)
-        if target not in self._path_distance_map:
-            self.chart_distances(target, ignore_paths=ignore_paths)
+        target_index = self._grid.index(target)
 
-        goal_map: dict[Vec2, int] = self._path_distance_map[target]
-
-        options: list[tuple[Direction, int]] = []
+        moves: list[tuple[Direction, Vec2]] = []
         for direction in Direction:
             dest = self.get_destination(start, direction)
-            if self.path_exists_d(start, dest) or (
-                ignore_paths and self.coord_exists_d(dest)
+            if (
+                self.path_exists_d(start, dest)
+                or (ignore_paths and self.coord_exists_d(dest))
+            ) and self._grid.connected(
+                target_index, self._grid.index(dest), ignore_paths
             ):
-                options.append((direction, goal_map[dest]))
+                moves.append((direction, dest))
+
+        # checking connections first means unreachable targets are never charted
+        if not moves:
+            return []
+
+        goal_map: dict[Vec2, int] | DistanceRow | PointDistances = (
+            self._lookup_distances(target, ignore_paths)
+        )
+        if isinstance(goal_map, PointDistances):
+            # one search for every move instead of one per move
+            goal_map.find([dest for _, dest in moves])
+
+        options: list[tuple[Direction, int]] = [
+            (direction, goal_map[dest]) for direction, dest in moves
+        ]
 
         # key just gets the distance part of the option
         return sorted(options, key=lambda op: op[1])
 
+    def get_best_direction(
+        self, start: Vec2, target: Vec2, *, ignore_paths: bool = False
+    ) -> Direction | None:
+        """Gets the best move from start toward target; the same as the first option \
+            from get_movement_options.
+
+        With next_hops enabled, the best moves from every coordinate toward a target \
+            are worked out when the target is charted (and repaired along with its \
+            distances when paths change), so for charted targets this is a single lookup.
+
+        Args:
+            start (Vec2): The position to move from.
+            target (Vec2): The target position.
+            ignore_paths (bool, optional): Whether to ignore paths when determining \
+                possible moves. Defaults to False.
+
+        Returns:
+            Direction | None: The direction to move in, or None if no move leads to target.
+        """
+        if self._next_hops:
+            start_index = self._grid.index(start.grid(self._path_len))
+            target_index = self._grid.index(target.grid(self._path_len))
+            table = self._coord_next_hops if ignore_paths else self._path_next_hops
+            if start_index >= 0 and target_index >= 0:
+                mask = table.get(start_index, target_index)
+                if mask:
+                    return FIRST_DIRECTION[mask]
+
+        # no table, target not charted yet, or no way to get closer; let
+        # get_movement_options decide (charting the target if needed)
+        options = self.get_movement_options(start, target, ignore_paths=ignore_paths)
+        return options[0][0] if options else None
+
+    def get_jump_distance(
+        self, start: Vec2, target: Vec2, *, max_jumps: int = 1
+    ) -> int:
+        """Gets the distance from start to target when up to max_jumps of the moves may \
+            be jumps between neighboring coordinates that aren't joined by a path.
+
+        Args:
+            start (Vec2): The position to move from.
+            target (Vec2): The target position.
+            max_jumps (int, optional): The most jumps that may be used. Defaults to 1.
+
+        Returns:
+            int: The number of single moves between start and target.
+
+        Raises:
+            KeyError: If start can't reach target, even with jumps.
+        """
+        start_index = self._grid.index(start.grid(self._path_len))
+        layers = self._get_jump_layers(target, max_jumps)
+        if layers is None or start_index < 0:
+            raise KeyError(start)
+
+        distance = layers[max_jumps][start_index]
+        if distance == UNREACHABLE:
+            raise KeyError(start)
+
+        return distance
+
+    def get_jump_move(
+        self, start: Vec2, target: Vec2, *, max_jumps: int = 1
+    ) -> tuple[Direction, bool] | None:
+        """Gets the best move from start toward target when up to max_jumps of the moves \
+            may be jumps between neighboring coordinates that aren't joined by a path.
+
+        Moves along paths are preferred over jumps that are just as good, so jumps aren't \
+            wasted.
+
+        Args:
+            start (Vec2): The position to move from.
+            target (Vec2): The target position.
+            max_jumps (int, optional): The most jumps that may be used. Defaults to 1.
+
+        Returns:
+            tuple[Direction, bool] | None: The direction to move in and whether the move \
+                is a jump, or None if no move leads to target.
+        """
+        start_index = self._grid.index(start.grid(self._path_len))
+        layers = self._get_jump_layers(target, max_jumps)
+        if layers is None or start_index < 0:
+            return None
+
+        path_mask = self._grid.path_masks[start_index]
+        jump_mask = self._grid.coord_masks[start_index] & ~path_mask if max_jumps else 0
+        best: tuple[int, bool, Direction] | None = None
+        for direction, (bit, delta) in zip(Direction, self._grid.steps):
+            if path_mask & bit:
+                option = (layers[max_jumps][start_index + delta], False, direction)
+            elif jump_mask & bit:
+                option = (layers[max_jumps - 1][start_index + delta], True, direction)
+            else:
+                continue
+
+            if option[0] != UNREACHABLE and (best is None or option[:2] < best[:2]):
+                best = option
+
+        return None if best is None else (best[2], best[1])
+
+    def _get_jump_layers(self, target: Vec2, max_jumps: int) -> list[array] | None:
+        """Gets the distances to target with 0 to max_jumps jumps allowed, charting \
+            them if needed.
+
+        Returns:
+            list[array] | None: The distances for each number of jumps, indexed by grid \
+                cell, or None if target isn't on the grid or can't be reached at all.
+        """
+        if max_jumps < 0:
+            raise ValueError("max_jumps can't be negative")
+
+        target = target.grid(self._path_len)
+        target_index = self._grid.index(target)
+        if target_index < 0:
+            return None
+
+        layers = self._jump_fields.get(target_index)
+        if layers is None or len(layers) <= max_jumps:
+            with self._lock:
+                layers = chart_jump_layers(
+                    self._grid,
+                    dense_row(self._grid, self._get_distances(target)),
+                    max_jumps,
+                )
+                self._jump_fields[target_index] = layers
+
+        return layers
+
+    def get_source_field(
+        self, name: str, sources: Iterable[Vec2], *, ignore_paths: bool = False
+    ) -> SourceField:
+        """Gets a field of the distance from every coordinate to the nearest of several \
+            sources, e.g. every player.
+
+        Fields are kept under a name so they can be shared; a field is only updated \
+            when one of its sources moves to a different grid point, so everyone using \
+            it pays for one search per move at most. Updates only search around the \
+            sources that moved, and the whole field is only charted again when paths \
+            change or sources are removed. Updates go into a copy, so fields that were \
+            already returned never change.
+
+        Args:
+            name (str): The name of the field.
+            sources (Iterable[Vec2]): The position of each source, in order; a source's \
+                place in the order is its identifier in the field.
+            ignore_paths (bool, optional): Whether to ignore paths when determining \
+                possible moves. Defaults to False.
+
+        Returns:
+            SourceField: The up to date field.
+        """
+        cells = tuple(self._grid.index(pos.grid(self._path_len)) for pos in sources)
+        with self._lock:
+            version, field = self._source_fields.get(name, (-1, None))
+            if (
+                field is None
+                or version != self._paths_version
+                or field.grid is not self._grid
+                or field.ignore_paths != ignore_paths
+            ):
+                field = SourceField(self._grid, ignore_paths)
+                field.chart(cells)
+                self._source_fields[name] = (self._paths_version, field)
+            elif field.sources != cells:
+                field = field.copy()
+                field.update(cells)
+                self._source_fields[name] = (self._paths_version, field)
+
+            return field
+
+    def connected(self, a: Vec2, b: Vec2, *, ignore_paths: bool = False) -> bool:
+        """Checks whether there's any route between a and b, without pathfinding.
+
+        Args:
+            a (Vec2): One position.
+            b (Vec2): The other position.
+            ignore_paths (bool, optional): Whether all adjacent coordinates count as \
+                connected, as if a path bridged them. Defaults to False.
+
+        Returns:
+            bool: True if a can reach b.
+        """
+        with self._lock:
+            return self._grid.connected(
+                self._grid.index(b.grid(self._path_len)),
+                self._grid.index(a.grid(self._path_len)),
+                ignore_paths,
+            )
+
+    def component_of(self, pos: Vec2, *, ignore_paths: bool = False) -> int:
+        """Gets an identifier for the group of coordinates connected to pos; two \
+            positions are connected exactly when they have the same identifier.
+
+        Identifiers can change whenever paths are added or removed, so they should only \
+            be compared with each other until then.
+
+        Args:
+            pos (Vec2): The position to check.
+            ignore_paths (bool, optional): Whether all adjacent coordinates count as \
+                connected, as if a path bridged them. Defaults to False.
+
+        Returns:
+            int: The identifier, or -1 if pos isn't in the arena.
+        """
+        index = self._grid.index(pos.grid(self._path_len))
+        if index < 0:
+            return -1
+
+        with self._lock:
+            return self._grid.component(index, ignore_paths)
+
+    @property
+    def is_charting(self) -> bool:
+        """Whether distances are currently being charted in the background."""
+        return self._charting_thread is not None and self._charting_thread.is_alive()
+
+    @property
+    def lazy(self) -> bool:
+        """Whether distances are only charted when they're first needed."""
+        return self._lazy
+
+    @property
+    def fingerprint(self) -> str:
+        """A stable hash of the arena's dimensions, coordinates and paths; arenas with \
+            the same layout have the same fingerprint, even between runs."""
+        with self._lock:
+            return self._grid.fingerprint()
+
+    @property
+    def grid(self) -> Grid:
+        """The grid the arena's coordinates and paths are charted on; it's replaced \
+            when the arena's dimensions change."""
+        return self._grid
+
+    @property
+    def paths_version(self) -> int:
+        """A count that goes up whenever paths are added or removed or the grid is \
+            rebuilt, for telling whether something charted on the grid is stale."""
+        return self._paths_version
+
     @property
     def path_capacity(self) -> int:
         return 2 * self.arena_size * (self.arena_size + 1)
@@ -307,6 +1439,7 @@ class Arena:
         if new <= 0:
             return ValueError("path_len must be positive")
         self._path_len = new
+        self._rebuild_grid()
 
     @property
     def arena_size(self) -> int:
@@ -317,11 +1450,33 @@ class Arena:
         if new <= 0:
             return ValueError("arena_size must be positive")
         self._arena_size = new
+        self._rebuild_grid()
+
+    def _rebuild_grid(self):
+        """Rebuilds the grid after the arena's dimensions change."""
+        self._grid = Grid.from_arena(
+            self._arena_size, self._path_len, self._coords, self._paths
+        )
+        self._paths_version += 1
+        self._corridor_graphs.clear()
+        self._path_next_hops = NextHopTable(self._grid)
+        self._coord_next_hops = NextHopTable(self._grid, True)
+        self._jump_fields.clear()
+        if self._compact:
+            # matrices are laid out for a single grid size
+            self._path_distance_map.close()
+            self._coord_distance_map.close()
+            self._path_distance_map = self._new_distance_map("path_distances", False)
+            self._coord_distance_map = self._new_distance_map("coord_distances", True)
+        else:
+            self.clear_distances()
 
     @property
     def paths(self) -> set[Path]:
+        """Every path in the arena; use add_path and remove_path to change them."""
         return self._paths
 
     @property
     def coords(self) -> set[Vec2]:
+        """Every coordinate in the arena; coordinates are added by add_path."""
         return self._coords
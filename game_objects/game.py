@@ -1,15 +1,22 @@
 from __future__ import annotations
 
+import asyncio
 import threading
 import time
+import tkinter
 import turtle
 from functools import partial
+from typing import Any, Callable, Coroutine
 
 import behaviors
 import config
-from enums import Direction, GameState
+from enums import CollisionMode, Direction, GameState
 from game_objects.arena import Arena
+from game_objects.pawn_array import PawnArray
 from game_objects.pawns import Enemy, Pawn, Player
+from game_objects.scheduler import Scheduler
+from source_field import SourceField
+from vec2 import Vec2
 
 
 class Game:
@@ -19,6 +26,8 @@ class Game:
         arena: Arena | None = None,
         screen: turtle.Screen | None = None,
         config: config.Config = config.Config(),
+        *,
+        collision_mode: CollisionMode = CollisionMode.SAMPLED,
     ):
         """Initializes the Game object.
 
@@ -29,16 +38,34 @@ class Game:
             screen: The turtle Screen instance to use. If `None`, a Screen is
                 created automatically. Defaults to None.
             config: The game configuration settings to use.
+            collision_mode: How collisions between players and enemies are found.
+                `SWEPT` catches fast pawns that pass through each other between
+                updates, so it keeps working at a lower `tps`. Defaults to
+                `SAMPLED`.
         """
         # frankly, idk if providing a screen is even necessary...
         self.screen = screen or turtle.Screen()
         self.arena: Arena = arena or Arena()
         self.config: config.Config = config
+        self.collision_mode: CollisionMode = collision_mode
 
         self._state = GameState.FROZEN
         self._pawns: list[Pawn] = []
         self._players: list[Player] = []
         self._enemies: list[Enemy] = []
+        # every pawn's position and movement, for one pass per update
+        self.pawn_array: PawnArray = PawnArray(self.arena.path_len)
+        self._enemy_slots: set[int] = set()
+        # the distance to the nearest enemy, moved along with enemies as they
+        # change cells; charted when first needed and again after paths change
+        self._threat_field: SourceField | None = None
+        self._threat_version: int = -1
+        # each enemy's slot, and its source in the threat field
+        self._enemy_sources: dict[int, int] = {}
+        # runs every pawn's moves and turns, one step per tick
+        self.scheduler: Scheduler = Scheduler(self.config.tick_interval_s)
+        # found by the last update, shared by everything that checks
+        self._collisions: list[tuple[Player, Enemy]] = []
 
         self._score = 0
         self._round_start_time: float = 0
@@ -56,9 +83,11 @@ class Game:
         self._level_turt.penup()
         self._level_turt.goto(0, arena.border_len // 2)
 
-        self._levelup_timer: threading.Timer | None = None
-
-        threading.Thread(target=self._update_score_display_loop, daemon=True).start()
+        self._levelup_timer: threading.Timer | asyncio.Task | None = None
+        # set while the game is run by `mainloop_async`
+        self._event_loop: asyncio.AbstractEventLoop | None = None
+        # tasks on the event loop that haven't finished, cancelled when it ends
+        self._tasks: set[asyncio.Task] = set()
 
     def begin_level(self, *, level_duration: int | float | None = None):
         """Starts the currently set level.
@@ -73,19 +102,30 @@ class Game:
                 Defaults to None.
         """
 
-        if self._round_start_time != 0 or (
-            self._levelup_timer is not None and self._levelup_timer.is_alive()
-        ):
+        if self._round_start_time != 0 or self._level_is_timed():
             print("Currently in Level; cannot start!")
             return
 
         self._round_start_time = time.time()
         self.set_state(GameState.EVADE)
-        self._levelup_timer = threading.Timer(
-            level_duration or self.config.calculate_level_duration(self._level),
-            lambda: self.set_level(self._level + 1),
-        )
-        self._levelup_timer.start()
+        duration = level_duration or self.config.calculate_level_duration(self._level)
+        if self._event_loop is not None:
+            self._levelup_timer = self.create_task(self._level_up_after(duration))
+        else:
+            self._levelup_timer = threading.Timer(
+                duration, lambda: self.set_level(self._level + 1)
+            )
+            self._levelup_timer.start()
+
+    def _level_is_timed(self) -> bool:
+        """Whether the current level's timer is still running."""
+        if isinstance(self._levelup_timer, threading.Timer):
+            return self._levelup_timer.is_alive()
+        return self._levelup_timer is not None and not self._levelup_timer.done()
+
+    async def _level_up_after(self, duration: int | float):
+        await asyncio.sleep(duration)
+        self.set_level(self._level + 1)
 
     def set_level(self, level: int, *, paths: int | None = None):
         """Sets the current level, running any level configuration functions and
@@ -138,9 +178,10 @@ class Game:
         self._state = state
 
     def gameover(self):
-        """Ends the game."""
+        """Ends the game, cancelling every move and turn that's still going."""
         print("GAMEOVER")
         self.set_state(GameState.FROZEN)
+        self.scheduler.cancel_all()
 
     def add_pawn(self, pawn: Pawn):
         """Adds a pawn to the game. `Player`s and `Enemy`s are automatically
@@ -151,10 +192,74 @@ class Game:
         """
         self._pawns.append(pawn)
         if isinstance(pawn, Enemy):
+            self._enemy_sources[pawn.slot] = len(self._enemies)
             self._enemies.append(pawn)
+            self._enemy_slots.add(pawn.slot)
+            if self._threat_field is not None:
+                field = self._threat_field
+                field.update(field.sources + (self._enemy_cell(field, pawn.slot),))
         elif isinstance(pawn, Player):
             self._players.append(pawn)
 
+    def nearest_player(self, pos: Vec2, *, ignore_paths: bool = False) -> Player | None:
+        """Gets the player with the shortest route from a position.
+
+        Args:
+            pos: The position to start from.
+            ignore_paths: Whether routes may cross between neighboring coordinates
+                that aren't joined by a path, e.g. for pawns that can jump gaps.
+                Defaults to False.
+
+        Returns:
+            The nearest player, or None if no player can be reached.
+        """
+        player = self._player_field(ignore_paths).source(pos)
+        return None if player is None else self._players[player]
+
+    def _enemy_cell(self, field: SourceField, slot: int) -> int:
+        """Gets the index of the grid point an enemy's slot is nearest."""
+        pos = self.pawn_array.pos(slot)
+        return field.grid.index(pos.grid(self.arena.path_len))
+
+    def _move_threats(self, moved: list[int]):
+        """Moves the enemies among the slots that moved in the threat field, if
+        they changed cells.
+        """
+        field = self._threat_field
+        if field is None:
+            return
+        if self._threat_version != self.arena.paths_version:
+            self._threat_field = None  # charted again when it's next needed
+            return
+
+        for slot in moved:
+            source = self._enemy_sources.get(slot)
+            if source is not None:
+                field.move(source, self._enemy_cell(field, slot))
+
+    def danger(self, pos: Vec2) -> int | None:
+        """Gets the number of moves the nearest enemy is from a position.
+
+        Args:
+            pos: The position to check.
+
+        Returns:
+            The number of moves, or None if no enemy can reach the position.
+        """
+        return self.threat_field.distance(pos)
+
+    def safest_neighbor(self, pos: Vec2) -> Direction | None:
+        """Gets the move from a position to the neighboring coordinate that's
+        farthest from every enemy.
+
+        Args:
+            pos: The position to move from.
+
+        Returns:
+            The direction of the move, or None if there's no move from `pos`.
+        """
+        return self.threat_field.farthest_direction(pos)
+
     def _write_score(self, score: int):
         """Writes the given score to the screen.
 
@@ -168,34 +273,165 @@ class Game:
             font=("Roboto Mono", 15, "normal"),
         )
 
+    def _update_score_display(self):
+        """Updates game score based elapsed time during the round."""
+        if self.is_evade_mode:
+            current_score = self._score + self.config.calculate_score_per_second(
+                self._level
+            ) * (time.time() - self._round_start_time)
+            self._write_score(current_score)
+
     def _update_score_display_loop(self):
         """Loop that updates game score based elapsed time during the round."""
         while True:
-            if self.is_evade_mode:
-                current_score = self._score + self.config.calculate_score_per_second(
-                    self._level
-                ) * (time.time() - self._round_start_time)
-                self._write_score(current_score)
-
+            self._update_score_display()
             time.sleep(self.config.score_update_interval)
 
+    async def _update_score_display_task(self):
+        """Like `_update_score_display_loop`, but for `mainloop_async`."""
+        while True:
+            self._update_score_display()
+            await asyncio.sleep(self.config.score_update_interval)
+
+    def call_later(self, delay_ms: int, callback: Callable[[], Any]):
+        """Calls a function after a delay, on the game's event loop when run by
+        `mainloop_async`, or the screen's timer otherwise.
+
+        Args:
+            delay_ms: The delay, in milliseconds.
+            callback: The function to call.
+        """
+        if self._event_loop is not None:
+            self._event_loop.call_later(delay_ms / 1000, callback)
+        else:
+            self.screen.ontimer(callback, delay_ms)
+
+    def create_task(self, coroutine: Coroutine[Any, Any, Any]) -> asyncio.Task:
+        """Runs a coroutine as a task on the game's event loop, which is cancelled
+        if it's still running when the game stops. Only for games run by
+        `mainloop_async`.
+
+        Args:
+            coroutine: The coroutine to run.
+
+        Returns:
+            The task.
+        """
+        if self._event_loop is None:
+            raise RuntimeError("The game isn't running on an event loop")
+
+        task = self._event_loop.create_task(coroutine)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
     def update(self):
-        """Updates the screen and checks for `Player`-`Enemy` collisions if
-        in `EVADE` mode.
+        """Steps every pawn's moves and turns, moves and draws every moving pawn,
+        updates the screen and checks for `Player`-`Enemy` collisions if in
+        `EVADE` mode.
+
+        This is the game's only loop for pawns, so the number of pawns doesn't
+        change the number of threads.
         """
+        if self._update_pawns():
+            self.screen.update()
+            self.screen.ontimer(self.update, self.config.tick_interval_ms // 2)
 
-        if self.is_evade_mode:
-            for player in self._players:
-                for enemy in self._enemies:
-                    if player.intersects(enemy):
-                        self.gameover()
-                        return
+    def _update_pawns(self) -> bool:
+        """Does the work of one `update`, without touching the screen.
+
+        Returns:
+            False if the game ended, True otherwise.
+        """
+        now = time.monotonic()
+        self.scheduler.tick(now)
+
+        pawn_array = self.pawn_array
+        moved, _ = pawn_array.advance(now)
+        for slot in moved:
+            pawn_array.owners[slot]._turtle.setpos(
+                pawn_array.xs[slot], pawn_array.ys[slot]
+            )
+        self._move_threats(moved)
 
-        self.screen.update()
-        self.screen.ontimer(self.update, self.config.tick_interval_ms // 2)
+        if self.is_evade_mode:
+            self._collisions = [
+                (pawn_array.owners[player], pawn_array.owners[enemy])
+                for player, enemy in pawn_array.collisions(
+                    (player.slot for player in self._players),
+                    self._enemy_slots,
+                    swept=self.collision_mode == CollisionMode.SWEPT,
+                )
+            ]
+            if self._collisions:
+                self.gameover()
+                return False
+        else:
+            self._collisions = []
+
+        return True
 
     def mainloop(self):
         """"""
+        self._setup()
+        threading.Thread(target=self._update_score_display_loop, daemon=True).start()
+        listener = threading.Thread(target=self.screen.listen, daemon=True)
+        listener.start()
+
+        # screen.listen()
+
+        self.screen.tracer(0, 0)
+        self.update()
+        print(threading.activeCount())
+        for thread in threading.enumerate():
+            print(thread.name)
+
+        self.set_level(1)
+        self.screen.mainloop()
+
+    def mainloop_async(self):
+        """Like `mainloop`, but runs the game on an asyncio event loop instead of
+        Tk's mainloop and helper threads.
+
+        Updates, level timers, the score display and enemy behaviors are all
+        tasks or callbacks on the one loop, which also pumps Tk's events.
+        """
+        asyncio.run(self.run_async())
+
+    async def run_async(self):
+        """Runs the game on the running event loop until it's over.
+
+        See `mainloop_async`.
+        """
+        self._event_loop = asyncio.get_running_loop()
+        try:
+            self._setup()
+            self.create_task(self._update_score_display_task())
+            self.screen.listen()
+            self.screen.tracer(0, 0)
+            self.set_level(1)
+
+            # handles key presses and screen timers too, and redraws
+            canvas = self.screen.getcanvas()
+            try:
+                while self._update_pawns():
+                    canvas.update()
+                    await asyncio.sleep(self.config.tick_interval_s / 2)
+
+                canvas.update()
+            except tkinter.TclError:
+                pass  # the window was closed
+        finally:
+            # enemy behaviors, the level timer and the score display
+            tasks = list(self._tasks)
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            self.scheduler.cancel_all()
+            self._event_loop = None
+
+    def _setup(self):
+        """Adds the player, draws the arena and binds the controls."""
         player = Player(self, turn_speed=-1)
         # enemy = Enemy(
         #     self,
@@ -232,19 +468,11 @@ class Game:
         self.set_state(GameState.PATH)
         # enemy.refresh(self.screen)
         # charger.refresh(self.screen)
-        listener = threading.Thread(target=self.screen.listen, daemon=True)
-        listener.start()
-
-        # screen.listen()
 
-        self.screen.tracer(0, 0)
-        self.update()
-        print(threading.activeCount())
-        for thread in threading.enumerate():
-            print(thread.name)
-
-        self.set_level(1)
-        self.screen.mainloop()
+    @property
+    def event_loop(self) -> asyncio.AbstractEventLoop | None:
+        """The event loop running the game, if it's run by `mainloop_async`."""
+        return self._event_loop
 
     @property
     def pawns(self) -> list[Pawn]:
@@ -261,6 +489,54 @@ class Game:
         """List of Enemies in the Game"""
         return self._enemies
 
+    @property
+    def player_field(self) -> SourceField:
+        """The distance from every coordinate to the nearest player, with the
+        player's index in `players` as its source.
+
+        The field is shared by everything that asks for it, and is only searched
+        again once a player moves to another grid point.
+        """
+        return self._player_field(False)
+
+    def _player_field(self, ignore_paths: bool) -> SourceField:
+        """Gets `player_field`, or its equivalent that ignores paths."""
+        return self.arena.get_source_field(
+            "players_ignoring_paths" if ignore_paths else "players",
+            (player.pos for player in self._players),
+            ignore_paths=ignore_paths,
+        )
+
+    @property
+    def threat_field(self) -> SourceField:
+        """The distance from every coordinate to the nearest enemy, with the
+        enemy's index in `enemies` as its source.
+
+        The game keeps the field itself, searching again around each enemy as
+        every update finds it moved to another grid point, so reading it is only
+        a lookup. It's updated in place, and charted from scratch after paths
+        change.
+        """
+        field = self._threat_field
+        if field is None or self._threat_version != self.arena.paths_version:
+            self._threat_version = self.arena.paths_version
+            field = SourceField(self.arena.grid)
+            field.chart(
+                tuple(self._enemy_cell(field, enemy.slot) for enemy in self._enemies)
+            )
+            self._threat_field = field
+
+        return field
+
+    @property
+    def collisions(self) -> list[tuple[Player, Enemy]]:
+        """The `Player`-`Enemy` pairs that were touching at the last update.
+
+        Collisions are found once per update for every pawn together, so there's
+        no need to check them again elsewhere.
+        """
+        return self._collisions
+
     @property
     def score(self) -> float:
         """Current player score."""
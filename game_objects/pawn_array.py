@@ -0,0 +1,296 @@
+from __future__ import annotations
+
+import math
+import threading
+from array import array
+from typing import TYPE_CHECKING, AbstractSet, Iterable
+
+from vec2 import Vec2
+
+if TYPE_CHECKING:
+    from .pawns import Pawn
+
+
+class PawnArray:
+    """The positions, hitboxes and in-flight moves of every pawn in a game, kept
+    in parallel arrays indexed by each pawn's slot.
+
+    Keeping them together lets the game move, draw and check collisions for every
+    pawn in one pass per tick, instead of each pawn doing its own work on its own
+    thread. A move's position is measured from where and when it started, rather
+    than from the last tick, so moves don't drift and never pass their target no
+    matter how unevenly `advance` is called.
+
+    Slots are also bucketed in a spatial hash of `cell_size` square cells, kept up
+    to date as they move, so collision checks only look at nearby slots. Where
+    each slot was before the last `advance` is kept too, for collision checks
+    that sweep hitboxes along the way they moved.
+    """
+
+    def __init__(self, cell_size: int | float):
+        """Creates an empty `PawnArray`.
+
+        Args:
+            cell_size: The size of the spatial hash's cells, e.g. the arena's
+                `path_len`.
+        """
+        if cell_size <= 0:
+            raise ValueError("cell_size must be positive")
+
+        self.xs: array[float] = array("d")
+        self.ys: array[float] = array("d")
+        self.radii: array[float] = array("d")
+        # positions before the last advance
+        self.prev_xs: array[float] = array("d")
+        self.prev_ys: array[float] = array("d")
+
+        # the in-flight move of each slot; velocities are in units per second
+        self.start_xs: array[float] = array("d")
+        self.start_ys: array[float] = array("d")
+        self.velocity_xs: array[float] = array("d")
+        self.velocity_ys: array[float] = array("d")
+        self.target_xs: array[float] = array("d")
+        self.target_ys: array[float] = array("d")
+        self.start_times: array[float] = array("d")
+        self.durations: array[float] = array("d")
+
+        self.owners: list[Pawn] = []
+
+        self.cell_size: int | float = cell_size
+        self._buckets: dict[tuple[int, int], set[int]] = {}
+        self._cells: list[tuple[int, int]] = []
+        self._max_radius: float = 0
+        # slots moved by the last advance, and the farthest any of them went
+        self._swept: list[int] = []
+        self._max_sweep: float = 0
+
+        self._in_flight: set[int] = set()
+        # slots placed since the last advance, which it reports as moved
+        self._placed: list[int] = []
+        # moves are started from pawn threads and advanced by the game
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.owners)
+
+    def add(self, owner: Pawn, pos: Vec2, radius: int | float) -> int:
+        """Adds a pawn that isn't moving.
+
+        Args:
+            owner: The pawn.
+            pos: The pawn's position.
+            radius: The radius of the pawn's hitbox.
+
+        Returns:
+            The pawn's slot.
+        """
+        with self._lock:
+            for column in (self.xs, self.prev_xs, self.start_xs, self.target_xs):
+                column.append(pos[0])
+            for column in (self.ys, self.prev_ys, self.start_ys, self.target_ys):
+                column.append(pos[1])
+            for column in (self.velocity_xs, self.velocity_ys):
+                column.append(0)
+            self.start_times.append(0)
+            self.durations.append(0)
+            self.radii.append(radius)
+            self.owners.append(owner)
+
+            slot = len(self.owners) - 1
+            self._cells.append(self._cell(pos[0], pos[1]))
+            self._buckets.setdefault(self._cells[slot], set()).add(slot)
+            self._max_radius = max(self._max_radius, radius)
+            return slot
+
+    def pos(self, slot: int) -> Vec2:
+        """Gets the current position of a slot."""
+        return Vec2(self.xs[slot], self.ys[slot])
+
+    def set_radius(self, slot: int, radius: int | float):
+        """Sets the radius of a slot's hitbox."""
+        with self._lock:
+            self.radii[slot] = radius
+            self._max_radius = max(self.radii)
+
+    def place(self, slot: int, pos: Vec2):
+        """Puts a slot at a position right away, stopping any move it was making.
+
+        The slot doesn't sweep from its last position, like it was teleported.
+        """
+        with self._lock:
+            self._in_flight.discard(slot)
+            if (self.xs[slot], self.ys[slot]) == pos:
+                return  # e.g. a move that just ended; keep its sweep
+
+            self.xs[slot], self.ys[slot] = pos
+            self.prev_xs[slot], self.prev_ys[slot] = pos
+            self._rehash(slot)
+            self._placed.append(slot)
+
+    def _cell(self, x: float, y: float) -> tuple[int, int]:
+        return math.floor(x / self.cell_size), math.floor(y / self.cell_size)
+
+    def _rehash(self, slot: int):
+        """Moves a slot to the bucket of its current cell, if it changed cells."""
+        cell = self._cell(self.xs[slot], self.ys[slot])
+        old = self._cells[slot]
+        if cell == old:
+            return
+
+        bucket = self._buckets[old]
+        bucket.discard(slot)
+        if not bucket:
+            del self._buckets[old]
+        self._buckets.setdefault(cell, set()).add(slot)
+        self._cells[slot] = cell
+
+    def start_move(self, slot: int, dest: Vec2, speed: int | float, now: float):
+        """Starts moving a slot in a straight line toward a destination.
+
+        Args:
+            slot: The slot to move.
+            dest: Where the move ends.
+            speed: The speed of the move, in units per second.
+            now: The time the move starts, from `time.monotonic`.
+        """
+        with self._lock:
+            x, y = self.xs[slot], self.ys[slot]
+            distance = math.hypot(dest[0] - x, dest[1] - y)
+
+            self.start_xs[slot], self.start_ys[slot] = x, y
+            self.target_xs[slot], self.target_ys[slot] = dest
+            self.start_times[slot] = now
+            self.durations[slot] = distance / speed
+            if distance:
+                self.velocity_xs[slot] = (dest[0] - x) * speed / distance
+                self.velocity_ys[slot] = (dest[1] - y) * speed / distance
+            else:
+                self.velocity_xs[slot] = self.velocity_ys[slot] = 0
+
+            self._in_flight.add(slot)
+
+    def is_moving(self, slot: int) -> bool:
+        return slot in self._in_flight
+
+    def advance(self, now: float) -> tuple[list[int], list[int]]:
+        """Moves every in-flight slot to where it should be at a time.
+
+        Args:
+            now: The current time, from `time.monotonic`.
+
+        Returns:
+            The slots that moved, including ones placed since the last call, and
+                the slots among them whose moves are done.
+        """
+        xs, ys = self.xs, self.ys
+        prev_xs, prev_ys = self.prev_xs, self.prev_ys
+        moved: list[int] = []
+        arrived: list[int] = []
+        with self._lock:
+            # slots that stopped since the last advance haven't moved since
+            for slot in self._swept:
+                prev_xs[slot], prev_ys[slot] = xs[slot], ys[slot]
+
+            max_sweep = 0.0
+            for slot in self._in_flight:
+                prev_xs[slot], prev_ys[slot] = xs[slot], ys[slot]
+                elapsed = now - self.start_times[slot]
+                if elapsed >= self.durations[slot]:
+                    xs[slot], ys[slot] = self.target_xs[slot], self.target_ys[slot]
+                    arrived.append(slot)
+                else:
+                    xs[slot] = self.start_xs[slot] + self.velocity_xs[slot] * elapsed
+                    ys[slot] = self.start_ys[slot] + self.velocity_ys[slot] * elapsed
+                self._rehash(slot)
+                moved.append(slot)
+                max_sweep = max(
+                    max_sweep,
+                    math.hypot(xs[slot] - prev_xs[slot], ys[slot] - prev_ys[slot]),
+                )
+
+            self._in_flight.difference_update(arrived)
+            self._swept = moved
+            self._max_sweep = max_sweep
+
+            if self._placed:
+                # placed slots didn't sweep, but did change position
+                swept = set(moved)
+                moved = moved + [
+                    slot for slot in dict.fromkeys(self._placed) if slot not in swept
+                ]
+                self._placed = []
+
+        return moved, arrived
+
+    def intersects(self, slot: int, other: int) -> bool:
+        """Checks whether the hitboxes of two slots overlap, without a sqrt."""
+        dx = self.xs[slot] - self.xs[other]
+        dy = self.ys[slot] - self.ys[other]
+        min_distance = self.radii[slot] + self.radii[other]
+        return dx * dx + dy * dy <= min_distance * min_distance
+
+    def collisions(
+        self, slots: Iterable[int], others: AbstractSet[int], *, swept: bool = False
+    ) -> list[tuple[int, int]]:
+        """Finds every pair of overlapping hitboxes between two groups of slots.
+
+        Only slots in the spatial hash cells near each slot in the first group
+        are compared, so the cost depends on how crowded it is around the first
+        group rather than on the size of the second.
+
+        Args:
+            slots: The first group, e.g. every player's slot.
+            others: The second group as a set, e.g. every enemy's slot.
+            swept: Whether to count hitboxes that overlapped at any point while
+                moving in straight lines from their positions before the last
+                advance, instead of only at their current positions. Defaults to
+                False.
+
+        Returns:
+            (slot, other) pairs whose hitboxes overlap.
+        """
+        buckets = self._buckets
+        intersects = self.swept_intersects if swept else self.intersects
+        pairs: list[tuple[int, int]] = []
+        with self._lock:
+            for slot in slots:
+                # how far away an overlapping hitbox's center could be now
+                distance = self.radii[slot] + self._max_radius
+                if swept:
+                    distance += self._max_sweep + math.hypot(
+                        self.xs[slot] - self.prev_xs[slot],
+                        self.ys[slot] - self.prev_ys[slot],
+                    )
+                reach = math.ceil(distance / self.cell_size)
+                column, row = self._cells[slot]
+                for x in range(column - reach, column + reach + 1):
+                    for y in range(row - reach, row + reach + 1):
+                        for other in buckets.get((x, y), ()):
+                            if other in others and intersects(slot, other):
+                                pairs.append((slot, other))
+
+        return pairs
+
+    def swept_intersects(self, slot: int, other: int) -> bool:
+        """Checks whether the hitboxes of two slots overlapped at any point while
+        moving from their positions before the last advance to where they are now.
+
+        Both are taken to move in straight lines at steady speeds, so the gap
+        between them moves in a straight line too, and they overlapped if the
+        closest it came was within the sum of their radii.
+        """
+        # the gap between them before and after
+        start_x = self.prev_xs[slot] - self.prev_xs[other]
+        start_y = self.prev_ys[slot] - self.prev_ys[other]
+        change_x = self.xs[slot] - self.xs[other] - start_x
+        change_y = self.ys[slot] - self.ys[other] - start_y
+
+        # how far along the gap was smallest, kept between before and after
+        length = change_x * change_x + change_y * change_y
+        t = 0.0
+        if length:
+            t = min(max(-(start_x * change_x + start_y * change_y) / length, 0.0), 1.0)
+
+        dx, dy = start_x + change_x * t, start_y + change_y * t
+        min_distance = self.radii[slot] + self.radii[other]
+        return dx * dx + dy * dy <= min_distance * min_distance
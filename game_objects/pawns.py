@@ -1,10 +1,11 @@
 from __future__ import annotations
 
-import threading
+import asyncio
+import time
 import turtle
 from contextlib import contextmanager
 from functools import partial
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Generator
 
 import keyboard
 
@@ -63,22 +64,10 @@ class Pawn(Entity):
 
         self._name: str | None = name
         self._moving = False
-        self._pos: Vec2 = pos
+        # position and hitbox are kept in the game's PawnArray
+        self._slot: int = game.pawn_array.add(self, pos, hitbox_radius or size)
         self.pawn_speed: int = speed
         self.turn_speed: int | None = turn_speed
-        self.hitbox_radius: int | float = hitbox_radius or size
-
-        self._move_args: tuple[Any, ...]
-        self._move_kwargs: tuple[str, Any]
-
-        self._listener: threading.Thread = threading.Thread(
-            name=f"{name or f'Pawn-{self._pawn_count}'} Move Listener",
-            target=self._move_listen,
-            daemon=True,
-        )
-        self._move_event: threading.Event = threading.Event()
-        self._listener.start()
-        self._lock = threading.Lock()
 
         self._setup()
 
@@ -100,10 +89,11 @@ class Pawn(Entity):
         if speed is not None:
             self._turtle.speed(speed)
 
-        yield
-
-        if speed is not None:
-            self._turtle.speed(self.pawn_speed)
+        try:
+            yield
+        finally:
+            if speed is not None:
+                self._turtle.speed(self.pawn_speed)
 
     @contextmanager
     def moving(self, draw: bool = True, speed: int | None = None):
@@ -127,31 +117,54 @@ class Pawn(Entity):
         else:
             self._turtle.penup()
 
-        with self.temp_speed(speed):
-            yield  # run code within the context manager
+        # a move can be cancelled or fail partway, and still has to finish
+        try:
+            with self.temp_speed(speed):
+                yield  # run code within the context manager
+        finally:
+            if draw:
+                self._turtle.penup()
 
-        if draw:
-            self._turtle.penup()
-
-        self._moving = False
+            self._moving = False
 
     def set_heading(
         self, heading: int | float, rotation_speed: int | float | None = None
     ):
         """Rotates the `Pawn` at a specified speed (dependent on configured
-        game tick speed).
+        game tick speed), waiting until it's done.
+
+        The rotation is run by the game's scheduler, so this can't be called
+        from the game's update loop.
 
         Args:
             heading: The new heading (in degrees) to rotate the pawn to.
             rotation_speed: The speed at which to rotate the pawn.
                 Defaults to None.
         """
-        for deg in utils.interpolate_deg(
+        self.game.scheduler.wait(self._turn_steps(heading, rotation_speed))
+
+    async def set_heading_async(
+        self, heading: int | float, rotation_speed: int | float | None = None
+    ):
+        """Like `set_heading`, but awaits the rotation instead of blocking."""
+        await self.game.scheduler.run_async(self._turn_steps(heading, rotation_speed))
+
+    def _turn_steps(
+        self, heading: int | float, rotation_speed: int | float | None = None
+    ) -> Generator[None, None, None]:
+        """Like `set_heading`, but turns one step each time the game's scheduler
+        steps it.
+        """
+        degrees = utils.interpolate_deg(
             self._turtle.heading(),
             heading,
             rotation_speed or self.turn_speed or self.pawn_speed * 2,
             self.game.config,
-        ):
+            sleep=False,
+        )
+        self._turtle.setheading(next(degrees))
+        for deg in degrees:
+            yield
             self._turtle.setheading(deg)
 
     def move(
@@ -167,7 +180,10 @@ class Pawn(Entity):
         greedy: bool = False,
         max_greedy_steps: int = -1,
     ) -> bool | None:
-        """Moves the pawn in the specified direction.
+        """Moves the pawn in the specified direction, waiting until it's done.
+
+        The move is run by the game's scheduler, so this can't be called from the
+        game's update loop; use `threaded_move` there instead.
 
         Args:
             direction: The direction to move the pawn.
@@ -199,9 +215,70 @@ class Pawn(Entity):
             bool | None: Always returns None when path=False.
                 Otherwise, returns True if new path was created, False if not.
         """
+        return self.game.scheduler.wait(
+            Pawn._move_steps(
+                self,
+                direction,
+                path=path,
+                validate_path=validate_path,
+                validate_border=validate_border,
+                speed=speed,
+                change_heading=change_heading,
+                turn_speed=turn_speed,
+                greedy=greedy,
+                max_greedy_steps=max_greedy_steps,
+            )
+        )
+
+    async def move_async(
+        self,
+        direction: Direction,
+        *,
+        path: bool = False,
+        validate_path: bool = True,
+        validate_border: bool = True,
+        speed: int | None = None,
+        change_heading: bool = True,
+        turn_speed: int | None = None,
+        greedy: bool = False,
+        max_greedy_steps: int = -1,
+    ) -> bool | None:
+        """Like `move`, but awaits the move instead of blocking. See `move` for
+        the arguments.
+        """
+        return await self.game.scheduler.run_async(
+            Pawn._move_steps(
+                self,
+                direction,
+                path=path,
+                validate_path=validate_path,
+                validate_border=validate_border,
+                speed=speed,
+                change_heading=change_heading,
+                turn_speed=turn_speed,
+                greedy=greedy,
+                max_greedy_steps=max_greedy_steps,
+            )
+        )
 
+    def _move_steps(
+        self,
+        direction: Direction,
+        *,
+        path: bool = False,
+        validate_path: bool = True,
+        validate_border: bool = True,
+        speed: int | None = None,
+        change_heading: bool = True,
+        turn_speed: int | None = None,
+        greedy: bool = False,
+        max_greedy_steps: int = -1,
+    ) -> Generator[None, None, bool | None]:
+        """Like `move`, but moves one step each time the game's scheduler steps it,
+        returning what `move` would.
+        """
         if self._moving or self.game.is_frozen:
-            return
+            return None
 
         with self.moving(path, speed):
             dest: Vec2
@@ -229,46 +306,46 @@ class Pawn(Entity):
                 return None
 
             if change_heading:
-                self.set_heading(direction.value, turn_speed)
+                yield from self._turn_steps(direction.value, turn_speed)
 
             prev_pos = self._pos
-            for pos in utils.interpolate_vec2(
-                self._pos, dest, speed or self.pawn_speed, self.game.config
-            ):
-                self._pos = pos
-                self._turtle.setpos(*pos)
+            move_speed = speed or self.pawn_speed
+            if move_speed <= 0:
+                self._pos = dest
+                self._turtle.setpos(*dest)
+            else:
+                # the game advances and draws every moving pawn together each
+                # update
+                self.game.pawn_array.start_move(
+                    self._slot,
+                    dest,
+                    move_speed / self.game.config.tick_interval_s,
+                    time.monotonic(),
+                )
+                try:
+                    while self.game.pawn_array.is_moving(self._slot):
+                        yield
+                finally:
+                    # stop where it is if the move was cancelled
+                    pawn_array = self.game.pawn_array
+                    if pawn_array.is_moving(self._slot):
+                        pawn_array.place(self._slot, pawn_array.pos(self._slot))
 
             # ensure we end up precisely at the intended destination
             self._pos = dest
 
             if path:
-                p = frozenset((prev_pos, dest))
-                path_created = p not in self.game.arena.paths
-                self.game.arena.paths.add(p)
-                self.game.arena.coords.add(dest)
-                return path_created
+                return self.game.arena.add_path(prev_pos, dest)
 
     def threaded_move(self, *args, **kwargs):
-        """See `Pawn.move` for more info; this calls `move` on a separate thread."""
+        """See `Pawn.move` for more info; this queues the move on the game's
+        scheduler and returns right away. It's ignored if the pawn is already
+        moving or has a move queued.
+        """
         if self._moving:
             return
 
-        with self._lock:  # honestly, idk if this does anything...
-            self._move_args = args
-            self._move_kwargs = kwargs
-            self._move_event.set()
-
-    def _move_listen(self):
-        """Function for this Pawn's move listener.
-
-        Listens for a threaded move request; executes the move. This should
-        be ran on its own thread.
-        """
-
-        while True:
-            self._move_event.wait()
-            self.move(*self._move_args, **self._move_kwargs)
-            self._move_event.clear()
+        self.game.scheduler.schedule(self, self._move_steps(*args, **kwargs))
 
     def teleport(self, pos: Vec2):
         """Convinience method for teleporting the `Pawn` instantly to a provided
@@ -279,7 +356,7 @@ class Pawn(Entity):
         """
         with self.moving(False, 0):
             self._pos = pos
-            self.goto(*pos)
+            self._turtle.setpos(*pos)
 
     def center(self):
         """Teleports this pawn to the center of the map."""
@@ -302,18 +379,40 @@ class Pawn(Entity):
         # every point on the circumference of a circle is equal distance from
         # the center, so we know two circles are intersecting if the distance
         # between their centers is shorter than the sum of their radii
-        min_distance = other.hitbox_radius + self.hitbox_radius
-        return self._pos.distance(other._pos) <= min_distance
+        # (compared squared, which skips the sqrt)
+        return self.game.pawn_array.intersects(self._slot, other._slot)
+
+    @property
+    def _pos(self) -> Vec2:
+        return self.game.pawn_array.pos(self._slot)
+
+    @_pos.setter
+    def _pos(self, new: Vec2):
+        self.game.pawn_array.place(self._slot, new)
 
     @property
     def pos(self) -> Vec2:
-        """The pawn's current position.
+        """The pawn's current position, read from the game's `PawnArray`.
 
         To set position, use `move`, `threaded_move`, or `teleport`.
         """
         # this is a property because we don't want people to manually set pos
         return self._pos
 
+    @property
+    def slot(self) -> int:
+        """The pawn's slot in the game's `PawnArray`."""
+        return self._slot
+
+    @property
+    def hitbox_radius(self) -> int | float:
+        """The radius of the pawn's circular hitbox."""
+        return self.game.pawn_array.radii[self._slot]
+
+    @hitbox_radius.setter
+    def hitbox_radius(self, new: int | float):
+        self.game.pawn_array.set_radius(self._slot, new)
+
     @property
     def is_moving(self) -> bool:
         """Whether the pawn is actively moving or not."""
@@ -335,17 +434,29 @@ class Player(Pawn):
         )
 
     def move(self, direction: Direction):
-        if super().move(
-            direction,
-            path=self.game.is_path_mode,
-            validate_path=not self.game.is_path_mode,
-            greedy=self.game.is_evade_mode and keyboard.is_pressed("shift"),
+        self.game.scheduler.wait(self._move_steps(direction))
+
+    async def move_async(self, direction: Direction):
+        await self.game.scheduler.run_async(self._move_steps(direction))
+
+    def _move_steps(self, direction: Direction) -> Generator[None, None, None]:
+        if (
+            yield from super()._move_steps(
+                direction,
+                path=self.game.is_path_mode,
+                validate_path=not self.game.is_path_mode,
+                greedy=self.game.is_evade_mode and keyboard.is_pressed("shift"),
+            )
         ):
             self.paths -= 1
 
         if self.game.is_path_mode and self._paths <= 0:
-            # threading.Thread(target=self.game.arena.chart_all_distances).start()
-            self.game.arena.chart_all_distances()
+            # existing distances were repaired as paths were added, and enemies
+            # keep using them until the new coordinates are charted
+            if not self.game.arena.lazy:
+                self.game.arena.chart_all_distances_in_background(
+                    workers=self.game.config.chart_workers
+                )
             self.game.begin_level()
 
     @property
@@ -372,6 +483,10 @@ class Player(Pawn):
 
 
 class Enemy(Pawn):
+
+    behavior_interval_ms: int = 400
+    """The time between calls to the enemy behavior's `enact` method."""
+
     def __init__(
         self,
         game: Game,
@@ -423,6 +538,19 @@ class Enemy(Pawn):
     def behavior_loop(self, screen: turtle.Screen):
         """Repeated calls the enemy behavior's `enact` method after a short
         delay.
+
+        When the game is run by `Game.mainloop_async`, this starts a task on the
+        game's event loop instead.
         """
+        if self.game.event_loop is not None:
+            self.game.create_task(self._behave())
+            return
+
         self._behavior.enact()
-        screen.ontimer(partial(self.behavior_loop, screen), 400)
+        screen.ontimer(partial(self.behavior_loop, screen), self.behavior_interval_ms)
+
+    async def _behave(self):
+        """Like `behavior_loop`, as a task on the game's event loop."""
+        while True:
+            self._behavior.enact()
+            await asyncio.sleep(self.behavior_interval_ms / 1000)
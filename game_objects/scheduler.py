@@ -0,0 +1,227 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import traceback
+from typing import Any, Callable, Generator, Hashable
+
+Steps = Generator[None, None, Any]
+"""An action that yields after each step and returns its result when done."""
+
+_Action = tuple[
+    Steps,
+    Callable[[Any], None] | None,
+    Callable[[BaseException], None] | None,
+]
+"""An action, what to call with its result, and what to call if it fails."""
+
+
+class Scheduler:
+    """Runs every pawn's in-flight actions (moves and turns) one step per tick, all
+    on the thread that calls `tick`, instead of a thread per pawn that sleeps
+    between steps.
+
+    Actions are generators: each `next` does one tick's worth of work, and the
+    generator's return value is the action's result. Each owner (e.g. a pawn) has
+    at most one action at a time.
+    """
+
+    def __init__(self, tick_interval_s: float, *, max_catch_up: int = 5):
+        """Creates a `Scheduler` with no actions.
+
+        Args:
+            tick_interval_s: The time between ticks, in seconds.
+            max_catch_up: The most ticks to run at once when `tick` is called
+                late; any more are skipped, so a slow frame doesn't turn into a
+                burst of work. Defaults to 5.
+        """
+        if tick_interval_s <= 0:
+            raise ValueError("tick_interval_s must be positive")
+
+        self.tick_interval_s: float = tick_interval_s
+        self.max_catch_up: int = max_catch_up
+
+        self._actions: dict[Hashable, _Action] = {}
+        self._last_tick: float | None = None
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._actions)
+
+    def is_scheduled(self, owner: Hashable) -> bool:
+        """Whether an owner has an action that isn't done yet."""
+        return owner in self._actions
+
+    def schedule(
+        self,
+        owner: Hashable,
+        steps: Steps,
+        on_done: Callable[[Any], None] | None = None,
+        on_error: Callable[[BaseException], None] | None = None,
+    ) -> bool:
+        """Adds an action, which takes its first step on the next tick.
+
+        Args:
+            owner: Who the action belongs to.
+            steps: The action.
+            on_done: Called with the action's result once it's done. Defaults to
+                None.
+            on_error: Called with the exception if the action raises one, or with
+                an `asyncio.CancelledError` if it's cancelled by `cancel_all`.
+                If None, exceptions are printed and `on_done` is called with None
+                instead. Defaults to None.
+
+        Returns:
+            True if the action was added, False if the owner already has one (in
+                which case `steps` is closed without running).
+        """
+        with self._lock:
+            if owner in self._actions:
+                steps.close()
+                return False
+
+            self._actions[owner] = (steps, on_done, on_error)
+            return True
+
+    def wait(self, steps: Steps) -> Any:
+        """Adds an action and waits for it to be done.
+
+        This can't be called from the thread that runs `tick`, since the action
+        would never get to run.
+
+        Returns:
+            The action's result.
+
+        Raises:
+            asyncio.CancelledError: If the action was cancelled by `cancel_all`.
+            Exception: Whatever the action raised.
+        """
+        if threading.current_thread() is self._thread:
+            raise RuntimeError("Can't wait for an action on the scheduler's thread")
+
+        done = threading.Event()
+        result: list[Any] = []
+        error: list[BaseException] = []
+
+        def finish(value: Any):
+            result.append(value)
+            done.set()
+
+        def fail(exception: BaseException):
+            error.append(exception)
+            done.set()
+
+        self.schedule(object(), steps, finish, fail)
+        done.wait()
+        if error:
+            raise error[0]
+        return result[0]
+
+    def run_async(self, steps: Steps) -> asyncio.Future:
+        """Adds an action, for a coroutine to await.
+
+        Returns:
+            A future for the action's result, on the running event loop. It's
+                cancelled if the action is cancelled by `cancel_all`, and gets the
+                exception if the action raises one.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        def settle(value: Any):
+            if not future.done():
+                future.set_result(value)
+
+        def fail(exception: BaseException):
+            if future.done():
+                return
+            if isinstance(exception, asyncio.CancelledError):
+                future.cancel()
+            else:
+                future.set_exception(exception)
+
+        # ticks may come from another thread
+        self.schedule(
+            object(),
+            steps,
+            lambda value: loop.call_soon_threadsafe(settle, value),
+            lambda exception: loop.call_soon_threadsafe(fail, exception),
+        )
+        return future
+
+    def cancel_all(self):
+        """Cancels every action that isn't done yet, e.g. when the game ends.
+
+        Each action's generator is closed, so it stops where it was, and anyone
+        waiting on one with `wait` or `run_async` is released with an
+        `asyncio.CancelledError`.
+        """
+        with self._lock:
+            actions = list(self._actions.values())
+            self._actions.clear()
+
+        for steps, _, on_error in actions:
+            if not steps.gi_running:  # an action can't close itself mid-step
+                steps.close()
+            if on_error is not None:
+                on_error(asyncio.CancelledError())
+
+    def tick(self, now: float):
+        """Steps every action once for each tick since the last call.
+
+        Args:
+            now: The current time, from `time.monotonic`.
+        """
+        self._thread = threading.current_thread()
+        if self._last_tick is None:
+            self._last_tick = now
+            ticks = 1
+        else:
+            ticks = int((now - self._last_tick) / self.tick_interval_s)
+            if ticks == 0:
+                return
+
+            self._last_tick += ticks * self.tick_interval_s
+            if ticks > self.max_catch_up:
+                self._last_tick = now
+                ticks = self.max_catch_up
+
+        with self._lock:
+            actions = list(self._actions.items())
+
+        for owner, action in actions:
+            steps, on_done, on_error = action
+            if self._actions.get(owner) is not action:
+                continue  # cancelled by an earlier action this tick
+
+            try:
+                for _ in range(ticks):
+                    next(steps)
+            except StopIteration as stop:
+                if self._remove(owner, action) and on_done is not None:
+                    on_done(stop.value)
+            except Exception as exception:
+                if not self._remove(owner, action):
+                    continue
+                if on_error is not None:
+                    on_error(exception)
+                else:
+                    # like an uncaught exception on a thread of its own: report it
+                    # and keep going with everyone else
+                    traceback.print_exc()
+                    if on_done is not None:
+                        on_done(None)
+
+    def _remove(self, owner: Hashable, action: _Action) -> bool:
+        """Removes an action that's done, unless it was cancelled already.
+
+        Returns:
+            Whether the action was still scheduled.
+        """
+        with self._lock:
+            if self._actions.get(owner) is not action:
+                return False
+
+            del self._actions[owner]
+            return True
@@ -0,0 +1,630 @@
+from __future__ import annotations
+
+import hashlib
+import heapq
+from array import array
+from typing import Iterable, Iterator, Sequence
+
+from connectivity import UnionFind
+from enums import Direction
+from vec2 import Vec2
+
+# one bit per direction, in the same order as iterating over Direction
+DIRECTION_BITS: dict[Direction, int] = {
+    direction: 1 << i for i, direction in enumerate(Direction)
+}
+
+
+class Grid:
+    """Integer-indexed storage for the coordinates and paths of an arena.
+
+    Every point on the arena's grid is given a flat index (left to right, then
+    bottom to top). Each cell stores a 4-bit mask of the directions it has paths
+    in, and another of the directions it has neighboring coordinates in, so
+    checking for a path or coordinate by index never allocates or hashes
+    anything. Each grid point also has a single shared `Vec2` in `positions`.
+
+    For straight-line moves, the grid also keeps the length of the unbroken run
+    of paths (`path_runs`) and of coordinates (`coord_runs`) leading out of every
+    cell in each direction, updated as paths and coordinates are added, and
+    which cells are connected to each other, as disjoint sets.
+
+    Positions outside of the grid, or that aren't on a grid point, have an
+    index of -1.
+    """
+
+    def __init__(self, arena_size: int, path_len: int):
+        """Creates an empty `Grid`.
+
+        Args:
+            arena_size: The number of paths along each side of the arena.
+            path_len: The length of a single path.
+        """
+        self.arena_size: int = arena_size
+        self.path_len: int = path_len
+        # number of grid points between the center and the border
+        self.half: int = (arena_size * path_len // 2) // path_len
+        self.width: int = 2 * self.half + 1
+        self.size: int = self.width * self.width
+
+        # index offset and direction bit for each direction, in Direction order
+        self.steps: tuple[tuple[int, int], ...] = tuple(
+            (DIRECTION_BITS[direction], delta)
+            for direction, delta in zip(Direction, (self.width, -self.width, 1, -1))
+        )
+        self._deltas: dict[int, int] = {delta: bit for bit, delta in self.steps}
+        self._direction_deltas: dict[Direction, int] = {
+            direction: delta for direction, (_, delta) in zip(Direction, self.steps)
+        }
+        self._opposites: dict[int, int] = {
+            DIRECTION_BITS[Direction.NORTH]: DIRECTION_BITS[Direction.SOUTH],
+            DIRECTION_BITS[Direction.SOUTH]: DIRECTION_BITS[Direction.NORTH],
+            DIRECTION_BITS[Direction.EAST]: DIRECTION_BITS[Direction.WEST],
+            DIRECTION_BITS[Direction.WEST]: DIRECTION_BITS[Direction.EAST],
+        }
+
+        # every grid point gets exactly one Vec2, shared by everything that
+        # looks it up (and the same one Vec2.grid snaps to)
+        self.positions: list[Vec2] = [
+            Vec2(
+                (i % self.width - self.half) * path_len,
+                (i // self.width - self.half) * path_len,
+            ).intern()
+            for i in range(self.size)
+        ]
+        self.indexes: dict[Vec2, int] = {pos: i for i, pos in enumerate(self.positions)}
+
+        # directions that stay on the grid from each cell
+        self.border_masks: bytearray = bytearray(self.size)
+        for i in range(self.size):
+            column, row = i % self.width, i // self.width
+            self.border_masks[i] = (
+                (DIRECTION_BITS[Direction.NORTH] if row < self.width - 1 else 0)
+                | (DIRECTION_BITS[Direction.SOUTH] if row > 0 else 0)
+                | (DIRECTION_BITS[Direction.EAST] if column < self.width - 1 else 0)
+                | (DIRECTION_BITS[Direction.WEST] if column > 0 else 0)
+            )
+
+        self.coords: bytearray = bytearray(self.size)
+        self.path_masks: bytearray = bytearray(self.size)
+        self.coord_masks: bytearray = bytearray(self.size)
+
+        # for each direction (in Direction order), the number of steps that can
+        # be taken from each cell along paths, and onto coordinates
+        self.path_runs: tuple[array[int], ...] = tuple(
+            array("H", bytes(2 * self.size)) for _ in Direction
+        )
+        self.coord_runs: tuple[array[int], ...] = tuple(
+            array("H", bytes(2 * self.size)) for _ in Direction
+        )
+        self._run_slots: dict[int, int] = {
+            bit: slot for slot, (bit, _) in enumerate(self.steps)
+        }
+
+        # connected cells, along paths and between neighboring coordinates;
+        # removing a path can split a set, so the path sets are rebuilt (when
+        # next needed) instead
+        self._path_components: UnionFind | None = UnionFind(self.size)
+        self._coord_components: UnionFind = UnionFind(self.size)
+
+    def index(self, pos: Vec2) -> int:
+        """Gets the flat index of a position.
+
+        Args:
+            pos: The position to look up.
+
+        Returns:
+            The index of `pos`, or -1 if it isn't a point on the grid.
+        """
+        # a dictionary lookup is cheaper than working the index out
+        return self.indexes.get(pos, -1)
+
+    def neighbor(self, index: int, direction: Direction) -> int:
+        """Gets the index of the cell next to `index` in `direction`.
+
+        Returns:
+            The neighbor's index, or -1 if it would be off the grid.
+        """
+        if index < 0 or not self.border_masks[index] & DIRECTION_BITS[direction]:
+            return -1
+
+        return index + self._direction_deltas[direction]
+
+    def delta(self, direction: Direction) -> int:
+        """Gets the index offset of one step in `direction`."""
+        return self._direction_deltas[direction]
+
+    def direction_bit(self, index: int, other: int) -> int:
+        """Gets the direction bit pointing from `index` to the adjacent `other`.
+
+        Returns:
+            The direction bit, or 0 if the cells aren't adjacent.
+        """
+        if index < 0 or other < 0:
+            return 0
+
+        return self._deltas.get(other - index, 0) & self.border_masks[index]
+
+    def coord_neighbors_mask(self, index: int) -> int:
+        """Gets the mask of directions from `index` that lead to a coordinate,
+        whether or not `index` is a coordinate itself.
+        """
+        border_mask = self.border_masks[index]
+        return sum(
+            bit
+            for bit, delta in self.steps
+            if border_mask & bit and self.coords[index + delta]
+        )
+
+    def add_coord(self, index: int):
+        """Adds a coordinate, linking it to any neighboring coordinates."""
+        if self.coords[index]:
+            return
+
+        self.coords[index] = 1
+        mask = self.coord_neighbors_mask(index)
+        self.coord_masks[index] = mask
+        for bit, delta in self.steps:
+            if mask & bit:
+                self.coord_masks[index + delta] |= self._opposites[bit]
+                self._coord_components.union(index, index + delta)
+
+        self._update_coord_runs(index)
+
+    def add_path(self, index: int, other: int) -> bool:
+        """Adds a path between two adjacent cells, adding their coordinates too.
+
+        Returns:
+            True if the path was created, False if it already existed.
+        """
+        bit = self.direction_bit(index, other)
+        if not bit:
+            raise ValueError("Paths must connect two adjacent grid points")
+
+        self.add_coord(index)
+        self.add_coord(other)
+        if self.path_masks[index] & bit:
+            return False
+
+        self.path_masks[index] |= bit
+        self.path_masks[other] |= self._opposites[bit]
+        self._update_path_runs(index, other, bit)
+        if self._path_components is not None:
+            self._path_components.union(index, other)
+        return True
+
+    def remove_path(self, index: int, other: int) -> bool:
+        """Removes the path between two adjacent cells; coordinates are kept.
+
+        Returns:
+            True if the path was removed, False if it didn't exist.
+        """
+        bit = self.direction_bit(index, other)
+        if not bit or not self.path_masks[index] & bit:
+            return False
+
+        self.path_masks[index] &= ~bit
+        self.path_masks[other] &= ~self._opposites[bit]
+        self._update_path_runs(index, other, bit)
+        self._path_components = None
+        return True
+
+    def connected(self, index: int, other: int, ignore_paths: bool = False) -> bool:
+        """Checks whether `other` can reach `index`, i.e. whether `other` would be
+        in `chart(index, ignore_paths)`, without searching.
+        """
+        if index == other:
+            return True
+        if index < 0 or other < 0:
+            return False
+
+        components = self._components(ignore_paths)
+        if ignore_paths and not self.coords[index]:
+            # like chart, a start that isn't a coordinate reaches its neighbors
+            other_root = components.find(other)
+            return any(
+                components.find(index + delta) == other_root
+                for bit, delta in self.steps
+                if self.coord_neighbors_mask(index) & bit
+            )
+
+        return components.find(index) == components.find(other)
+
+    def component(self, index: int, ignore_paths: bool = False) -> int:
+        """Gets an identifier for the set of cells connected to `index`.
+
+        Identifiers are only comparable until the next change to the grid.
+
+        Returns:
+            The identifier, which is the index of one of the connected cells.
+        """
+        return self._components(ignore_paths).find(index)
+
+    def _components(self, ignore_paths: bool) -> UnionFind:
+        if ignore_paths:
+            return self._coord_components
+
+        if self._path_components is None:
+            components = UnionFind(self.size)
+            north, east = (
+                DIRECTION_BITS[Direction.NORTH],
+                DIRECTION_BITS[Direction.EAST],
+            )
+            for cell, mask in enumerate(self.path_masks):
+                if mask & north:
+                    components.union(cell, cell + self.width)
+                if mask & east:
+                    components.union(cell, cell + 1)
+            self._path_components = components
+
+        return self._path_components
+
+    def run(self, index: int, direction: Direction, coord_bound: bool = False) -> int:
+        """Gets the number of steps that can be taken in a straight line from a cell.
+
+        Args:
+            index: The cell to start from.
+            direction: The direction to move in.
+            coord_bound: Whether to count steps onto any coordinate rather than
+                only steps along paths. Defaults to False.
+
+        Returns:
+            The number of steps, or 0 if `index` is -1.
+        """
+        if index < 0:
+            return 0
+
+        slot = self._run_slots[DIRECTION_BITS[direction]]
+        return (self.coord_runs if coord_bound else self.path_runs)[slot][index]
+
+    def _update_path_runs(self, index: int, other: int, bit: int):
+        """Updates the path runs through both ends of a path that was just added
+        or removed between `index` and its neighbor `other` in direction `bit`.
+        """
+        for start, end, start_bit in (
+            (index, other, bit),
+            (other, index, self._opposites[bit]),
+        ):
+            runs = self.path_runs[self._run_slots[start_bit]]
+            runs[start] = runs[end] + 1 if self.path_masks[start] & start_bit else 0
+
+            # so do the runs of every cell leading up to start along paths
+            delta = end - start
+            cell = start
+            while (
+                self.border_masks[cell] & self._opposites[start_bit]
+                and self.path_masks[cell - delta] & start_bit
+            ):
+                runs[cell - delta] = runs[cell] + 1
+                cell -= delta
+
+    def _update_coord_runs(self, index: int):
+        """Updates the coordinate runs of the cells leading up to a new coordinate."""
+        for slot, (bit, delta) in enumerate(self.steps):
+            runs = self.coord_runs[slot]
+            cell = index
+            while self.border_masks[cell] & self._opposites[bit] and self.coords[cell]:
+                runs[cell - delta] = runs[cell] + 1
+                cell -= delta
+
+    def _rebuild_runs(self):
+        """Works out every path and coordinate run from scratch."""
+        for slot, (bit, delta) in enumerate(self.steps):
+            path_runs = self.path_runs[slot]
+            coord_runs = self.coord_runs[slot]
+            # visit each cell after the one it steps onto
+            for cell in range(self.size - 1, -1, -1) if delta > 0 else range(self.size):
+                if not self.border_masks[cell] & bit:
+                    path_runs[cell] = coord_runs[cell] = 0
+                    continue
+
+                path_runs[cell] = (
+                    path_runs[cell + delta] + 1 if self.path_masks[cell] & bit else 0
+                )
+                coord_runs[cell] = (
+                    coord_runs[cell + delta] + 1 if self.coords[cell + delta] else 0
+                )
+
+    def has_path(self, index: int, other: int) -> bool:
+        bit = self.direction_bit(index, other)
+        return bool(bit and self.path_masks[index] & bit)
+
+    def has_path_between(self, pos: Vec2, destination: Vec2) -> bool:
+        """Like `has_path`, but takes positions instead of indexes."""
+        index = self.indexes.get(pos)
+        other = self.indexes.get(destination)
+        if index is None or other is None:
+            return False
+
+        return bool(
+            self._deltas.get(other - index, 0)
+            & self.border_masks[index]
+            & self.path_masks[index]
+        )
+
+    def has_coord(self, index: int) -> bool:
+        return index >= 0 and bool(self.coords[index])
+
+    def neighbors(self, index: int, ignore_paths: bool = False) -> Iterator[int]:
+        """Yields the indexes of every cell that can be moved to from `index`.
+
+        Args:
+            index: The cell to move from.
+            ignore_paths: Whether neighboring coordinates count as connected
+                even without a path. Defaults to False.
+        """
+        mask = (self.coord_masks if ignore_paths else self.path_masks)[index]
+        for bit, delta in self.steps:
+            if mask & bit:
+                yield index + delta
+
+    def chart(
+        self, index: int, ignore_paths: bool = False
+    ) -> tuple[array[int], array[int]]:
+        """Charts the distance from every reachable cell to `index` using a
+        breadth-first search.
+
+        Args:
+            index: The cell to chart distances to.
+            ignore_paths: Whether neighboring coordinates count as connected
+                even without a path. Defaults to False.
+
+        Returns:
+            The indexes of every reachable cell (starting with `index` itself)
+                in the order they were found, and their distances, respectively.
+        """
+        masks = self.coord_masks if ignore_paths else self.path_masks
+        steps = self.steps
+
+        visited = bytearray(self.size)
+        visited[index] = 1
+
+        # a start that isn't a coordinate has no neighbors stored yet
+        start_mask = masks[index]
+        if ignore_paths and not self.coords[index]:
+            start_mask = self.coord_neighbors_mask(index)
+
+        order: array[int] = array("i", (index,))
+        distances: array[int] = array("i", (0,))
+
+        frontier: list[int] = [
+            index + delta for bit, delta in steps if start_mask & bit
+        ]
+        for cell in frontier:
+            visited[cell] = 1
+
+        distance = 0
+        while frontier:
+            distance += 1
+            order.extend(frontier)
+            distances.extend(array("i", (distance,)) * len(frontier))
+
+            next_frontier: list[int] = []
+            for cell in frontier:
+                mask = masks[cell]
+                for bit, delta in steps:
+                    if mask & bit and not visited[cell + delta]:
+                        visited[cell + delta] = 1
+                        next_frontier.append(cell + delta)
+
+            frontier = next_frontier
+
+        return order, distances
+
+    def distance(self, index: int, other: int, ignore_paths: bool = False) -> int:
+        """Finds the distance from `other` to `index` with an A* search, without
+        charting the rest of the grid.
+
+        The search starts from `index`, so it gives the same distances as
+        `chart(index)`, and is guided toward `other` by the Manhattan distance
+        between them, which never overestimates on a grid.
+
+        Args:
+            index: The cell distances are measured to.
+            other: The cell distances are measured from.
+            ignore_paths: Whether neighboring coordinates count as connected
+                even without a path. Defaults to False.
+
+        Returns:
+            The number of moves between the cells, or -1 if `other` can't reach
+                `index`.
+        """
+        return self.distances(index, (other,), ignore_paths)[0]
+
+    def distances(
+        self, index: int, others: Sequence[int], ignore_paths: bool = False
+    ) -> list[int]:
+        """Like `distance`, but finds the distances from several cells with a
+        single search.
+
+        The search is guided toward whichever of the cells it hasn't reached yet
+        is closest (by Manhattan distance), and stops once it has reached them
+        all.
+
+        Args:
+            index: The cell distances are measured to.
+            others: The cells distances are measured from.
+            ignore_paths: Whether neighboring coordinates count as connected
+                even without a path. Defaults to False.
+
+        Returns:
+            The number of moves from each of `others` to `index`, or -1 for cells
+                that can't reach `index`.
+        """
+        results = [-1] * len(others)
+        # the places in others of each cell still to be reached
+        remaining: dict[int, list[int]] = {}
+        for place, other in enumerate(others):
+            if other == index:
+                results[place] = 0
+            # don't search the whole of index's side just to find nothing
+            elif other >= 0 and self.connected(index, other, ignore_paths):
+                remaining.setdefault(other, []).append(place)
+
+        if not remaining:
+            return results
+
+        masks = self.coord_masks if ignore_paths else self.path_masks
+        steps = self.steps
+        width = self.width
+        goals = [(other % width, other // width) for other in remaining]
+
+        def estimate(cell: int) -> int:
+            column, row = cell % width, cell // width
+            return min(
+                abs(column - goal_column) + abs(row - goal_row)
+                for goal_column, goal_row in goals
+            )
+
+        best = array("i", (-1,)) * self.size
+        best[index] = 0
+        # (estimated total, -distance so far, cell); ties go to the deepest cell
+        heap: list[tuple[int, int, int]] = [(estimate(index), 0, index)]
+        while heap:
+            _, distance, cell = heapq.heappop(heap)
+            distance = -distance
+            if distance > best[cell]:
+                continue
+            if cell in remaining:
+                for place in remaining.pop(cell):
+                    results[place] = distance
+                if not remaining:
+                    break
+
+                # estimates only grow as goals are reached, so the ones already
+                # queued still never overestimate
+                goals = [(other % width, other // width) for other in remaining]
+
+            mask = masks[cell]
+            if cell == index and ignore_paths and not self.coords[cell]:
+                mask = self.coord_neighbors_mask(cell)
+
+            for bit, delta in steps:
+                neighbor = cell + delta
+                if mask & bit and (best[neighbor] < 0 or distance + 1 < best[neighbor]):
+                    best[neighbor] = distance + 1
+                    heapq.heappush(
+                        heap,
+                        (distance + 1 + estimate(neighbor), -distance - 1, neighbor),
+                    )
+
+        return results
+
+    def fingerprint(self) -> str:
+        """Gets a stable hash of the grid's dimensions, coordinates and paths.
+
+        Two grids have the same fingerprint exactly when they have the same layout,
+        no matter what order their paths were added in, and it stays the same
+        between runs of the game.
+        """
+        digest = hashlib.sha256(f"{self.arena_size},{self.path_len};".encode())
+        digest.update(self.coords)
+        digest.update(self.path_masks)
+        return digest.hexdigest()
+
+    def __reduce__(self):
+        # only send what can't be worked out again, e.g. to worker processes
+        return (
+            _restore_grid,
+            (
+                self.arena_size,
+                self.path_len,
+                bytes(self.coords),
+                bytes(self.path_masks),
+                bytes(self.coord_masks),
+            ),
+        )
+
+    @classmethod
+    def from_arena(
+        cls,
+        arena_size: int,
+        path_len: int,
+        coords: Iterable[Vec2],
+        paths: Iterable[Iterable[Vec2]],
+    ) -> Grid:
+        """Builds a `Grid` holding existing coordinates and paths.
+
+        Coordinates and paths that don't fit on the grid are skipped.
+        """
+        grid = cls(arena_size, path_len)
+        for coord in coords:
+            if (index := grid.index(coord)) >= 0:
+                grid.add_coord(index)
+        for path in paths:
+            start, end = (grid.index(pos) for pos in path)
+            if grid.direction_bit(start, end):
+                grid.add_path(start, end)
+
+        return grid
+
+
+class PointDistances:
+    """Distances to a single target, found with `Grid.distances` searches when
+    they're first looked up (or several at once with `find`). Works like a
+    read-only `dict[Vec2, int]` for single queries that aren't worth charting the
+    whole grid for.
+    """
+
+    def __init__(self, grid: Grid, index: int, ignore_paths: bool = False):
+        """Creates `PointDistances` to the cell at `index`."""
+        self._grid: Grid = grid
+        self._index: int = index
+        self._ignore_paths: bool = ignore_paths
+        self._distances: dict[Vec2, int] = {}
+
+    def __getitem__(self, pos: Vec2) -> int:
+        distance = self.get(pos)
+        if distance is None:
+            raise KeyError(pos)
+
+        return distance
+
+    def __contains__(self, pos: object) -> bool:
+        return self.get(pos) is not None
+
+    def get(self, pos: Vec2, default: int | None = None) -> int | None:
+        distance = self._distances.get(pos)
+        if distance is None:
+            self.find((pos,))
+            distance = self._distances[pos]
+
+        return default if distance < 0 else distance
+
+    def find(self, positions: Iterable[Vec2]):
+        """Finds the distances from several positions at once, with one search for
+        all of those that haven't been looked up yet.
+        """
+        missing = [pos for pos in positions if pos not in self._distances]
+        if not missing:
+            return
+
+        grid = self._grid
+        for pos, distance in zip(
+            missing,
+            grid.distances(
+                self._index, [grid.index(pos) for pos in missing], self._ignore_paths
+            ),
+        ):
+            self._distances[pos] = distance
+
+
+def _restore_grid(
+    arena_size: int,
+    path_len: int,
+    coords: bytes,
+    path_masks: bytes,
+    coord_masks: bytes,
+) -> Grid:
+    """Rebuilds a pickled `Grid`."""
+    grid = Grid(arena_size, path_len)
+    grid.coords[:] = coords
+    grid.path_masks[:] = path_masks
+    grid.coord_masks[:] = coord_masks
+    grid._rebuild_runs()
+    grid._path_components = None
+    for cell, mask in enumerate(grid.coord_masks):
+        for bit, delta in grid.steps:
+            if mask & bit:
+                grid._coord_components.union(cell, cell + delta)
+    return grid
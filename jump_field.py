@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+from array import array
+from typing import TYPE_CHECKING
+
+from distance_matrix import UNREACHABLE
+
+if TYPE_CHECKING:
+    from grid import Grid
+
+
+def chart_jump_layers(
+    grid: Grid, path_distances: array[int], max_jumps: int
+) -> list[array[int]]:
+    """Charts the distances to a target when up to `max_jumps` of the moves may
+    be jumps: moves between neighboring coordinates that have no path.
+
+    Layer 0 is just the distances along paths. Each later layer starts from the
+    one before it, lets every coordinate jump to a neighbor in the layer before,
+    then spreads those distances along paths, bucketed by distance since the
+    starting distances all differ.
+
+    Args:
+        grid: The grid to chart.
+        path_distances: The distance from every cell to the target along paths,
+            with `UNREACHABLE` for cells that can't reach it, e.g. from
+            `distance_matrix.dense_row`.
+        max_jumps: The most jumps that may be used.
+
+    Returns:
+        One array of distances for each number of jumps allowed, from 0 to
+            `max_jumps`, with `UNREACHABLE` for cells that can't reach the
+            target.
+    """
+    steps = grid.steps
+    path_masks = grid.path_masks
+    coord_masks = grid.coord_masks
+
+    layers = [path_distances]
+    for _ in range(max_jumps):
+        previous = layers[-1]
+        distances = array("H", previous)
+
+        buckets: list[list[int]] = [[] for _ in range(grid.size + 1)]
+        for cell in range(grid.size):
+            jump_mask = coord_masks[cell] & ~path_masks[cell]
+            for bit, delta in steps:
+                if jump_mask & bit and previous[cell + delta] + 1 < distances[cell]:
+                    distances[cell] = previous[cell + delta] + 1
+
+            if distances[cell] != UNREACHABLE:
+                buckets[distances[cell]].append(cell)
+
+        # shortest first, like Dijkstra's algorithm with every move costing 1
+        for distance, bucket in enumerate(buckets):
+            for cell in bucket:
+                if distances[cell] != distance:
+                    continue  # found a shorter way since
+
+                mask = path_masks[cell]
+                for bit, delta in steps:
+                    if mask & bit and distance + 1 < distances[cell + delta]:
+                        distances[cell + delta] = distance + 1
+                        buckets[distance + 1].append(cell + delta)
+
+        layers.append(distances)
+
+    return layers
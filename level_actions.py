@@ -31,8 +31,8 @@ def add_enemy(
 
     Args:
         behavior: The added enemy's behavior.
-        target_player: whether to set the provided behavior's target to the player
-            when adding the enemy.
+        target_player: whether to have the provided behavior chase the nearest
+            player (by clearing its target) when adding the enemy.
         shape: The shape of the enemy. Defaults to "square".
         size: The size of the enemy. Defaults to 5.
         color: The color of the enemy. Defaults to "red".
@@ -53,7 +53,7 @@ def add_enemy(
             pos = random.choice(list(game.arena.coords))
 
         if isinstance(behavior, ChaseBehavior) and target_player:
-            behavior.target = game.players[0]
+            behavior.target = None
 
         game.add_pawn(
             pawns.Enemy(
@@ -74,6 +74,25 @@ def add_enemy(
     return action
 
 
+def destroy_paths(count: int = 1, erase_color: str = "white") -> LevelAction:
+    """Returns a `LevelAction` that removes random paths from the arena.
+
+    Args:
+        count: The number of paths to remove. If there are fewer paths in the
+            arena, all of them are removed. Defaults to 1.
+        erase_color: The color to draw over removed paths with; should match the
+            screen's background color. Defaults to "white".
+    """
+
+    def action(game: game.Game):
+        paths = random.sample(list(game.arena.paths), min(count, len(game.arena.paths)))
+        game.arena.remove_paths(paths)
+        for path in paths:
+            game.arena.draw_path(path, erase_color)
+
+    return action
+
+
 def _sentinel(*args, **kwargs):
     return
 
@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Iterable, Iterator, Mapping
+
+from distance_matrix import UNREACHABLE, dense_row
+from enums import Direction
+from vec2 import Vec2
+
+if TYPE_CHECKING:
+    from grid import Grid
+
+# the first direction (in Direction order) in each 4-bit mask; DIRECTION_BITS
+# follows the same order, so it's always the lowest bit
+FIRST_DIRECTION: tuple[Direction | None, ...] = (None,) + tuple(
+    list(Direction)[(mask & -mask).bit_length() - 1] for mask in range(1, 16)
+)
+
+
+class NextHopTable:
+    """The best moves from every cell toward charted targets.
+
+    For each target, a row holds one 4-bit direction mask per grid cell: the
+    moves that bring that cell one step closer to the target (every tied move
+    is kept). At the target itself, every possible move is best, just like in
+    `Arena.get_movement_options`. Cells that can't reach the target get 0.
+
+    Rows are worked out from charted distances, and depend on the grid's
+    current paths; when paths change, repair each row along with its distances.
+    """
+
+    def __init__(self, grid: Grid, ignore_paths: bool = False):
+        """Creates an empty `NextHopTable`.
+
+        Args:
+            grid: The grid whose cells index the table.
+            ignore_paths: Whether neighboring coordinates count as connected even
+                without a path. Defaults to False.
+        """
+        self.grid: Grid = grid
+        self.ignore_paths: bool = ignore_paths
+        self._rows: dict[int, bytearray] = {}
+
+    def __contains__(self, target: object) -> bool:
+        return target in self._rows
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(list(self._rows))
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def clear(self):
+        self._rows.clear()
+
+    def get(self, start: int, target: int) -> int | None:
+        """Gets the mask of best moves from `start` toward `target`.
+
+        Returns:
+            The direction mask, or None if no row has been built for `target`.
+        """
+        row = self._rows.get(target)
+        return None if row is None else row[start]
+
+    def discard(self, target: int):
+        """Drops the row for a target, if there is one."""
+        self._rows.pop(target, None)
+
+    def build(self, target: int, distances: Mapping[Vec2, int]) -> bytearray:
+        """Works out and stores the row for a target from its charted distances.
+
+        Args:
+            target: The index of the target cell.
+            distances: The charted distance map (pos: distance) for the target.
+
+        Returns:
+            The new row.
+        """
+        grid = self.grid
+        masks = grid.coord_masks if self.ignore_paths else grid.path_masks
+        steps = grid.steps
+
+        cell_distances = dense_row(grid, distances)
+
+        row = bytearray(grid.size)
+        for cell, distance in enumerate(cell_distances):
+            if distance == UNREACHABLE or distance == 0:
+                continue
+
+            mask = masks[cell]
+            row[cell] = sum(
+                bit
+                for bit, delta in steps
+                if mask & bit and cell_distances[cell + delta] == distance - 1
+            )
+
+        row[target] = self._target_mask(target)
+        self._rows[target] = row
+        return row
+
+    def repair(self, target: int, distances: Mapping[Vec2, int], cells: Iterable[int]):
+        """Updates the row for a target after its distances were repaired in place,
+        if there is a row.
+
+        A cell's best moves only depend on its own connections and distance and
+        those of its neighbors, so only the given cells and their neighbors are
+        worked out again.
+
+        Args:
+            target: The index of the target cell.
+            distances: The repaired distance map (pos: distance) for the target.
+            cells: Every cell whose distance or connections changed.
+        """
+        row = self._rows.get(target)
+        if row is None:
+            return
+
+        grid = self.grid
+        masks = grid.coord_masks if self.ignore_paths else grid.path_masks
+        steps = grid.steps
+        positions = grid.positions
+
+        touched = set(cells)
+        for cell in list(touched):
+            mask = masks[cell]
+            touched.update(cell + delta for bit, delta in steps if mask & bit)
+
+        for cell in touched:
+            if cell == target:
+                row[cell] = self._target_mask(target)
+                continue
+
+            distance = distances.get(positions[cell])
+            mask = masks[cell]
+            row[cell] = (
+                0
+                if distance is None
+                else sum(
+                    bit
+                    for bit, delta in steps
+                    if mask & bit
+                    and distances.get(positions[cell + delta]) == distance - 1
+                )
+            )
+
+    def _target_mask(self, target: int) -> int:
+        """Gets the mask of every move from the target itself."""
+        grid = self.grid
+        # a target that isn't a coordinate has no neighbors stored when ignoring paths
+        if self.ignore_paths and not grid.coords[target]:
+            return grid.coord_neighbors_mask(target)
+
+        return (grid.coord_masks if self.ignore_paths else grid.path_masks)[target]
+
+    @property
+    def nbytes(self) -> int:
+        """Memory used by the rows."""
+        return len(self._rows) * self.grid.size
@@ -0,0 +1,101 @@
+"""Optional NumPy implementation of distance charting.
+
+Charts many targets at once by expanding all of their breadth-first search
+frontiers together as arrays. Everything here requires NumPy; check `HAS_NUMPY`
+before using it.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Iterator, Sequence
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional
+    np = None
+
+if TYPE_CHECKING:
+    from grid import Grid
+
+HAS_NUMPY: bool = np is not None
+
+UNREACHABLE: int = -1
+"""Distance given to cells that can't reach the target."""
+
+
+def chart_distance_rows(
+    grid: Grid,
+    targets: Sequence[int],
+    ignore_paths: bool = False,
+    batch_size: int = 256,
+) -> Iterator[tuple[int, np.ndarray]]:
+    """Charts the distance from every cell to each target.
+
+    Targets are charted `batch_size` at a time. The frontiers of a whole batch
+    are kept together as one array of (target, cell) slots, and each step of the
+    search moves every one of them along the grid's adjacency masks at once, so
+    the work per step only grows with the size of the frontiers.
+
+    Args:
+        grid: The grid to chart.
+        targets: The indexes of the cells to chart distances to.
+        ignore_paths: Whether neighboring coordinates count as connected even
+            without a path. Defaults to False.
+        batch_size: The number of targets to chart at once; bigger batches need
+            fewer steps but use more memory. Defaults to 256.
+
+    Yields:
+        Pairs of a target index and a flat array of every cell's distance to
+            it, with `UNREACHABLE` for cells that can't reach it.
+    """
+    if not HAS_NUMPY:
+        raise ImportError("NumPy is required to use numpy_backend")
+
+    size = grid.size
+    masks = np.frombuffer(
+        grid.coord_masks if ignore_paths else grid.path_masks, dtype=np.uint8
+    )
+
+    for batch_start in range(0, len(targets), batch_size):
+        batch = np.asarray(targets[batch_start : batch_start + batch_size])
+        count = len(batch)
+
+        # slot (target * size + cell) holds the distance from cell to target
+        distances = np.full(count * size, UNREACHABLE, dtype=np.int32)
+        last_writer = np.empty(count * size, dtype=np.int64)
+        frontier = np.arange(count, dtype=np.int64) * size + batch
+        distances[frontier] = 0
+
+        distance = 0
+        while frontier.size:
+            distance += 1
+            frontier_masks = masks[frontier % size]
+            reached = np.concatenate(
+                [
+                    frontier[frontier_masks & bit != 0] + delta
+                    for bit, delta in grid.steps
+                ]
+            )
+            reached = reached[distances[reached] == UNREACHABLE]
+
+            # a cell can be reached from more than one side; drop the duplicates
+            # without sorting by only keeping the last write to each slot
+            order = np.arange(reached.size)
+            last_writer[reached] = order
+            reached = reached[last_writer[reached] == order]
+
+            distances[reached] = distance
+            frontier = reached
+
+        yield from zip(batch.tolist(), distances.reshape(count, size))
+
+
+def position_array(grid: Grid) -> np.ndarray:
+    """Gets the grid's shared positions as a NumPy object array, so that the
+    positions of many cells can be picked out at once.
+    """
+    positions = np.empty(grid.size, dtype=object)
+    for index, pos in enumerate(grid.positions):
+        positions[index] = pos
+
+    return positions
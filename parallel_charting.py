@@ -0,0 +1,145 @@
+"""Distance charting spread across worker processes.
+
+Workers are started once per `ChartingPool` and kept between calls. Each
+layout's grid is pickled once, into a file in the pool's temporary directory,
+and each worker reads it from there only when the layout changed since its
+last batch. Tasks only carry the layout's fingerprint, the file's path and a
+batch of target indexes, and send back the compact results of `Grid.chart`
+for each target.
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+import os
+import pickle
+import tempfile
+import threading
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator, Sequence
+
+from grid import Grid
+
+# the grid each worker process charts on, and the fingerprint of its layout
+_worker_grid: Grid | None = None
+_worker_fingerprint: str | None = None
+
+
+def _chart_targets(
+    fingerprint: str, grid_path: str, targets: Sequence[int], ignore_paths: bool
+) -> list[tuple[int, array[int], array[int]]]:
+    global _worker_grid, _worker_fingerprint
+    if fingerprint != _worker_fingerprint:
+        with open(grid_path, "rb") as file:
+            _worker_grid = pickle.load(file)
+        _worker_fingerprint = fingerprint
+
+    return [(target, *_worker_grid.chart(target, ignore_paths)) for target in targets]
+
+
+class ChartingPool:
+    """A pool of worker processes for charting distances, started the first time
+    it's used and kept until `shutdown`.
+
+    Workers are spawned rather than forked, so they don't inherit the game's Tk
+    state or threads.
+    """
+
+    def __init__(self):
+        self._executor: ProcessPoolExecutor | None = None
+        self._workers: int = 0
+        self._lock: threading.Lock = threading.Lock()
+        # the pickled grid of every layout charted so far, by fingerprint
+        self._grid_dir: tempfile.TemporaryDirectory | None = None
+        self._grid_paths: dict[str, str] = {}
+
+    def _grid_path(self, grid: Grid, fingerprint: str) -> str:
+        """Pickles a grid into the pool's directory, unless it already was."""
+        with self._lock:
+            path = self._grid_paths.get(fingerprint)
+            if path is None:
+                if self._grid_dir is None:
+                    self._grid_dir = tempfile.TemporaryDirectory(prefix="charting-")
+                path = os.path.join(self._grid_dir.name, f"{fingerprint}.pickle")
+                with open(path, "wb") as file:
+                    pickle.dump(grid, file)
+                self._grid_paths[fingerprint] = path
+
+            return path
+
+    def _get_executor(self, workers: int) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is not None and self._workers != workers:
+                self._executor.shutdown()
+                self._executor = None
+
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+                self._workers = workers
+
+            return self._executor
+
+    def chart_distance_rows(
+        self,
+        grid: Grid,
+        targets: Sequence[int],
+        ignore_paths: bool = False,
+        workers: int | None = None,
+        shards_per_worker: int = 4,
+    ) -> Iterator[tuple[int, array[int], array[int]]]:
+        """Charts the distances to each target using the pool's workers.
+
+        Args:
+            grid: The grid to chart.
+            targets: The indexes of the cells to chart distances to.
+            ignore_paths: Whether neighboring coordinates count as connected even
+                without a path. Defaults to False.
+            workers: The number of worker processes. If `None`, one is used for
+                every CPU. If the pool was started with a different number, it's
+                started again. Defaults to None.
+            shards_per_worker: How many batches of targets to split the work into
+                per worker; more batches even out the load between workers.
+                Defaults to 4.
+
+        Yields:
+            The results of `Grid.chart` for each target, as (target, indexes,
+                distances).
+        """
+        if not targets:
+            return
+
+        workers = workers or os.cpu_count() or 1
+        executor = self._get_executor(workers)
+        shard_size = -(-len(targets) // (workers * shards_per_worker))  # round up
+        shards = [
+            targets[start : start + shard_size]
+            for start in range(0, len(targets), shard_size)
+        ]
+
+        fingerprint = grid.fingerprint()
+        grid_path = self._grid_path(grid, fingerprint)
+        for results in executor.map(
+            _chart_targets,
+            [fingerprint] * len(shards),
+            [grid_path] * len(shards),
+            shards,
+            [ignore_paths] * len(shards),
+        ):
+            yield from results
+
+    def shutdown(self):
+        """Stops the workers, if they were started, and deletes the pickled grids.
+        The pool starts new workers if it's used again.
+        """
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
+            if self._grid_dir is not None:
+                self._grid_dir.cleanup()
+                self._grid_dir = None
+                self._grid_paths.clear()
@@ -28,7 +28,7 @@ if __name__ == "__main__":
     # config the game here!
     config = Config()
 
-    arena = Arena(arena_size=20)
+    arena = Arena(arena_size=20, next_hops=True)
     game = Game(arena, config=config)
 
     game.mainloop()
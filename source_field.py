@@ -0,0 +1,290 @@
+from __future__ import annotations
+
+import heapq
+from array import array
+from typing import TYPE_CHECKING
+
+from distance_matrix import UNREACHABLE
+from enums import Direction
+from vec2 import Vec2
+
+if TYPE_CHECKING:
+    from grid import Grid
+
+NO_SOURCE: int = -1
+"""Stored as the nearest source of cells that can't reach any source."""
+
+
+class SourceField:
+    """The distance from every cell to the nearest of several sources, and which
+    source that is, charted with a single breadth-first search started from all
+    of the sources at once.
+
+    Sources are identified by integers (e.g. their place in a list of players).
+    When two sources are equally near, the one that comes first in `sources` is
+    used, so a field that was updated is always the same as one charted from
+    scratch.
+    """
+
+    def __init__(self, grid: Grid, ignore_paths: bool = False):
+        """Creates a `SourceField` with no sources.
+
+        Args:
+            grid: The grid to chart on.
+            ignore_paths: Whether neighboring coordinates count as connected even
+                without a path. Defaults to False.
+        """
+        self.grid: Grid = grid
+        self.ignore_paths: bool = ignore_paths
+        self.distances: array[int] = array("H", (UNREACHABLE,)) * grid.size
+        self.nearest: array[int] = array("i", (NO_SOURCE,)) * grid.size
+        # the cell of each source, in order
+        self.sources: tuple[int, ...] = ()
+        # the cells each source is nearest, so a source that moves only gives
+        # up its own
+        self._regions: list[set[int]] = []
+
+    def chart(self, sources: tuple[int, ...]):
+        """Charts the field for a new set of sources.
+
+        Args:
+            sources: The cell of each source, with the source's place in the
+                tuple as its identifier. Cells off the grid (-1) are skipped.
+        """
+        masks = self.grid.coord_masks if self.ignore_paths else self.grid.path_masks
+        steps = self.grid.steps
+        distances = self.distances
+        nearest = self.nearest
+
+        distances[:] = array("H", (UNREACHABLE,)) * self.grid.size
+        nearest[:] = array("i", (NO_SOURCE,)) * self.grid.size
+        self.sources = sources
+        self._regions = [set() for _ in sources]
+
+        frontier: list[int] = []
+        for source, cell in enumerate(sources):
+            if cell >= 0 and nearest[cell] == NO_SOURCE:
+                distances[cell] = 0
+                nearest[cell] = source
+                self._regions[source].add(cell)
+                frontier.append(cell)
+
+        distance = 0
+        while frontier:
+            distance += 1
+            next_frontier: list[int] = []
+            for cell in frontier:
+                mask = masks[cell]
+                for bit, delta in steps:
+                    if mask & bit and nearest[cell + delta] == NO_SOURCE:
+                        distances[cell + delta] = distance
+                        nearest[cell + delta] = nearest[cell]
+                        self._regions[nearest[cell]].add(cell + delta)
+                        next_frontier.append(cell + delta)
+
+            frontier = next_frontier
+
+    def update(self, sources: tuple[int, ...]):
+        """Updates the field for sources that have moved, only searching again
+        around the sources that changed cells.
+
+        When sources were removed, the field is charted from scratch, since every
+        later source's identifier changes; sources that were added are moved
+        onto the grid like any other.
+
+        Args:
+            sources: The cell of each source, like in `chart`.
+        """
+        if len(sources) < len(self.sources):
+            self.chart(sources)
+            return
+
+        added = len(sources) - len(self.sources)
+        self.sources += (-1,) * added
+        self._regions.extend(set() for _ in range(added))
+        for source, cell in enumerate(sources):
+            self.move(source, cell)
+
+    def move(self, source: int, cell: int):
+        """Moves one source to another cell, only searching again around it.
+
+        A source that left a cell gives up the cells it was nearest, which are
+        filled in again from the cells around them; a source that arrived
+        spreads out until it reaches cells that are at least as near another
+        source.
+
+        Args:
+            source: The source that moved.
+            cell: Its new cell, or -1 if it left the grid.
+        """
+        if self.sources[source] == cell:
+            return
+
+        left = self.sources[source]
+        self.sources = self.sources[:source] + (cell,) + self.sources[source + 1 :]
+        if left >= 0:
+            self._remove(source)
+        if cell >= 0:
+            self._add(source, cell)
+
+    def _remove(self, source: int):
+        """Fills in the cells a source that moved away was nearest from their
+        neighbors.
+        """
+        masks = self.grid.coord_masks if self.ignore_paths else self.grid.path_masks
+        steps = self.grid.steps
+        distances = self.distances
+        nearest = self.nearest
+        regions = self._regions
+
+        region = regions[source]
+        regions[source] = set()
+        for cell in region:
+            distances[cell] = UNREACHABLE
+            nearest[cell] = NO_SOURCE
+
+        # (distance, source, cell), so that ties go to the earlier source
+        heap: list[tuple[int, int, int]] = [
+            (0, other, cell)
+            for other, cell in enumerate(self.sources)
+            if other != source and cell >= 0 and nearest[cell] == NO_SOURCE
+        ]
+        for cell in region:
+            mask = masks[cell]
+            for bit, delta in steps:
+                # paths go both ways, so a neighbor's mask has the bit back too
+                if mask & bit and nearest[cell + delta] != NO_SOURCE:
+                    heap.append(
+                        (distances[cell + delta] + 1, nearest[cell + delta], cell)
+                    )
+        heapq.heapify(heap)
+
+        while heap:
+            distance, owner, cell = heapq.heappop(heap)
+            if nearest[cell] != NO_SOURCE:
+                continue  # already filled in by a nearer or earlier source
+
+            distances[cell] = distance
+            nearest[cell] = owner
+            regions[owner].add(cell)
+            mask = masks[cell]
+            for bit, delta in steps:
+                if mask & bit and nearest[cell + delta] == NO_SOURCE:
+                    heapq.heappush(heap, (distance + 1, owner, cell + delta))
+
+    def _add(self, source: int, cell: int):
+        """Spreads a source out over the cells it's now nearest."""
+        masks = self.grid.coord_masks if self.ignore_paths else self.grid.path_masks
+        steps = self.grid.steps
+
+        if not self._claims(cell, 0, source):
+            return
+
+        self._take(cell, 0, source)
+        frontier = [cell]
+        distance = 0
+        while frontier:
+            distance += 1
+            next_frontier: list[int] = []
+            for cell in frontier:
+                mask = masks[cell]
+                for bit, delta in steps:
+                    if mask & bit and self._claims(cell + delta, distance, source):
+                        self._take(cell + delta, distance, source)
+                        next_frontier.append(cell + delta)
+
+            frontier = next_frontier
+
+    def _claims(self, cell: int, distance: int, source: int) -> bool:
+        """Whether a source at `distance` is nearer a cell than its current one."""
+        return distance < self.distances[cell] or (
+            distance == self.distances[cell] and source < self.nearest[cell]
+        )
+
+    def _take(self, cell: int, distance: int, source: int):
+        """Gives a cell to a source, taking it out of its old source's region."""
+        if self.nearest[cell] != NO_SOURCE:
+            self._regions[self.nearest[cell]].discard(cell)
+        self.distances[cell] = distance
+        self.nearest[cell] = source
+        self._regions[source].add(cell)
+
+    def copy(self) -> SourceField:
+        """Makes a copy of the field that can be updated separately."""
+        field = SourceField.__new__(SourceField)
+        field.grid = self.grid
+        field.ignore_paths = self.ignore_paths
+        field.distances = array("H", self.distances)
+        field.nearest = array("i", self.nearest)
+        field.sources = self.sources
+        field._regions = [set(region) for region in self._regions]
+        return field
+
+    def _index(self, pos: Vec2) -> int:
+        return self.grid.index(pos.grid(self.grid.path_len))
+
+    def distance(self, pos: Vec2) -> int | None:
+        """Gets the distance from a position to the nearest source, or None if it
+        can't reach any.
+        """
+        index = self._index(pos)
+        if index < 0 or self.distances[index] == UNREACHABLE:
+            return None
+
+        return self.distances[index]
+
+    def source(self, pos: Vec2) -> int | None:
+        """Gets the identifier of the source nearest a position, or None if it
+        can't reach any.
+        """
+        index = self._index(pos)
+        if index < 0 or self.nearest[index] == NO_SOURCE:
+            return None
+
+        return self.nearest[index]
+
+    def best_direction(self, pos: Vec2) -> Direction | None:
+        """Gets the move from a position that leads closest to the nearest source,
+        choosing the first in Direction order when moves are tied.
+
+        Returns:
+            The direction, or None if the position has no moves or can't reach any
+                source.
+        """
+        index = self._index(pos)
+        if index < 0 or self.distances[index] == UNREACHABLE:
+            return None
+
+        mask = (self.grid.coord_masks if self.ignore_paths else self.grid.path_masks)[
+            index
+        ]
+        best: Direction | None = None
+        best_distance = UNREACHABLE
+        for direction, (bit, delta) in zip(Direction, self.grid.steps):
+            if mask & bit and self.distances[index + delta] < best_distance:
+                best, best_distance = direction, self.distances[index + delta]
+
+        return best
+
+    def farthest_direction(self, pos: Vec2) -> Direction | None:
+        """Gets the move from a position that leads farthest from every source,
+        choosing the first in Direction order when moves are tied. Moves to
+        cells no source can reach are the farthest of all.
+
+        Returns:
+            The direction, or None if the position has no moves.
+        """
+        index = self._index(pos)
+        if index < 0:
+            return None
+
+        mask = (self.grid.coord_masks if self.ignore_paths else self.grid.path_masks)[
+            index
+        ]
+        best: Direction | None = None
+        best_distance = -1
+        for direction, (bit, delta) in zip(Direction, self.grid.steps):
+            if mask & bit and self.distances[index + delta] > best_distance:
+                best, best_distance = direction, self.distances[index + delta]
+
+        return best
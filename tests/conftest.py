@@ -0,0 +1,74 @@
+"""Shared test setup.
+
+Arenas draw with turtle, which needs a display, so turtle is replaced with a
+stand-in that draws nothing.
+"""
+
+from __future__ import annotations
+
+import os
+import random
+import sys
+import turtle
+from typing import Callable
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class _Headless:
+    """Accepts every turtle call and does nothing."""
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def __getattr__(self, name: str) -> Callable[..., None]:
+        return lambda *args, **kwargs: None
+
+
+turtle.Turtle = _Headless
+turtle.Screen = _Headless
+
+from enums import Direction  # noqa: E402
+from game_objects.arena import Arena  # noqa: E402
+from vec2 import Vec2  # noqa: E402
+
+
+@pytest.fixture
+def random_arena() -> Callable[..., Arena]:
+    """Makes arenas whose paths are a random walk from the center."""
+
+    def make(
+        arena_size: int = 12, num_paths: int = 120, seed: int = 0, **kwargs
+    ) -> Arena:
+        rng = random.Random(seed)
+        arena = Arena(arena_size, **kwargs)
+        bound = arena.border_len // 2
+        pos = Vec2(0, 0)
+        added = 0
+        for _ in range(num_paths * 50):
+            if added == num_paths:
+                break
+
+            dest = arena.get_destination(pos, rng.choice(list(Direction)))
+            if abs(dest[0]) > bound or abs(dest[1]) > bound:
+                continue
+
+            added += arena.add_path(pos, dest)
+            pos = dest
+        return arena
+
+    return make
+
+
+@pytest.fixture
+def full_chart() -> Callable[..., dict[Vec2, int]]:
+    """Charts the distances to a target from scratch with Grid.chart."""
+
+    def chart(arena: Arena, target: Vec2, ignore_paths: bool = False):
+        grid = arena._grid
+        order, distances = grid.chart(grid.index(target), ignore_paths)
+        return dict(zip(map(grid.positions.__getitem__, order), distances))
+
+    return chart
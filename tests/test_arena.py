@@ -0,0 +1,132 @@
+import random
+from functools import partial
+
+import pytest
+
+import numpy_backend
+from enums import Direction
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_added_paths_match_full_chart(random_arena, full_chart, seed):
+    arena = random_arena(num_paths=30, seed=seed)
+    arena.chart_all_distances(use_numpy=False)
+    targets = list(arena.coords)
+
+    # extend the walk, repairing everything charted so far
+    grown = random_arena(num_paths=120, seed=seed)
+    for path in grown.paths - arena.paths:
+        arena.add_path(*path)
+
+    for target in targets:
+        for ignore_paths in (False, True):
+            distances = arena._get_distances(target, ignore_paths)
+            assert dict(distances) == full_chart(arena, target, ignore_paths)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_removed_paths_match_full_chart(random_arena, full_chart, seed):
+    arena = random_arena(num_paths=120, seed=seed)
+    arena.chart_all_distances(use_numpy=False)
+    rng = random.Random(seed)
+
+    for path in rng.sample(sorted(arena.paths, key=sorted), 40):
+        assert arena.remove_path(*path)
+        for target in arena.coords:
+            distances = arena._get_distances(target)
+            assert dict(distances) == full_chart(arena, target)
+
+
+def test_removed_paths_match_full_chart_compact(random_arena, full_chart):
+    arena = random_arena(num_paths=120, compact=True)
+    arena.chart_all_distances(use_numpy=False)
+    rng = random.Random(0)
+
+    for path in rng.sample(sorted(arena.paths, key=sorted), 40):
+        arena.remove_path(*path)
+    for target in arena.coords:
+        assert dict(arena._get_distances(target)) == full_chart(arena, target)
+
+
+@pytest.mark.parametrize("compact", (False, True))
+def test_parallel_charting_matches_full_chart(random_arena, full_chart, compact):
+    arena = random_arena(num_paths=60, compact=compact)
+    try:
+        arena.chart_all_distances(workers=2)
+        # a new layout is pickled once more, for the same workers
+        grown = random_arena(num_paths=120)
+        for path in grown.paths - arena.paths:
+            arena.add_path(*path)
+        arena.chart_all_distances(workers=2)
+
+        assert len(arena._charting_pool._grid_paths) == 2
+        for target in arena.coords:
+            for ignore_paths in (False, True):
+                distances = arena._get_distances(target, ignore_paths)
+                assert dict(distances) == full_chart(arena, target, ignore_paths)
+    finally:
+        arena.close()
+    assert not arena._charting_pool._grid_paths
+
+
+@pytest.mark.parametrize("compact", (False, True))
+def test_numpy_charting_matches_full_chart(
+    random_arena, full_chart, monkeypatch, compact
+):
+    pytest.importorskip("numpy")
+    # small batches, so targets are split between several
+    monkeypatch.setattr(
+        numpy_backend,
+        "chart_distance_rows",
+        partial(numpy_backend.chart_distance_rows, batch_size=7),
+    )
+    arena = random_arena(num_paths=120, compact=compact)
+    arena.chart_all_distances(use_numpy=True)
+
+    for target in arena.coords:
+        for ignore_paths in (False, True):
+            distances = arena._get_distances(target, ignore_paths)
+            assert dict(distances) == full_chart(arena, target, ignore_paths)
+
+
+def walk(arena, pos, direction, max_steps, path_bound, coord_bound):
+    """Steps one coordinate at a time, like get_destination_greedy used to."""
+    steps = 0
+    while max_steps < 0 or steps < max_steps:
+        dest = arena.get_destination(pos, direction)
+        if not (
+            (coord_bound and dest in arena.coords)
+            or (path_bound and frozenset((pos, dest)) in arena.paths)
+        ):
+            break
+        pos, steps = dest, steps + 1
+    return pos, steps
+
+
+def assert_greedy_matches_walk(arena):
+    for pos in list(arena.coords):
+        for direction in Direction:
+            for path_bound, coord_bound in ((True, False), (False, True), (True, True)):
+                for max_steps in (-1, 0, 2):
+                    assert arena.get_destination_greedy(
+                        pos,
+                        direction,
+                        max_steps=max_steps,
+                        path_bound=path_bound,
+                        coord_bound=coord_bound,
+                    ) == walk(arena, pos, direction, max_steps, path_bound, coord_bound)
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_greedy_destinations_match_a_walk(random_arena, seed):
+    arena = random_arena(num_paths=60, seed=seed)
+    assert_greedy_matches_walk(arena)
+
+    # runs are kept up to date as paths are added and destroyed
+    for path in random_arena(num_paths=120, seed=seed).paths - arena.paths:
+        arena.add_path(*path)
+    assert_greedy_matches_walk(arena)
+
+    rng = random.Random(seed)
+    arena.remove_paths(rng.sample(sorted(arena.paths, key=sorted), 40))
+    assert_greedy_matches_walk(arena)
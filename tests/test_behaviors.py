@@ -0,0 +1,30 @@
+import turtle
+
+import behaviors
+from enums import Direction, GameState
+from game_objects.arena import Arena
+from game_objects.game import Game
+from game_objects.pawns import Enemy, Player
+from vec2 import Vec2
+
+
+def test_jumper_chases_a_player_it_can_only_reach_by_jumping():
+    arena = Arena(8)
+    # two islands of paths, one gap apart
+    arena.add_path(Vec2(0, 0), Vec2(25, 0))
+    arena.add_path(Vec2(50, 0), Vec2(75, 0))
+    game = Game(arena, turtle.Screen())
+    player = Player(game)
+    game.add_pawn(player)
+
+    behavior = behaviors.JumperBehavior()
+    jumper = Enemy(game, behavior, pos=Vec2(75, 0))
+    game.add_pawn(jumper)
+    game.set_state(GameState.EVADE)
+    moves = []
+    jumper.threaded_move = lambda direction, **kwargs: moves.append(direction)
+
+    assert game.nearest_player(jumper.pos) is None
+    assert game.nearest_player(jumper.pos, ignore_paths=True) is player
+    behavior.enact()
+    assert moves == [Direction.WEST]
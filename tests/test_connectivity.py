@@ -0,0 +1,59 @@
+import random
+
+import pytest
+
+from connectivity import UnionFind
+
+
+def test_union_find_matches_merged_sets():
+    rng = random.Random(0)
+    size = 200
+    components = UnionFind(size)
+    sets = [{element} for element in range(size)]
+    for _ in range(300):
+        element, other = rng.randrange(size), rng.randrange(size)
+        merged = sets[element] is not sets[other]
+        assert components.union(element, other) == merged
+        if merged:
+            union = sets[element] | sets[other]
+            for member in union:
+                sets[member] = union
+
+        for element in rng.sample(range(size), 20):
+            assert components.size_of(element) == len(sets[element])
+            assert all(
+                components.find(member) == components.find(element)
+                for member in sets[element]
+            )
+    roots = {components.find(element) for element in range(size)}
+    assert len(roots) == len({id(members) for members in sets})
+
+
+def assert_connected_matches_chart(arena, full_chart):
+    coords = sorted(arena.coords)
+    for ignore_paths in (False, True):
+        for target in coords:
+            reachable = full_chart(arena, target, ignore_paths)
+            component = arena.component_of(target, ignore_paths=ignore_paths)
+            for pos in coords:
+                assert arena.connected(pos, target, ignore_paths=ignore_paths) == (
+                    pos in reachable
+                )
+                assert (
+                    arena.component_of(pos, ignore_paths=ignore_paths) == component
+                ) == (pos in reachable)
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_connected_matches_a_full_chart(random_arena, full_chart, seed):
+    arena = random_arena(num_paths=50, seed=seed)
+    assert_connected_matches_chart(arena, full_chart)
+
+    # components are kept up to date as paths are added and destroyed
+    for path in random_arena(num_paths=120, seed=seed).paths - arena.paths:
+        arena.add_path(*path)
+    assert_connected_matches_chart(arena, full_chart)
+
+    rng = random.Random(seed)
+    arena.remove_paths(rng.sample(sorted(arena.paths, key=sorted), 40))
+    assert_connected_matches_chart(arena, full_chart)
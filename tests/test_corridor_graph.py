@@ -0,0 +1,51 @@
+import pytest
+
+from corridor_graph import CorridorGraph
+from game_objects.arena import Arena
+from vec2 import Vec2
+
+
+def chart(order, distances) -> dict[int, int]:
+    return dict(zip(order, distances))
+
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("ignore_paths", (False, True))
+def test_chart_matches_grid_chart(random_arena, seed, ignore_paths):
+    grid = random_arena(num_paths=150, seed=seed)._grid
+    graph = CorridorGraph(grid, ignore_paths)
+
+    # every coordinate, including corridor cells and cells off the paths
+    for cell in range(grid.size):
+        if grid.coords[cell]:
+            assert chart(*graph.chart(cell)) == chart(*grid.chart(cell, ignore_paths))
+
+
+def test_closed_loop_matches_grid_chart():
+    arena = Arena(8, contract_corridors=True)
+    corners = [Vec2(0, 0), Vec2(75, 0), Vec2(75, 75), Vec2(0, 75), Vec2(0, 0)]
+    for start, end in zip(corners, corners[1:]):
+        pos = start
+        while pos != end:
+            step = Vec2(
+                (end[0] > pos[0]) - (end[0] < pos[0]),
+                (end[1] > pos[1]) - (end[1] < pos[1]),
+            )
+            dest = Vec2(pos[0] + step[0] * 25, pos[1] + step[1] * 25)
+            arena.add_path(pos, dest)
+            pos = dest
+
+    grid = arena._grid
+    graph = CorridorGraph(grid)
+    for cell in range(grid.size):
+        if grid.coords[cell]:
+            assert chart(*graph.chart(cell)) == chart(*grid.chart(cell))
+
+
+def test_contracted_arena_matches_full_chart(random_arena, full_chart):
+    arena = random_arena(num_paths=150, contract_corridors=True)
+    arena.chart_all_distances(use_numpy=False)
+    for target in arena.coords:
+        for ignore_paths in (False, True):
+            distances = arena._get_distances(target, ignore_paths)
+            assert dict(distances) == full_chart(arena, target, ignore_paths)
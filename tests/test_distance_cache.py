@@ -0,0 +1,27 @@
+from distance_cache import DistanceCache
+from vec2 import Vec2
+
+
+def test_resized_remeasures_and_evicts():
+    small = {Vec2(0, 0): 0}
+    cache = DistanceCache(max_bytes=1000)
+    cache[Vec2(0, 0)] = small
+    cache[Vec2(1, 0)] = {Vec2(1, 0): 0}
+    before = cache.nbytes
+
+    # grow the newest map in place, like a repair does
+    grown = cache[Vec2(1, 0)]
+    grown.update((Vec2(x, 1), x) for x in range(40))
+    assert cache.nbytes == before
+
+    cache.resized(Vec2(1, 0))
+    assert Vec2(0, 0) not in cache
+    assert list(cache) == [Vec2(1, 0)]
+    assert cache.info().evictions == 1
+    assert cache.nbytes > before
+
+
+def test_resized_ignores_missing_maps():
+    cache = DistanceCache(max_maps=1)
+    cache.resized(Vec2(0, 0))
+    assert len(cache) == 0
@@ -0,0 +1,44 @@
+import os
+
+from distance_matrix import DistanceMatrix
+from vec2 import Vec2
+
+
+def test_rows_are_allocated_when_charted(random_arena):
+    arena = random_arena(arena_size=40, num_paths=50, compact=True)
+    matrix = arena._path_distance_map
+    assert matrix._rows == [None] * arena._grid.size
+
+    arena.chart_distances(Vec2(0, 0))
+    assert matrix.nbytes == arena._grid.size * 2 + arena._grid.size
+
+
+def test_arenas_sharing_an_mmap_dir_keep_their_own_files(
+    random_arena, full_chart, tmp_path
+):
+    first = random_arena(num_paths=80, seed=1, mmap_dir=tmp_path)
+    second = random_arena(num_paths=80, seed=2, mmap_dir=tmp_path)
+    first.chart_all_distances(use_numpy=False)
+    second.chart_all_distances(use_numpy=False)
+    assert len(os.listdir(tmp_path)) == 4
+
+    for arena in (first, second):
+        for target in arena.coords:
+            assert dict(arena._get_distances(target)) == full_chart(arena, target)
+
+    first.close()
+    second.close()
+    assert os.listdir(tmp_path) == []
+
+
+def test_copy_keeps_charted_rows(random_arena, tmp_path):
+    arena = random_arena(num_paths=40)
+    matrix = DistanceMatrix(arena._grid, tmp_path)
+    matrix[Vec2(0, 0)] = arena._get_distances(Vec2(0, 0))
+
+    copy = matrix.copy()
+    matrix.close()
+    assert list(copy) == [Vec2(0, 0)]
+    assert dict(copy[Vec2(0, 0)]) == arena._get_distances(Vec2(0, 0))
+    copy.close()
+    assert os.listdir(tmp_path) == []
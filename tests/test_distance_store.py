@@ -0,0 +1,84 @@
+import os
+
+import pytest
+
+from distance_store import DistanceStore
+
+
+def no_charting(*args, **kwargs):
+    raise AssertionError("charted distances that were saved")
+
+
+@pytest.mark.parametrize("compact", (False, True))
+def test_saved_distances_round_trip(random_arena, full_chart, tmp_path, compact):
+    store = DistanceStore(tmp_path)
+    random_arena(distance_store=store, compact=compact).chart_all_distances(
+        use_numpy=False
+    )
+    assert len(os.listdir(tmp_path)) == 1  # no temporary files left behind
+
+    arena = random_arena(distance_store=store, compact=compact)
+    arena._chart_distances = no_charting
+    arena.chart_all_distances(use_numpy=False)
+    for target in arena.coords:
+        for ignore_paths in (False, True):
+            distances = arena._get_distances(target, ignore_paths)
+            assert dict(distances) == full_chart(arena, target, ignore_paths)
+
+
+def test_a_changed_layout_is_charted_again(random_arena, full_chart, tmp_path):
+    store = DistanceStore(tmp_path)
+    arena = random_arena(num_paths=60, distance_store=store)
+    arena.chart_all_distances(use_numpy=False)
+    saved = arena.fingerprint
+
+    grown = random_arena(num_paths=120, distance_store=store)
+    assert grown.fingerprint != saved
+    assert grown.fingerprint not in store
+    grown.chart_all_distances(use_numpy=False)
+    assert saved in store and grown.fingerprint in store
+    for target in grown.coords:
+        assert dict(grown._get_distances(target)) == full_chart(grown, target)
+
+
+def test_unreadable_files_are_dropped(random_arena, tmp_path):
+    store = DistanceStore(tmp_path)
+    arena = random_arena(distance_store=store)
+    arena.chart_all_distances(use_numpy=False)
+    path = os.path.join(tmp_path, arena.fingerprint + ".dist")
+    with open(path, "r+b") as file:
+        file.truncate(os.path.getsize(path) // 2)
+
+    assert not store.load(arena.fingerprint, arena._grid, {}, {})
+    assert arena.fingerprint not in store
+
+
+def test_eviction_keeps_the_store_under_its_limit(random_arena, tmp_path):
+    arena = random_arena()
+    arena.chart_all_distances(use_numpy=False)
+    snapshot = DistanceStore.snapshot(
+        arena._grid, arena._path_distance_map, arena._coord_distance_map
+    )
+    sizing = DistanceStore(tmp_path / "sizing")
+    sizing.write("a", snapshot)
+    # room for two files, but not three
+    store = DistanceStore(tmp_path / "store", max_bytes=sizing.nbytes * 5 // 2)
+
+    def write(name, mtime):
+        store.write(name, snapshot)
+        os.utime(store._path(name), (mtime, mtime))
+
+    write("a", 1)
+    write("b", 2)
+    # loading marks a as recently used, so b is evicted first
+    assert store.load("a", arena._grid, {}, {})
+    assert os.path.getmtime(store._path("a")) > 2
+    store.write("c", snapshot)
+    assert "a" in store and "b" not in store and "c" in store
+    assert store.nbytes <= store.max_bytes
+
+    # the newest file is kept even when it's too big on its own
+    tiny = DistanceStore(tmp_path / "tiny", max_bytes=1)
+    tiny.write("a", snapshot)
+    tiny.write("b", snapshot)
+    assert "a" not in tiny and "b" in tiny
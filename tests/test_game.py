@@ -0,0 +1,80 @@
+import asyncio
+import tkinter
+import turtle
+
+import behaviors
+from enums import Direction, GameState
+from game_objects.arena import Arena
+from game_objects.game import Game
+from game_objects.pawns import Enemy, Pawn
+
+
+class ClosingCanvas:
+    """A canvas whose window is closed after a few updates."""
+
+    def __init__(self, updates: int):
+        self.updates = updates
+
+    def update(self):
+        self.updates -= 1
+        if self.updates < 0:
+            raise tkinter.TclError('can\'t invoke "update" command')
+
+
+def test_run_async_stops_its_tasks_when_the_window_closes():
+    game = Game(Arena(8), turtle.Screen())
+    game.screen.getcanvas = lambda: ClosingCanvas(3)
+
+    async def main():
+        run = asyncio.get_running_loop().create_task(game.run_async())
+        await asyncio.sleep(0)
+        game.add_pawn(Enemy(game, behaviors.RandomBehavior()))
+        tasks = set(game._tasks)
+        await run
+        return tasks
+
+    tasks = asyncio.run(main())
+    # the score display, the level timer and the enemy's behavior
+    assert len(tasks) == 3
+    assert all(task.cancelled() for task in tasks)
+    assert not game._tasks
+    assert game.event_loop is None
+
+
+def test_a_move_cancelled_partway_can_be_followed_by_another():
+    game = Game(Arena(8), turtle.Screen())
+    pawn = Pawn(game, speed=1)
+    game.add_pawn(pawn)
+    game.set_state(GameState.PATH)
+
+    pawn.threaded_move(Direction.EAST, validate_path=False, change_heading=False)
+    game._update_pawns()
+    assert game.pawn_array.is_moving(pawn.slot)
+
+    game.scheduler.cancel_all()
+    assert not pawn._moving
+    assert not game.pawn_array.is_moving(pawn.slot)
+    stopped = pawn.pos
+
+    pawn.threaded_move(Direction.NORTH, validate_path=False, change_heading=False)
+    assert game.scheduler.is_scheduled(pawn)
+    while game.scheduler.is_scheduled(pawn) or pawn._moving:
+        game._update_pawns()
+    assert pawn.pos == game.arena.get_destination(stopped, Direction.NORTH)
+    assert not game.pawn_array.is_moving(pawn.slot)
+
+
+def test_a_move_that_raises_leaves_the_pawn_free_to_move():
+    game = Game(Arena(8), turtle.Screen())
+    pawn = Pawn(game, speed=0)
+    game.add_pawn(pawn)
+    game.set_state(GameState.PATH)
+
+    def add_path(a, b):
+        raise RuntimeError("no more paths")
+
+    game.arena.add_path = add_path
+    pawn.threaded_move(Direction.EAST, path=True, validate_path=False)
+    game._update_pawns()
+    assert not game.scheduler.is_scheduled(pawn)
+    assert not pawn._moving
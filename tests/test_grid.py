@@ -0,0 +1,46 @@
+import random
+
+import pytest
+
+from grid import Grid
+
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("ignore_paths", (False, True))
+def test_distances_match_chart(random_arena, seed, ignore_paths):
+    grid = random_arena(num_paths=150, seed=seed)._grid
+    rng = random.Random(seed)
+    cells = [cell for cell in range(grid.size) if grid.coords[cell]]
+
+    for index in rng.sample(cells, 10):
+        charted = dict(zip(*grid.chart(index, ignore_paths)))
+        others = rng.sample(range(grid.size), 6) + [index, -1]
+        expected = [charted.get(other, -1) for other in others]
+        assert grid.distances(index, others, ignore_paths) == expected
+        assert [grid.distance(index, other, ignore_paths) for other in others] == (
+            expected
+        )
+
+
+def test_movement_options_search_once(random_arena, monkeypatch):
+    searching = random_arena(num_paths=150, search_before_charting=1)
+    charting = random_arena(num_paths=150)
+    searches = []
+    distances = Grid.distances
+
+    def counting(self, *args, **kwargs):
+        searches.append(args)
+        return distances(self, *args, **kwargs)
+
+    monkeypatch.setattr(Grid, "distances", counting)
+    counts = []
+    for start in sorted(charting.coords)[:20]:
+        for target in sorted(charting.coords)[-5:]:
+            searching._searches.clear()
+            searches.clear()
+            assert searching.get_movement_options(
+                start, target
+            ) == charting.get_movement_options(start, target)
+            assert len(searches) <= 1
+            counts.append(len(searches))
+    assert max(counts) == 1
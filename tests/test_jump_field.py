@@ -0,0 +1,80 @@
+import random
+from collections import deque
+
+import pytest
+
+from enums import Direction
+
+
+def jump_distances(arena, target, max_jumps):
+    """Breadth-first search over (position, jumps used), one move at a time."""
+    reached = {(target, 0): 0}
+    queue = deque(reached)
+    while queue:
+        pos, jumps = state = queue.popleft()
+        for direction in Direction:
+            dest = arena.get_destination(pos, direction)
+            if frozenset((pos, dest)) in arena.paths:
+                next_state = (dest, jumps)
+            elif dest in arena.coords and pos in arena.coords and jumps < max_jumps:
+                next_state = (dest, jumps + 1)
+            else:
+                continue
+            if next_state not in reached:
+                reached[next_state] = reached[state] + 1
+                queue.append(next_state)
+
+    distances = {}
+    for (pos, _), distance in reached.items():
+        distances[pos] = min(distance, distances.get(pos, distance))
+    return distances
+
+
+def assert_jumps_match_search(arena, targets):
+    for target in targets:
+        expected = [jump_distances(arena, target, jumps) for jumps in range(3)]
+        for start in arena.coords:
+            for max_jumps, distances in enumerate(expected):
+                if start not in distances:
+                    with pytest.raises(KeyError):
+                        arena.get_jump_distance(start, target, max_jumps=max_jumps)
+                    continue
+
+                distance = distances[start]
+                assert (
+                    arena.get_jump_distance(start, target, max_jumps=max_jumps)
+                    == distance
+                )
+                if distance == 0:
+                    continue
+
+                # the move leads one closer, and only jumps if no path would do
+                direction, jump = arena.get_jump_move(
+                    start, target, max_jumps=max_jumps
+                )
+                dest = arena.get_destination(start, direction)
+                assert expected[max_jumps - jump].get(dest) == distance - 1
+                if jump:
+                    assert not any(
+                        frozenset((start, arena.get_destination(start, other)))
+                        in arena.paths
+                        and distances.get(arena.get_destination(start, other))
+                        == distance - 1
+                        for other in Direction
+                    )
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_jump_layers_match_a_search(random_arena, seed):
+    arena = random_arena(num_paths=50, seed=seed)
+    rng = random.Random(seed)
+    targets = rng.sample(sorted(arena.coords), 6)
+    assert_jumps_match_search(arena, targets)
+
+    # layers charted before are dropped as paths are added and destroyed
+    for path in random_arena(num_paths=120, seed=seed).paths - arena.paths:
+        arena.add_path(*path)
+    assert_jumps_match_search(arena, targets)
+
+    arena.remove_paths(rng.sample(sorted(arena.paths, key=sorted), 40))
+    assert_jumps_match_search(arena, targets)
@@ -0,0 +1,79 @@
+import random
+
+import pytest
+
+from next_hop import NextHopTable
+from vec2 import Vec2
+
+
+def assert_rows_match(arena, ignore_paths=False):
+    table = arena._coord_next_hops if ignore_paths else arena._path_next_hops
+    fresh = NextHopTable(arena._grid, ignore_paths)
+    for target in table:
+        distances = arena._get_distances(arena._grid.positions[target], ignore_paths)
+        assert table._rows[target] == fresh.build(target, distances)
+
+
+def test_charting_builds_rows(random_arena):
+    arena = random_arena(num_paths=80, next_hops=True)
+    arena.chart_distances(Vec2(0, 0))
+    assert arena._grid.index(Vec2(0, 0)) in arena._path_next_hops
+
+    arena.chart_all_distances()
+    assert len(arena._path_next_hops) == len(arena.coords)
+    assert len(arena._coord_next_hops) == len(arena.coords)
+
+
+@pytest.mark.parametrize("compact", (False, True))
+def test_rows_are_repaired_with_their_distances(random_arena, compact):
+    arena = random_arena(num_paths=60, next_hops=True, compact=compact)
+    arena.chart_all_distances(use_numpy=False)
+    rng = random.Random(0)
+
+    grown = random_arena(num_paths=150)
+    for path in grown.paths - arena.paths:
+        arena.add_path(*path)
+    assert_rows_match(arena)
+    assert_rows_match(arena, ignore_paths=True)
+
+    for path in rng.sample(sorted(arena.paths, key=sorted), 40):
+        arena.remove_path(*path)
+    assert_rows_match(arena)
+
+
+def test_rows_are_evicted_with_their_distances(random_arena):
+    arena = random_arena(num_paths=80, next_hops=True, max_charted=5)
+    for target in list(arena.coords)[:20]:
+        arena.get_best_direction(Vec2(0, 0), target)
+
+    charted = {arena._grid.index(target) for target in arena._path_distance_map}
+    assert set(arena._path_next_hops) == charted
+    assert len(charted) == 5
+
+
+def test_copies_evict_without_dropping_live_rows(random_arena):
+    arena = random_arena(num_paths=80, next_hops=True, max_charted=5)
+    coords = sorted(arena.coords)
+    for target in coords[:5]:
+        arena.get_best_direction(Vec2(0, 0), target)
+    live = set(arena._path_next_hops)
+
+    # like the copies charted into in the background
+    copy = arena._path_distance_map.copy()
+    for target in coords[5:10]:
+        copy[target] = {target: 0}
+    assert set(copy) == set(coords[5:10])
+    assert set(arena._path_next_hops) == live
+
+
+def test_swapped_in_maps_evict_their_rows(random_arena):
+    arena = random_arena(num_paths=80, next_hops=True, max_charted=5)
+    arena.chart_all_distances_in_background(use_numpy=False).join()
+
+    def charted():
+        return {arena._grid.index(target) for target in arena._path_distance_map}
+
+    assert set(arena._path_next_hops) == charted()
+    for target in sorted(arena.coords)[:20]:
+        arena.get_best_direction(Vec2(0, 0), target)
+    assert set(arena._path_next_hops) == charted()
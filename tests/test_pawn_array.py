@@ -0,0 +1,50 @@
+from game_objects.pawn_array import PawnArray
+from vec2 import Vec2
+
+
+def moved_together(moves, radius=1, cell_size=10):
+    """Adds a slot for each (start, dest) and moves them all in one advance."""
+    pawn_array = PawnArray(cell_size)
+    for start, dest in moves:
+        slot = pawn_array.add(None, Vec2(*start), radius)
+        if dest != start:
+            pawn_array.start_move(slot, Vec2(*dest), 100, 0)
+    pawn_array.advance(10)
+    return pawn_array
+
+
+def test_slots_that_pass_through_each_other_are_swept():
+    # they swap places in one advance, many hash cells apart
+    pawn_array = moved_together([((0, 0), (100, 0)), ((100, 0), (0, 0))])
+    assert pawn_array.collisions([0], {1}) == []
+    assert pawn_array.collisions([0], {1}, swept=True) == [(0, 1)]
+    assert pawn_array.collisions([1], {0}, swept=True) == [(1, 0)]
+
+
+def test_a_slot_that_passes_through_a_still_one_is_swept():
+    pawn_array = moved_together([((0, 0), (100, 0)), ((50, 1), (50, 1))])
+    assert pawn_array.collisions([1], {0}) == []
+    assert pawn_array.collisions([1], {0}, swept=True) == [(1, 0)]
+
+
+def test_near_misses_are_not_swept():
+    # passes 3 away from a still slot, and crosses another's path after it left
+    pawn_array = moved_together(
+        [((0, 0), (100, 0)), ((50, 3), (50, 3)), ((60, -50), (60, 50))]
+    )
+    assert pawn_array.collisions([0], {1, 2}, swept=True) == []
+    # hitboxes that just touch count
+    touching = moved_together([((0, 0), (100, 0)), ((50, 2), (50, 2))])
+    assert touching.collisions([0], {1}, swept=True) == [(0, 1)]
+
+
+def test_placed_slots_do_not_sweep():
+    pawn_array = PawnArray(10)
+    teleported = pawn_array.add(None, Vec2(0, 0), 1)
+    still = pawn_array.add(None, Vec2(50, 0), 1)
+    pawn_array.place(teleported, Vec2(100, 0))
+
+    moved, arrived = pawn_array.advance(10)
+    assert moved == [teleported]
+    assert arrived == []
+    assert pawn_array.collisions([teleported], {still}, swept=True) == []
@@ -0,0 +1,108 @@
+import asyncio
+import threading
+
+import pytest
+
+from game_objects.scheduler import Scheduler
+
+
+def steps(count, result=None, error=None, stopped=None):
+    try:
+        for _ in range(count):
+            yield
+        if error is not None:
+            raise error
+        return result
+    finally:
+        if stopped is not None:
+            stopped.append(True)
+
+
+def run_ticks(scheduler, done, start=0.0):
+    now = start
+    while not done():
+        now += scheduler.tick_interval_s
+        scheduler.tick(now)
+
+
+def test_wait_raises_what_the_action_raised():
+    scheduler = Scheduler(0.01)
+    errors = []
+
+    def waiter():
+        try:
+            scheduler.wait(steps(2, error=ValueError("bad move")))
+        except ValueError as error:
+            errors.append(error)
+
+    thread = threading.Thread(target=waiter)
+    thread.start()
+    run_ticks(scheduler, lambda: not thread.is_alive())
+    thread.join()
+    assert [str(error) for error in errors] == ["bad move"]
+
+
+def test_run_async_gets_results_and_exceptions():
+    async def main():
+        scheduler = Scheduler(0.01)
+        done = scheduler.run_async(steps(1, result=3))
+        failed = scheduler.run_async(steps(1, error=ValueError("bad move")))
+        run_ticks(scheduler, lambda: not len(scheduler))
+        assert await done == 3
+        with pytest.raises(ValueError):
+            await failed
+
+    asyncio.run(main())
+
+
+def test_cancel_all_closes_actions_and_releases_waiters():
+    async def main():
+        scheduler = Scheduler(0.01)
+        stopped = []
+        scheduler.schedule("pawn", steps(100, stopped=stopped))
+        future = scheduler.run_async(steps(100, stopped=stopped))
+        scheduler.tick(0)
+
+        scheduler.cancel_all()
+        assert len(scheduler) == 0
+        assert stopped == [True, True]
+        with pytest.raises(asyncio.CancelledError):
+            await future
+
+        # a waiting thread is released too
+        errors = []
+
+        def waiter():
+            try:
+                scheduler.wait(steps(100))
+            except asyncio.CancelledError as error:
+                errors.append(error)
+
+        thread = threading.Thread(target=waiter)
+        thread.start()
+        while not len(scheduler):
+            pass
+        scheduler.cancel_all()
+        thread.join()
+        assert len(errors) == 1
+
+    asyncio.run(main())
+
+
+def test_cancelling_during_a_tick_skips_the_rest():
+    scheduler = Scheduler(0.01)
+    finished = []
+
+    def cancelling():
+        yield
+        scheduler.cancel_all()
+        yield
+
+    stopped = []
+    scheduler.schedule("first", cancelling())
+    scheduler.schedule("second", steps(1, stopped=stopped), finished.append)
+    scheduler.tick(0)
+    scheduler.tick(0.01)
+    assert len(scheduler) == 0
+    assert finished == []
+    assert stopped == [True]
@@ -0,0 +1,87 @@
+import random
+import turtle
+
+import behaviors
+from enums import Direction
+from game_objects.game import Game
+from game_objects.pawns import Enemy
+from source_field import SourceField
+from vec2 import Vec2
+
+
+def charted(grid, sources, ignore_paths=False):
+    field = SourceField(grid, ignore_paths)
+    field.chart(sources)
+    return field
+
+
+def assert_same(field, expected):
+    assert field.distances == expected.distances
+    assert field.nearest == expected.nearest
+    assert field.sources == expected.sources
+
+
+def test_moves_match_a_full_chart(random_arena):
+    for seed in range(3):
+        grid = random_arena(seed=seed)._grid
+        rng = random.Random(seed)
+        for ignore_paths in (False, True):
+            sources = tuple(rng.randrange(grid.size) for _ in range(4))
+            field = charted(grid, sources, ignore_paths)
+            for _ in range(40):
+                source = rng.randrange(len(sources))
+                # sometimes onto another source's cell, or off the grid
+                cell = rng.choice([rng.randrange(grid.size), rng.choice(sources), -1])
+                sources = sources[:source] + (cell,) + sources[source + 1 :]
+                field.move(source, cell)
+                assert_same(field, charted(grid, sources, ignore_paths))
+
+
+def test_update_matches_a_full_chart(random_arena):
+    grid = random_arena()._grid
+    rng = random.Random(0)
+    sources = (0,)
+    field = charted(grid, sources)
+    for _ in range(30):
+        sources = tuple(
+            rng.randrange(grid.size) if rng.random() < 0.3 else cell for cell in sources
+        )
+        if rng.random() < 0.3:
+            sources += (rng.randrange(grid.size),)
+        elif len(sources) > 1 and rng.random() < 0.1:
+            sources = sources[:-1]
+
+        copy = field.copy()
+        field.update(sources)
+        assert_same(field, charted(grid, sources))
+        # the copy keeps its own regions
+        copy.update(sources)
+        assert_same(copy, field)
+
+
+def test_danger_follows_enemies_as_they_move(random_arena):
+    arena = random_arena()
+    game = Game(arena, turtle.Screen())
+    enemies = [
+        Enemy(game, behaviors.RandomBehavior(), pos=Vec2(0, 0)) for _ in range(2)
+    ]
+    for enemy in enemies:
+        game.add_pawn(enemy)
+
+    rng = random.Random(0)
+    grid = arena._grid
+    for _ in range(20):
+        field = game.threat_field
+        enemy = rng.choice(enemies)
+        direction = rng.choice(list(Direction))
+        if arena.path_exists_d(enemy.pos, arena.get_destination(enemy.pos, direction)):
+            enemy.teleport(arena.get_destination(enemy.pos, direction))
+        game._update_pawns()
+
+        # updated in place, rather than looked up from every enemy again
+        assert game.threat_field is field
+        expected = charted(grid, tuple(grid.index(enemy.pos) for enemy in enemies))
+        assert_same(field, expected)
+        for index, pos in enumerate(grid.positions):
+            distance = expected.distances[index]
+            assert game.danger(pos) == (None if distance == 0xFFFF else distance)
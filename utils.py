@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import math
 import time
 from typing import Generator
 
@@ -12,15 +13,24 @@ def interpolate_vec2(
     dest: Vec2,
     speed: int | float,
     cfg: config.Config | None = None,
+    *,
+    sleep: bool = True,
 ) -> Generator[Vec2, None, None]:
     """Iterpolates positions from `pos` to `dest` until `dest` is reached.`
 
+    The number of steps and the change per step are worked out once up front, and
+    each position is measured from `pos` rather than from the last position, so
+    errors never build up and no position goes past `dest`.
+
     Args:
         pos: The start position.
         dest: The destination position.
         speed: The speed at which to move from `pos` to `dest`.
         cfg: The game configuration settings to follow. If `None`, the default
             configuration is used. Defaults to None.
+        sleep: Whether to sleep for a tick between steps. Pass False when
+            something else paces the steps, like the game's scheduler. Defaults
+            to True.
 
     Yields:
         Positions as `Vec2`s from `pos` to `dest`. `dest` will always be the
@@ -30,14 +40,19 @@ def interpolate_vec2(
         yield dest
         return
 
-    diff = dest - pos
-    speed_vec = diff.unit().scale(speed)
-    offset = speed_vec
-    distance = diff.magnitude()
-    while offset.magnitude() < distance:
-        yield pos + offset
-        offset += speed_vec
-        time.sleep((cfg or config.DEFAULT_CONFIG).tick_interval_s)
+    start_x, start_y = pos
+    diff_x, diff_y = dest[0] - start_x, dest[1] - start_y
+    distance = math.hypot(diff_x, diff_y)
+
+    # every step but the last moves exactly `speed`; the last may be shorter
+    steps = math.ceil(distance / speed)
+    if steps > 1:
+        step_x, step_y = diff_x * speed / distance, diff_y * speed / distance
+        tick_interval = (cfg or config.DEFAULT_CONFIG).tick_interval_s
+        for step in range(1, steps):
+            yield Vec2(start_x + step_x * step, start_y + step_y * step)
+            if sleep:
+                time.sleep(tick_interval)
 
     yield dest
 
@@ -47,10 +62,13 @@ def interpolate_deg(
     end: int | float,
     speed: int | float,
     cfg: config.Config | None = None,
+    *,
+    sleep: bool = True,
 ) -> Generator[int | float, None, None]:
     """Generator yielding degrees from start to end at the provided speed.
 
     Will take the shortest path from start to end (either clockwise or counterclockwise).
+    Like `interpolate_vec2`, the steps are worked out once and never go past `end`.
 
     Args:
         start: The starting degrees. Should be in [0, 360)
@@ -58,6 +76,9 @@ def interpolate_deg(
         speed: The speed of the interpolation.
         cfg: the config to get tick interval. If `None`, the default config is used.
             Defaults to None.
+        sleep: Whether to sleep for a tick between steps. Pass False when
+            something else paces the steps, like the game's scheduler. Defaults
+            to True.
 
     Yields:
         The current degree step. Always yields the value of `end` upon final iteration.
@@ -73,13 +94,15 @@ def interpolate_deg(
     cw_dist: int | float = 360 - ccw_dist  # clockwise distance
 
     # positive is counterclockwise, negative is clockwise
-    sign = 1 if (ccw_dist < cw_dist) else -1
+    step = speed if (ccw_dist < cw_dist) else -speed
     dist = min(ccw_dist, cw_dist)
 
-    distance_traveled: int | float = speed
-    while distance_traveled < dist:
-        distance_traveled += speed
-        yield start + (sign * distance_traveled)
-        time.sleep((cfg or config.DEFAULT_CONFIG).tick_interval_s)
+    steps = math.ceil(dist / speed)
+    if steps > 1:
+        tick_interval = (cfg or config.DEFAULT_CONFIG).tick_interval_s
+        for i in range(1, steps):
+            yield start + step * i
+            if sleep:
+                time.sleep(tick_interval)
 
     yield end
@@ -3,13 +3,38 @@ from __future__ import annotations
 import math
 from typing import Callable
 
+# the most grid points kept by Vec2.intern; more than any arena needs
+_MAX_INTERNED: int = 1 << 16
+
 
 class Vec2(tuple):
     """Immutable 2-dimentional vector."""
 
+    # no __dict__ on every instance; tuple subclasses can't have other slots
+    __slots__ = ()
+
     def __new__(cls, x: int | float, y: int | float):
         return tuple.__new__(cls, (x, y))
 
+    def intern(self) -> Vec2:
+        """Gets the shared Vec2 equal to this one, so that grid points aren't \
+            stored as many separate but equal objects.
+
+        Dictionaries check identity before equality, so looking up a shared Vec2 in \
+            a map keyed by the same shared Vec2 skips comparing them.
+
+        Returns:
+            Vec2: The shared Vec2, which is this one if none was shared before (or \
+                too many already are).
+        """
+        shared = _interned.get(self)
+        if shared is not None:
+            return shared
+
+        if len(_interned) < _MAX_INTERNED:
+            _interned[self] = self
+        return self
+
     # dispite having these properties, internal functions use indexes to
     # reduce the number of function calls
     @property
@@ -58,7 +83,8 @@ class Vec2(tuple):
                 y_size = x_size. Defaults to None.
 
         Returns:
-            Vec2: The point on a grid with tile size x_size * y_size of closest to this Vec2.
+            Vec2: The point on a grid with tile size x_size * y_size of closest to this Vec2. \
+                Points are shared (see `intern`), so snapping equal Vec2s gives the same one.
         
         Examples:
         >>> Vec2(13, 25).grid(10, 10)
@@ -68,7 +94,16 @@ class Vec2(tuple):
             y_size = x_size
 
         # didn't use .x and .y to reduce number of calls
-        return Vec2(round(self[0] / x_size) * x_size, round(self[1] / y_size) * y_size)
+        point = tuple.__new__(
+            Vec2, (round(self[0] / x_size) * x_size, round(self[1] / y_size) * y_size)
+        )
+        # same as point.intern(), without the extra call on a hot path
+        shared = _interned.get(point)
+        if shared is not None:
+            return shared
+        if len(_interned) < _MAX_INTERNED:
+            _interned[point] = point
+        return point
 
     def __add__(self, other: Vec2) -> Vec2:
         if not isinstance(other, Vec2):
@@ -88,4 +123,6 @@ class Vec2(tuple):
         return Vec2(abs(self[0]), abs(self[1]))
 
 
+_interned: dict[Vec2, Vec2] = {}
+
 Path = frozenset[Vec2]